@@ -0,0 +1,68 @@
+# ==========================================
+# benchmarks/bench_latest_entry.py
+# Latest-entry selection benchmark (1k - 1M rows)
+# ==========================================
+#
+# Usage: python -m benchmarks.bench_latest_entry [--rows 1000 10000 100000 1000000] [--blank-ratio 0.1] [--repeat 3]
+#
+# Sheets are generated with one row per day; the last `blank-ratio` of the rows only have a date
+# (a calendar pre-filled ahead of time), which the selection has to skip.
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import polars as pl
+
+from src.sheets.rows import select_latest_entry
+
+def build_sheet(rows: int, blank_ratio: float = 0.1) -> pl.DataFrame:
+    """Daily sheet whose trailing `blank_ratio` of days only have a date"""
+    start = date(2000, 1, 1)
+    filled_rows = max(1, int(rows * (1 - blank_ratio)))
+    days = [(start + timedelta(days=i)).isoformat() for i in range(rows)]
+    filled = [i < filled_rows for i in range(rows)]
+    return pl.DataFrame({
+        "Date": days,
+        "Completed": [f"Task {i} done" if keep else None for i, keep in enumerate(filled)],
+        "Inprogress": [f"Task {i + 1}" if keep else None for i, keep in enumerate(filled)],
+        "Blocked": ["None" if keep else "" for keep in filled]
+    })
+
+def legacy_latest_entry(df: pl.DataFrame) -> dict:
+    """Previous implementation: full sort, Python row walk, re-filter per candidate"""
+    df_formatted = df.with_columns(
+        pl.col('Date').str.to_datetime().dt.date().alias('date_formatted')
+    ).sort(by='date_formatted', descending=True)
+    for row in df_formatted.iter_rows():
+        if any(cell for cell in row[1:-1] if cell):
+            return df.filter(pl.col('Date') == row[0]).to_dicts()[0]
+    return df.to_dicts()[0]
+
+def best_of(fn, df: pl.DataFrame, repeat: int) -> float:
+    """Best wall time over `repeat` runs"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latest-entry selection")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--blank-ratio", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy (ms)':>12} {'vectorized (ms)':>16} {'speedup':>8}")
+    for rows in args.rows:
+        df = build_sheet(rows, args.blank_ratio)
+        assert select_latest_entry(df) == legacy_latest_entry(df)
+
+        legacy = best_of(legacy_latest_entry, df, args.repeat)
+        vectorized = best_of(select_latest_entry, df, args.repeat)
+        print(f"{rows:>10,} {legacy * 1000:>12.1f} {vectorized * 1000:>16.1f} {legacy / vectorized:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# ==========================================
+# benchmarks/bench_today_lookup.py
+# Today's-row lookup benchmark: eager read vs lazy scan
+# ==========================================
+#
+# Usage: python -m benchmarks.bench_today_lookup [--rows 10000 100000 1000000] [--repeat 3]
+#
+# Each variant runs in a fresh process so the peak RSS increase is its own.
+
+import argparse
+import multiprocessing
+import resource
+import time
+from datetime import date, timedelta
+from io import BytesIO
+
+import polars as pl
+
+from src.sheets.sheet_fetcher import scan_csv
+
+def build_body(rows: int) -> bytes:
+    """CSV export of a daily sheet with wide text cells; the last row is today"""
+    start = date.today() - timedelta(days=7001)
+    lines = ["Date,Completed,Inprogress,Blocked,Notes"]
+    for i in range(rows):
+        day = date.today() if i == rows - 1 else start + timedelta(days=i % 7000)
+        day = day.strftime("%d/%m/%Y")
+        lines.append(f'{day},"Task {i} done - ' + "x" * 80 + f'","Task {i + 1}",None,"' + "n" * 120 + '"')
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+def eager_lookup(content: bytes, today_str: str) -> dict:
+    """Previous path: copy into BytesIO, parse everything, then filter"""
+    df = pl.read_csv(BytesIO(content), encoding="utf8")
+    return df.filter(pl.col("Date").str.contains(today_str, literal=True)).to_dicts()[0]
+
+def lazy_lookup(content: bytes, today_str: str) -> dict:
+    """New path: scan the body in place with the predicate and limit pushed down"""
+    return (
+        scan_csv(content).filter(pl.col("Date").str.contains(today_str, literal=True)).head(1).collect()
+    ).row(0, named=True)
+
+def measure(variant: str, rows: int, repeat: int, queue) -> None:
+    """Run one variant in this process and report best time and peak RSS increase"""
+    content = build_body(rows)
+    today_str = date.today().strftime("%d/%m/%Y")
+    lookup = eager_lookup if variant == "eager" else lazy_lookup
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lookup(content, today_str)
+        timings.append(time.perf_counter() - start)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((min(timings), (peak_kb - baseline_kb) / 1024, len(content) / 1024 / 1024))
+
+def run(variant: str, rows: int, repeat: int) -> tuple:
+    """Measure a variant in a fresh process"""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=measure, args=(variant, rows, repeat, queue))
+    process.start()
+    result = queue.get(timeout=600)
+    process.join()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark today's-row lookup")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content = build_body(10)
+    today_str = date.today().strftime("%d/%m/%Y")
+    assert eager_lookup(content, today_str) == lazy_lookup(content, today_str)
+
+    print(f"{'rows':>10} {'body (MB)':>10} {'eager (ms)':>11} {'eager +RSS':>11} {'lazy (ms)':>10} {'lazy +RSS':>10}")
+    for rows in args.rows:
+        eager_time, eager_rss, size_mb = run("eager", rows, args.repeat)
+        lazy_time, lazy_rss, _ = run("lazy", rows, args.repeat)
+        print(f"{rows:>10,} {size_mb:>10.1f} {eager_time * 1000:>11.1f} {eager_rss:>9.1f}MB "
+              f"{lazy_time * 1000:>10.1f} {lazy_rss:>8.1f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -63,6 +63,7 @@ while retry_count < max_retries:
 
 # Setup scheduler state file path
 export SCHEDULER_STATE_FILE="/app/data/daily_report_state.json"
+export SHEET_STORE_DIR="${SHEET_STORE_DIR:-/app/data/sheets}"
 
 # Start the FastAPI application with scheduler
 echo "🤖 Starting Agent Report Service with Scheduler..."
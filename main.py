@@ -3,41 +3,78 @@
 # Clean FastAPI Application Entry Point
 # ==========================================
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Literal, Optional, Tuple
+from datetime import datetime
 from contextlib import asynccontextmanager
+import time
 import uvicorn
 
 from src.agents.agent_report import AgentReporter
+from src.agents.agent_pool import AgentPool, AgentPoolTimeoutError
+from src.agents.agent_runner import AgentRunner, AgentRunnerBusyError
+from src.agents.instrumentation import agent_metrics
+from src.jobs.report_jobs import JobKind, ReportJobManager
+from src.llms.llm_cache import llm_cache
+from src.monitoring.metrics import HTTP_REQUEST_DURATION, render_latest
+from src.sheets.sheet_cache import sheet_cache
+from src.sheets.schema import schema_profiles
+from src.sheets.sheet_store import sheet_store
+from src.sheets.snapshot import SheetSnapshot, report_variant
 from src.tools.tool_registry import tool_registry
-from src.scheduler.scheduler_service import SchedulerService
+from src.scheduler.scheduler_service import get_scheduler_service
+from src.scheduler.state_manager import DEFAULT_SHEET, state_manager
 from src.config import settings as config
+from src.config.settings import MonitoredSheet
 from src.logs.logger import Logger
 
 logger = Logger(__name__)
 
-# Lifespan context manager
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Manage application lifespan"""
-    # Startup
+async def start_services():
+    """Warm up the agent pool, recover interrupted jobs and start the scheduler"""
     try:
-        SchedulerService().start()
+        agent_pool.warm_up()
+    except Exception as e:
+        logger.error(f"❌ Error warming up agent pool: {str(e)}")
+
+    try:
+        # Jobs queued or running when this process last stopped will never finish
+        await run_in_threadpool(report_jobs.fail_interrupted)
+    except Exception as e:
+        logger.error(f"❌ Error recovering interrupted report jobs: {str(e)}")
+
+    try:
+        get_scheduler_service().start()
         logger.info("🚀 Application started with scheduler")
     except Exception as e:
         logger.error(f"❌ Error starting scheduler: {str(e)}")
 
-    yield
+async def stop_services():
+    """Stop the workers and the scheduler, then save pending sheet snapshots"""
+    agent_runner.shutdown(wait=False)
 
-    # Shutdown
     try:
-        SchedulerService().stop()
+        get_scheduler_service().stop()
         logger.info("⏹️ Application shutdown with scheduler stopped")
     except Exception as e:
         logger.error(f"❌ Error stopping scheduler: {str(e)}")
 
+    try:
+        await run_in_threadpool(sheet_cache.flush_snapshots)
+    except Exception as e:
+        logger.error(f"❌ Error saving sheet snapshots: {str(e)}")
+
+# Lifespan context manager
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage application lifespan"""
+    await start_services()
+    yield
+    await stop_services()
+
 # Initialize FastAPI app
 config_debug = config.AppConfig.from_env()
 app = FastAPI(
@@ -57,10 +94,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def observe_request_latency(request: Request, call_next):
+    """Record request latency per route template (not per raw path, to keep label cardinality bounded)"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status)
+        ).observe(time.perf_counter() - start)
+
 # Request/Response models
 class ReportRequest(BaseModel):
     sheet_url: str
     additional_context: Optional[str] = ""
+    mode: Literal["agent", "pipeline"] = "agent"
+    force: bool = False
 
 class ReportResponse(BaseModel):
     success: bool
@@ -68,6 +124,32 @@ class ReportResponse(BaseModel):
     error: Optional[str] = None
     agent: str
     context: Optional[Dict[str, Any]] = None
+    sinks: Optional[Dict[str, Any]] = None
+    timings: Optional[Dict[str, Any]] = None
+    reused: bool = False
+
+class ReportJobResponse(BaseModel):
+    job_id: str
+    status: str
+    sheet_url: str
+    mode: str = "agent"
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    timings: Dict[str, float] = {}
+    result: Optional[ReportResponse] = None
+    error: Optional[str] = None
+
+class SchedulerCheckJobResponse(BaseModel):
+    job_id: str
+    status: str
+    force: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    timings: Dict[str, float] = {}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
 
 class HealthResponse(BaseModel):
     status: str
@@ -88,6 +170,136 @@ def get_agent() -> AgentReporter:
 
     return agent
 
+# Dedicated worker threads so agent runs never block the event loop
+config_runner = config.AgentRunnerConfig.from_env()
+agent_runner = AgentRunner(
+    workers=config_runner.workers,
+    queue_size=config_runner.queue_size,
+    retry_after=config_runner.retry_after
+)
+
+# Pool of pre-initialized agents shared by report endpoints and the scheduler. Every API worker and every
+# concurrently checked sheet can hold an agent at the same time, so the pool has room for both
+config_pool = config.AgentPoolConfig.from_env()
+agent_pool = AgentPool(
+    factory=get_agent,
+    size=max(config_pool.size, config_runner.workers + config.SchedulerConfig.from_env().concurrency),
+    acquire_timeout=config_pool.acquire_timeout
+)
+get_scheduler_service().agent_pool = agent_pool
+
+def find_report_snapshot(sheet: MonitoredSheet) -> Tuple[Optional[SheetSnapshot], bool]:
+    """Fetch the sheet row once: today's row as the scheduler selects it (reusable), else the latest entry"""
+    snapshot = get_scheduler_service().report_checker.find_today_snapshot(sheet.sheet_url, tabs=sheet.tabs)
+    if snapshot is not None:
+        return snapshot, True
+
+    # No report for today yet: generate from the latest entry, but never store or reuse it as today's report
+    row = tool_registry.get_tool("get_information_from_url").execute(url=sheet.sheet_url, tabs=sheet.tabs)
+    if not row or "error" in row:
+        return None, False
+    return SheetSnapshot.from_row(sheet.sheet_url, row), False
+
+def run_report(sheet_url: str, additional_context: str = "", mode: str = "agent",
+               force: bool = False) -> Dict[str, Any]:
+    """Generate a report on a pooled agent (blocking, runs on a worker thread)"""
+    # Same sheet state, row selection and reuse key as the scheduler. Only monitored sheets have a state row,
+    # so reports for any other URL are neither reused nor recorded
+    monitored = get_scheduler_service().sheet_for_url(sheet_url)
+    sheet = monitored or MonitoredSheet(name=DEFAULT_SHEET, sheet_url=sheet_url)
+    snapshot, is_today = find_report_snapshot(sheet)
+    content_hash = snapshot.content_hash() if monitored is not None and snapshot is not None and is_today else None
+    variant = report_variant(mode, additional_context)
+
+    # Unchanged row: return the report generated from it instead of another LLM run, insert and post
+    if content_hash is not None and not force:
+        previous = state_manager.get_report(sheet_url, content_hash, sheet=sheet.name, variant=variant)
+        if previous is not None:
+            logger.info("♻️ Sheet row unchanged since the last report, returning the stored report")
+            return previous
+
+    with agent_pool.acquire() as agent:
+        result = agent.generate_report(
+            sheet_url=sheet_url,
+            additional_context=additional_context,
+            mode=mode,
+            snapshot=snapshot
+        )
+
+    if result.get("success") and content_hash is not None:
+        state_manager.record_report(sheet_url, content_hash, result, sheet=sheet.name, variant=variant)
+    return result
+
+def run_legacy(user_input: str, sheet_url: Optional[str] = None) -> Dict[str, Any]:
+    """Run a legacy request on a pooled agent (blocking, runs on a worker thread)"""
+    with agent_pool.acquire() as agent:
+        return agent.run(user_input=user_input, sheet_url=sheet_url)
+
+def run_scheduler_check(force: bool = False) -> Dict[str, Any]:
+    """Run a manual scheduler round (blocking, runs on a worker thread)"""
+    return get_scheduler_service().trigger_manual_check(force=force)
+
+# Report jobs and manual scheduler checks run on the same worker pool and are persisted in MongoDB
+report_jobs = ReportJobManager(runner=agent_runner, report_fn=run_report, check_fn=run_scheduler_check)
+
+def to_report_response(result: Dict[str, Any]) -> ReportResponse:
+    """Convert an agent result dictionary into a ReportResponse"""
+    if result.get("success"):
+        return ReportResponse(
+            success=True,
+            output=result.get("output"),
+            agent=result.get("agent", "ReportAgent"),
+            context=result.get("context"),
+            sinks=result.get("sinks"),
+            timings=result.get("timings"),
+            reused=result.get("reused", False)
+        )
+    return ReportResponse(
+        success=False,
+        error=result.get("error"),
+        agent=result.get("agent", "ReportAgent"),
+        timings=result.get("timings")
+    )
+
+def to_job_response(job: Dict[str, Any]) -> ReportJobResponse:
+    """Convert a job record into a ReportJobResponse"""
+    result = job.get("result")
+    return ReportJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        sheet_url=job["sheet_url"],
+        mode=job.get("mode", "agent"),
+        created_at=job["created_at"],
+        started_at=job.get("started_at"),
+        finished_at=job.get("finished_at"),
+        timings=job.get("timings") or {},
+        result=to_report_response(result) if result else None,
+        error=job.get("error")
+    )
+
+def to_check_job_response(job: Dict[str, Any]) -> SchedulerCheckJobResponse:
+    """Convert a scheduler check job record into a SchedulerCheckJobResponse"""
+    return SchedulerCheckJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        force=job.get("force", False),
+        created_at=job["created_at"],
+        started_at=job.get("started_at"),
+        finished_at=job.get("finished_at"),
+        timings=job.get("timings") or {},
+        result=job.get("result"),
+        error=job.get("error")
+    )
+
+def busy_exception(error: AgentRunnerBusyError) -> HTTPException:
+    """Map a saturated runner to 429 with Retry-After"""
+    logger.warning(f"Agent runner busy: {str(error)}")
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
 # API Endpoints
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -109,34 +321,67 @@ async def generate_report(request: ReportRequest):
     try:
         logger.info(f"📊 Report generation requested for: {request.sheet_url}")
 
-        # Get agent and generate report
-        agent = get_agent()
-        result = agent.generate_report(
+        # Generate report on a worker thread with a pooled agent
+        result = await agent_runner.run(
+            run_report,
             sheet_url=request.sheet_url,
-            additional_context=request.additional_context or ""
+            additional_context=request.additional_context or "",
+            mode=request.mode,
+            force=request.force
         )
 
         if result.get("success"):
             logger.success("Report generated successfully")
-            return ReportResponse(
-                success=True,
-                output=result.get("output"),
-                agent=result.get("agent", "ReportAgent"),
-                context=result.get("context")
-            )
         else:
             logger.error(f"Report generation failed: {result.get('error')}")
-            return ReportResponse(
-                success=False,
-                error=result.get("error"),
-                agent=result.get("agent", "ReportAgent")
-            )
+        return to_report_response(result)
 
+    except AgentRunnerBusyError as e:
+        raise busy_exception(e)
+    except AgentPoolTimeoutError as e:
+        logger.warning(f"Agent pool exhausted: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         error_msg = f"Unexpected error during report generation: {str(e)}"
         logger.error(error_msg)
         raise HTTPException(status_code=500, detail=error_msg)
 
+@app.post("/reports/jobs", response_model=ReportJobResponse, status_code=202)
+async def create_report_job(request: ReportRequest):
+    """Enqueue report generation and return a job ID immediately"""
+    try:
+        logger.info(f"📥 Report job requested for: {request.sheet_url}")
+        # The job store is synchronous pymongo (its first call also connects), so it runs off the event loop
+        job = await run_in_threadpool(
+            report_jobs.submit,
+            sheet_url=request.sheet_url,
+            additional_context=request.additional_context or "",
+            mode=request.mode,
+            force=request.force
+        )
+        return to_job_response(job)
+
+    except AgentRunnerBusyError as e:
+        raise busy_exception(e)
+    except Exception as e:
+        error_msg = f"Error creating report job: {str(e)}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=500, detail=error_msg)
+
+@app.get("/reports/jobs/{job_id}", response_model=ReportJobResponse)
+async def get_report_job(job_id: str):
+    """Get report job status, timing breakdown and result"""
+    try:
+        job = await run_in_threadpool(report_jobs.get, job_id, JobKind.REPORT)
+    except Exception as e:
+        error_msg = f"Error retrieving report job: {str(e)}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=500, detail=error_msg)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Report job '{job_id}' not found")
+    return to_job_response(job)
+
 @app.get("/tools")
 async def list_tools():
     """List available tools"""
@@ -147,6 +392,80 @@ async def list_tools():
         logger.error(f"Error listing tools: {str(e)}")
         raise HTTPException(status_code=500, detail="Error retrieving tools")
 
+@app.get("/agent-pool/status")
+async def get_agent_pool_status():
+    """Get agent pool size, wait time and utilization"""
+    try:
+        return agent_pool.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting agent pool status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Agent pool status error: {str(e)}")
+
+@app.get("/agent-runner/status")
+async def get_agent_runner_status():
+    """Get agent runner workers, queue depth and rejections"""
+    try:
+        return agent_runner.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting agent runner status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Agent runner status error: {str(e)}")
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics in text exposition format"""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/agent-metrics")
+async def get_agent_metrics():
+    """Get aggregated LLM and per-tool timings across agent runs"""
+    try:
+        return agent_metrics.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting agent metrics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Agent metrics error: {str(e)}")
+
+@app.get("/sheet-cache/status")
+async def get_sheet_cache_status():
+    """Get per-sheet cache hit statistics and detected sheet profiles"""
+    try:
+        return {**sheet_cache.get_stats(), "schema": schema_profiles.get_stats()}
+    except Exception as e:
+        logger.error(f"Error getting sheet cache status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Sheet cache status error: {str(e)}")
+
+@app.get("/sheet-store/status")
+async def get_sheet_store_status():
+    """Get stored snapshot counts and the last row diff per sheet"""
+    try:
+        return sheet_store.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting sheet store status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Sheet store status error: {str(e)}")
+
+@app.get("/sheet-store/latest")
+async def get_sheet_store_latest(url: str):
+    """Get the latest row of a sheet from its last stored snapshot (no network fetch)"""
+    try:
+        entry = sheet_store.latest_entry(url)
+    except Exception as e:
+        error_msg = f"Error reading sheet snapshot: {str(e)}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=500, detail=error_msg)
+
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No stored snapshot for this sheet")
+    return entry
+
+@app.get("/llm-cache/status")
+async def get_llm_cache_status():
+    """Get LLM result cache hit/miss counts"""
+    try:
+        return llm_cache.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting LLM cache status: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM cache status error: {str(e)}")
+
 @app.get("/test-slack")
 async def test_slack_connection():
     """Test Slack connection and configuration"""
@@ -179,24 +498,47 @@ async def test_slack_connection():
 async def get_scheduler_status():
     """Get scheduler status and configuration"""
     try:
-        return SchedulerService().get_status()
+        # Status reads the state backend (pymongo / SQLite / file), so it runs off the event loop
+        return await run_in_threadpool(get_scheduler_service().get_status)
     except Exception as e:
         logger.error(f"Error getting scheduler status: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Scheduler status error: {str(e)}")
 
-@app.post("/scheduler/trigger")
-async def trigger_manual_check():
-    """Trigger manual scheduler check (for testing)"""
+@app.post("/scheduler/trigger", response_model=SchedulerCheckJobResponse, status_code=202)
+async def trigger_manual_check(force: bool = False):
+    """Enqueue a manual scheduler check (for testing) and return a job ID; force regenerates an unchanged report"""
     try:
-        result = SchedulerService().trigger_manual_check()
-        if result.get("success"):
-            return result
-        else:
-            raise HTTPException(status_code=500, detail=result.get("error"))
+        # Only the lease holder runs rounds; the job re-checks the lease when it starts
+        if not await run_in_threadpool(get_scheduler_service().leader_lease.acquire):
+            raise HTTPException(status_code=409,
+                                detail="Another replica holds the scheduler lease, trigger the check there")
+
+        # A round generates a report per sheet, so it runs on the agent runner like report jobs
+        job = await run_in_threadpool(report_jobs.submit_check, force=force)
+        return to_check_job_response(job)
+
+    except HTTPException:
+        raise
+    except AgentRunnerBusyError as e:
+        raise busy_exception(e)
     except Exception as e:
         logger.error(f"Error triggering manual check: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Manual check error: {str(e)}")
 
+@app.get("/scheduler/trigger/{job_id}", response_model=SchedulerCheckJobResponse)
+async def get_manual_check(job_id: str):
+    """Get manual scheduler check job status, timing breakdown and per-sheet results"""
+    try:
+        job = await run_in_threadpool(report_jobs.get, job_id, JobKind.SCHEDULER_CHECK)
+    except Exception as e:
+        error_msg = f"Error retrieving manual check job: {str(e)}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=500, detail=error_msg)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Manual check job '{job_id}' not found")
+    return to_check_job_response(job)
+
 # Legacy endpoint for backward compatibility
 @app.post("/legacy/run")
 async def legacy_run(request: Dict[str, Any]):
@@ -208,11 +550,15 @@ async def legacy_run(request: Dict[str, Any]):
         if not user_input:
             raise HTTPException(status_code=400, detail="user_input is required")
 
-        agent = get_agent()
-        result = agent.run(user_input=user_input, sheet_url=sheet_url)
+        result = await agent_runner.run(run_legacy, user_input=user_input, sheet_url=sheet_url)
 
         return result
 
+    except AgentRunnerBusyError as e:
+        raise busy_exception(e)
+    except AgentPoolTimeoutError as e:
+        logger.warning(f"Agent pool exhausted: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except HTTPException:
         # Re-raise HTTPException as-is (preserves status code)
         raise
@@ -0,0 +1,119 @@
+# ==========================================
+# src/agents/agent_pool.py
+# Bounded pool of pre-initialized agents
+# ==========================================
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+class AgentPoolTimeoutError(Exception):
+    """Raised when no agent becomes available within the acquire timeout"""
+    pass
+
+class AgentPool:
+    """Bounded pool of reusable agents checked out one request at a time"""
+
+    def __init__(self, factory: Callable[[], Any], size: int, acquire_timeout: float = 60.0):
+        self._factory = factory
+        self.size = max(1, size)
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+
+        # Statistics
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._busy_seconds = 0.0
+        self._started_at = time.monotonic()
+
+    def warm_up(self) -> int:
+        """Create agents until the pool is full, returns the number created"""
+        created = 0
+        while True:
+            agent = self._try_create()
+            if agent is None:
+                break
+            self._idle.put(agent)
+            created += 1
+
+        logger.info(f"🏊 Agent pool warmed up: {self._created}/{self.size} agents ready")
+        return created
+
+    def _try_create(self) -> Optional[Any]:
+        """Create a new agent if the pool has not reached its size"""
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+
+        try:
+            return self._factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Check out an agent for the duration of the with-block"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+
+        try:
+            agent = self._idle.get_nowait()
+        except queue.Empty:
+            agent = self._try_create()
+            if agent is None:
+                try:
+                    agent = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise AgentPoolTimeoutError(
+                        f"No agent available after {timeout:.1f}s (pool size {self.size})"
+                    )
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        checked_out_at = time.monotonic()
+        try:
+            yield agent
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._busy_seconds += time.monotonic() - checked_out_at
+            self._idle.put(agent)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool sizing statistics"""
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started_at, 1e-9)
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_seconds": round(self._total_wait / self._checkouts, 4) if self._checkouts else 0.0,
+                "max_wait_seconds": round(self._max_wait, 4),
+                "utilization": round(self._in_use / self.size, 4),
+                "avg_utilization": round(self._busy_seconds / (elapsed * self.size), 4)
+            }
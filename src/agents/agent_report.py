@@ -3,28 +3,49 @@
 # Refactored Report Agent using new architecture
 # ==========================================
 
+from enum import Enum
 from typing import Dict, Any, Optional
 from src.agents.base_agent import LangChainBaseAgent
-from src.core.interfaces import AgentContext
+from src.agents.report_pipeline import ReportPipeline
+from src.agents.report_sinks import SinkDispatcher, build_sinks
+from src.core.interfaces import AgentContext, LLMInterface
+from src.config.settings import config
 from src.llms.gemini import GeminiLLM
+from src.llms.llm_cache import CachedLLM, llm_cache
+from src.llms.translation_memo import translation_memo
+from src.sheets.snapshot import SheetSnapshot, use_snapshot
 from src.logs.logger import Logger
 
 logger = Logger(__name__)
 
+class ReportMode(Enum):
+    """Report execution mode"""
+    AGENT = "agent"        # LLM-driven ReAct loop choosing tools
+    PIPELINE = "pipeline"  # Fixed tool sequence with a single LLM call
+
 class AgentReporter(LangChainBaseAgent):
     """Specialized agent for generating reports from data sources"""
 
     def __init__(self):
-        llm_provider = GeminiLLM()
+        llm_provider: LLMInterface = GeminiLLM()
+        if config.llm_cache.enabled:
+            llm_provider = CachedLLM(llm_provider, llm_cache)
         super().__init__(
             name="ReportAgent",
             llm_provider=llm_provider,
             prompt_file_path="src/prompts/agent_report.md"
         )
+        self._pipeline: Optional[ReportPipeline] = None
         logger.info("📊 Report Agent initialized successfully")
 
-    def generate_report(self, sheet_url: str, additional_context: str = "") -> Dict[str, Any]:
-        """Generate a report from the specified Google Sheet URL"""
+    def generate_report(self, sheet_url: str, additional_context: str = "",
+                        mode: str = ReportMode.AGENT.value,
+                        snapshot: Optional[SheetSnapshot] = None) -> Dict[str, Any]:
+        """Generate a report from the specified Google Sheet URL (or an already-fetched snapshot of it)"""
+        if ReportMode(mode) == ReportMode.PIPELINE:
+            return self._get_pipeline().run(sheet_url=sheet_url, additional_context=additional_context,
+                                            snapshot=snapshot)
+
         user_input = f"""Generate a report from the Google Sheet.
         Get the latest information by date and translate to English.
         Ensure to save the conversation history to MongoDB after completion.
@@ -42,7 +63,30 @@ class AgentReporter(LangChainBaseAgent):
             sheet_url=sheet_url
         )
 
-        return self.process(context)
+        # Tool reads of this sheet are served from the snapshot instead of refetching
+        with use_snapshot(snapshot):
+            return self.process(context)
+
+    def _get_pipeline(self) -> ReportPipeline:
+        """Get the deterministic pipeline, built on first use"""
+        if self._pipeline is None:
+            # Import here: the registry connects to MongoDB on import
+            from src.tools.tool_registry import tool_registry
+
+            sinks = build_sinks(
+                names=config.sinks.enabled,
+                tools={tool.name: tool for tool in tool_registry.get_all_tools()},
+                default_timeout=config.sinks.timeout,
+                timeouts=config.sinks.timeouts
+            )
+            self._pipeline = ReportPipeline(
+                llm_provider=self.llm_provider,
+                fetch_tool=tool_registry.get_tool("get_information_from_url"),
+                sinks=SinkDispatcher(sinks),
+                memo=translation_memo if config.translation_memo.enabled else None,
+                name=self.name
+            )
+        return self._pipeline
 
     def run(self, user_input: str, sheet_url: Optional[str] = None) -> Dict[str, Any]:
         """Legacy method for backward compatibility"""
@@ -0,0 +1,95 @@
+# ==========================================
+# src/agents/agent_runner.py
+# Bounded worker pool for blocking agent runs
+# ==========================================
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+class AgentRunnerBusyError(Exception):
+    """Raised when the admission queue is full"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class AgentRunner:
+    """Runs blocking agent calls on dedicated worker threads with bounded admission"""
+
+    def __init__(self, workers: int, queue_size: int, retry_after: int = 30):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.retry_after = retry_after
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="agent-run")
+        self._capacity = self.workers + self.queue_size
+        self._slots = threading.BoundedSemaphore(self._capacity)
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> "Future[Any]":
+        """Submit a blocking call, raising AgentRunnerBusyError when saturated"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            logger.warning(f"🚦 Agent runner saturated ({self._capacity} runs admitted)")
+            raise AgentRunnerBusyError(
+                f"Agent runner is at capacity ({self.workers} running, {self.queue_size} queued)",
+                retry_after=self.retry_after
+            )
+
+        with self._lock:
+            self._admitted += 1
+
+        def run():
+            with self._lock:
+                self._running += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                self._release()
+
+        try:
+            return self._executor.submit(run)
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self):
+        """Free an admission slot"""
+        with self._lock:
+            self._admitted -= 1
+        self._slots.release()
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking call without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get runner concurrency statistics"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "running": self._running,
+                "queued": self._admitted - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and shut down worker threads"""
+        self._executor.shutdown(wait=wait)
+        logger.info("⏹️ Agent runner stopped")
@@ -3,10 +3,12 @@
 # Base Agent Implementation
 # ==========================================
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.agents import AgentExecutor
 
+from src.agents.instrumentation import AgentRunRecorder, agent_metrics
+from src.monitoring.metrics import AGENT_RUNS_IN_FLIGHT
 from src.core.interfaces import BaseAgent, AgentContext, LLMInterface
 from src.config.settings import config
 from src.logs.logger import Logger
@@ -22,6 +24,10 @@ class LangChainBaseAgent(BaseAgent):
         self.prompt_file_path = prompt_file_path
         self.system_prompt = self._load_prompt()
         self.prompt_template = self._create_prompt_template()
+
+        # Built lazily and reused until the tool set changes
+        self._agent_executor: Optional[AgentExecutor] = None
+        self._tool_strings: Optional[Dict[str, str]] = None
         
         logger.info(f"✅ {name} agent initialized successfully")
     
@@ -109,10 +115,42 @@ Thought: {agent_scratchpad}"""
             logger.error(f"❌ Error creating agent executor: {str(e)}")
             raise
     
+    def add_tool(self, tool):
+        """Add a tool to the agent and invalidate the cached executor"""
+        super().add_tool(tool)
+        self._invalidate_executor()
+
+    def add_tools(self, tools: List):
+        """Add multiple tools to the agent and invalidate the cached executor"""
+        super().add_tools(tools)
+        self._invalidate_executor()
+
+    def _invalidate_executor(self):
+        """Drop the cached executor and tool strings after a tool set change"""
+        self._agent_executor = None
+        self._tool_strings = None
+
+    def _get_agent_executor(self) -> AgentExecutor:
+        """Get the cached agent executor, creating it on first use"""
+        if self._agent_executor is None:
+            self._agent_executor = self._create_agent_executor()
+        return self._agent_executor
+
+    def _get_tool_strings(self) -> Dict[str, str]:
+        """Get the rendered tool descriptions and names for the prompt"""
+        if self._tool_strings is None:
+            self._tool_strings = {
+                "tools": "\n".join([f"{tool.name}: {tool.description}" for tool in self.tools]),
+                "tool_names": ", ".join([tool.name for tool in self.tools])
+            }
+        return self._tool_strings
+
+    @AGENT_RUNS_IN_FLIGHT.labels(mode="agent").track_inprogress()
     def process(self, context: AgentContext) -> Dict[str, Any]:
         """Process a request with given context"""
+        recorder = AgentRunRecorder()
         try:
-            agent_executor = self._create_agent_executor()
+            agent_executor = self._get_agent_executor()
 
             # Prepare input with context
             user_input = context.user_input
@@ -125,26 +163,32 @@ Thought: {agent_scratchpad}"""
             agent_input = {
                 "input": user_input,
                 "system_prompt": self.system_prompt,
-                "tools": "\n".join([f"{tool.name}: {tool.description}" for tool in self.tools]),
-                "tool_names": ", ".join([tool.name for tool in self.tools]),
+                **self._get_tool_strings(),
                 "agent_scratchpad": ""
             }
 
-            result = agent_executor.invoke(agent_input)
+            result = agent_executor.invoke(agent_input, config={"callbacks": [recorder]})
 
-            logger.info(f"✅ {self.name} processed request successfully")
+            timings = recorder.summary()
+            agent_metrics.record(timings, success=True)
+            logger.info(f"✅ {self.name} processed request successfully in {timings['total_seconds']:.2f}s "
+                        f"({timings['llm_calls']} LLM calls, {timings['tool_calls']} tool calls)")
             return {
                 "success": True,
                 "output": result.get("output", ""),
                 "agent": self.name,
-                "context": context.metadata
+                "context": context.metadata,
+                "timings": timings
             }
         except Exception as e:
             logger.error(f"❌ Error in {self.name} execution: {str(e)}")
+            timings = recorder.summary()
+            agent_metrics.record(timings, success=False)
             return {
                 "success": False,
                 "error": str(e),
-                "agent": self.name
+                "agent": self.name,
+                "timings": timings
             }
     
     def get_system_prompt(self) -> str:
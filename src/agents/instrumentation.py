@@ -0,0 +1,204 @@
+# ==========================================
+# src/agents/instrumentation.py
+# Per-step agent instrumentation (LLM and tool timings)
+# ==========================================
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+def _payload_size(payload: Any) -> int:
+    """Size of a tool payload in UTF-8 bytes"""
+    if payload is None:
+        return 0
+    text = payload if isinstance(payload, str) else str(getattr(payload, "content", payload))
+    return len(text.encode("utf-8"))
+
+def _token_usage(response: Any) -> Dict[str, Optional[int]]:
+    """Extract prompt/completion token counts from an LLMResult"""
+    usage: Dict[str, Any] = {}
+    try:
+        message = response.generations[0][0].message
+        usage = getattr(message, "usage_metadata", None) or {}
+    except (AttributeError, IndexError, TypeError):
+        pass
+    if not usage and getattr(response, "llm_output", None):
+        usage = response.llm_output.get("usage_metadata") or response.llm_output.get("token_usage") or {}
+
+    return {
+        "prompt_tokens": usage.get("input_tokens", usage.get("prompt_tokens")),
+        "completion_tokens": usage.get("output_tokens", usage.get("completion_tokens"))
+    }
+
+class AgentRunRecorder(BaseCallbackHandler):
+    """Records LLM and tool timings for one agent run, grouped by ReAct iteration"""
+
+    def __init__(self):
+        super().__init__()
+        self.iterations: List[Dict[str, Any]] = []
+        self._starts: Dict[UUID, float] = {}
+        self._tool_starts: Dict[UUID, Dict[str, Any]] = {}
+        self._started_at = time.monotonic()
+
+    # ---- Manual recording (also used by callbacks) ----
+
+    def record_llm(self, seconds: float, prompt_tokens: Optional[int] = None,
+                   completion_tokens: Optional[int] = None, error: Optional[str] = None):
+        """Record an LLM call; each call starts a new iteration"""
+        iteration: Dict[str, Any] = {
+            "iteration": len(self.iterations) + 1,
+            "llm_seconds": round(seconds, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tools": []
+        }
+        if error:
+            iteration["llm_error"] = error
+        self.iterations.append(iteration)
+
+    def record_tool(self, name: str, seconds: float, input_bytes: int = 0, output_bytes: int = 0,
+                    error: Optional[str] = None):
+        """Record a tool call against the current iteration"""
+        if not self.iterations:
+            self.iterations.append({
+                "iteration": 1, "llm_seconds": None,
+                "prompt_tokens": None, "completion_tokens": None, "tools": []
+            })
+        tool: Dict[str, Any] = {
+            "tool": name,
+            "seconds": round(seconds, 4),
+            "input_bytes": input_bytes,
+            "output_bytes": output_bytes
+        }
+        if error:
+            tool["error"] = error
+        self.iterations[-1]["tools"].append(tool)
+
+    # ---- LangChain callbacks ----
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts[run_id] = time.monotonic()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            **kwargs: Any) -> None:
+        self._starts[run_id] = time.monotonic()
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        start = self._starts.pop(run_id, time.monotonic())
+        usage = _token_usage(response)
+        self.record_llm(time.monotonic() - start, prompt_tokens=usage["prompt_tokens"],
+                        completion_tokens=usage["completion_tokens"])
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        start = self._starts.pop(run_id, time.monotonic())
+        self.record_llm(time.monotonic() - start, error=str(error))
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._tool_starts[run_id] = {
+            "name": (serialized or {}).get("name", "unknown"),
+            "start": time.monotonic(),
+            "input_bytes": _payload_size(input_str)
+        }
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._tool_starts.pop(run_id, None)
+        if started:
+            self.record_tool(started["name"], time.monotonic() - started["start"],
+                             started["input_bytes"], _payload_size(output))
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._tool_starts.pop(run_id, None)
+        if started:
+            self.record_tool(started["name"], time.monotonic() - started["start"],
+                             started["input_bytes"], error=str(error))
+
+    # ---- Results ----
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact timing breakdown for this run"""
+        tools = [tool for iteration in self.iterations for tool in iteration["tools"]]
+        return {
+            "total_seconds": round(time.monotonic() - self._started_at, 4),
+            "llm_calls": len([i for i in self.iterations if i["llm_seconds"] is not None]),
+            "llm_seconds": round(sum(i["llm_seconds"] or 0.0 for i in self.iterations), 4),
+            "tool_calls": len(tools),
+            "tool_seconds": round(sum(tool["seconds"] for tool in tools), 4),
+            "prompt_tokens": sum(i["prompt_tokens"] or 0 for i in self.iterations),
+            "completion_tokens": sum(i["completion_tokens"] or 0 for i in self.iterations),
+            "iterations": self.iterations
+        }
+
+class AgentMetrics:
+    """In-process aggregation of agent run timings"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all aggregates"""
+        with self._lock:
+            self._runs = 0
+            self._failures = 0
+            self._run_seconds = 0.0
+            self._llm = {"calls": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "errors": 0}
+            self._tools: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, summary: Dict[str, Any], success: bool = True):
+        """Fold one run's summary into the aggregates"""
+        with self._lock:
+            self._runs += 1
+            if not success:
+                self._failures += 1
+            self._run_seconds += summary.get("total_seconds", 0.0)
+
+            for iteration in summary.get("iterations", []):
+                if iteration["llm_seconds"] is not None:
+                    self._llm["calls"] += 1
+                    self._llm["seconds"] += iteration["llm_seconds"]
+                self._llm["prompt_tokens"] += iteration["prompt_tokens"] or 0
+                self._llm["completion_tokens"] += iteration["completion_tokens"] or 0
+                if "llm_error" in iteration:
+                    self._llm["errors"] += 1
+
+                for tool in iteration["tools"]:
+                    stats = self._tools.setdefault(tool["tool"], {
+                        "calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0, "output_bytes": 0
+                    })
+                    stats["calls"] += 1
+                    stats["seconds"] += tool["seconds"]
+                    stats["max_seconds"] = max(stats["max_seconds"], tool["seconds"])
+                    stats["output_bytes"] += tool["output_bytes"]
+                    if "error" in tool:
+                        stats["errors"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregated run, LLM and per-tool statistics"""
+        with self._lock:
+            llm_calls = self._llm["calls"]
+            return {
+                "runs": self._runs,
+                "failures": self._failures,
+                "avg_run_seconds": round(self._run_seconds / self._runs, 4) if self._runs else 0.0,
+                "llm": {
+                    **{key: round(value, 4) if isinstance(value, float) else value for key, value in self._llm.items()},
+                    "avg_seconds": round(self._llm["seconds"] / llm_calls, 4) if llm_calls else 0.0
+                },
+                "tools": {
+                    name: {
+                        **{key: round(value, 4) if isinstance(value, float) else value for key, value in stats.items()},
+                        "avg_seconds": round(stats["seconds"] / stats["calls"], 4) if stats["calls"] else 0.0
+                    }
+                    for name, stats in self._tools.items()
+                }
+            }
+
+# Global agent metrics instance
+agent_metrics = AgentMetrics()
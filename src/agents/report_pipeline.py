@@ -0,0 +1,180 @@
+# ==========================================
+# src/agents/report_pipeline.py
+# Deterministic Report Pipeline (single LLM call)
+# ==========================================
+
+import json
+import re
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from src.agents.instrumentation import AgentRunRecorder, agent_metrics
+from src.agents.report_sinks import ReportPayload, SinkDispatcher
+from src.core.interfaces import BaseTool, LLMInterface
+from src.llms.translation_memo import TranslationMemo
+from src.monitoring.metrics import AGENT_RUNS_IN_FLIGHT
+from src.sheets.snapshot import SheetSnapshot
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+class ReportPipeline:
+    """Fetch sheet → translate/format with one LLM call → fan out to sinks (MongoDB, Slack)"""
+
+    def __init__(self, llm_provider: LLMInterface, fetch_tool: BaseTool, sinks: SinkDispatcher,
+                 memo: Optional[TranslationMemo] = None,
+                 prompt_file_path: str = "src/prompts/report_pipeline.md", name: str = "ReportAgent"):
+        self.llm_provider = llm_provider
+        self.fetch_tool = fetch_tool
+        self.sinks = sinks
+        self.memo = memo
+        self.prompt_file_path = prompt_file_path
+        self.name = name
+        self.system_prompt = self._load_prompt()
+
+    def _load_prompt(self) -> str:
+        """Load the formatting prompt from file"""
+        try:
+            with open(self.prompt_file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read pipeline prompt {self.prompt_file_path}: {str(e)}")
+            return ("Translate the values under 'Needs translation' to English and format all values as a daily "
+                    "report with Date, Completed, In Progress and Blocked sections. Respond with only a JSON object: "
+                    '{"translations": {"<column>": "<English>"}, "report": "<report text>"}')
+
+    @AGENT_RUNS_IN_FLIGHT.labels(mode="pipeline").track_inprogress()
+    def run(self, sheet_url: str, additional_context: str = "",
+            snapshot: Optional[SheetSnapshot] = None) -> Dict[str, Any]:
+        """Run the pipeline end to end"""
+        recorder = AgentRunRecorder()
+        try:
+            # Step 1: use the caller's snapshot, or fetch the latest row
+            if snapshot is not None and snapshot.matches(sheet_url):
+                data_source = "snapshot"
+                data = snapshot.row()
+            else:
+                data_source = "fetch"
+                started = time.monotonic()
+                data = self.fetch_tool.execute(url=sheet_url)
+                recorder.record_tool(self.fetch_tool.name, time.monotonic() - started,
+                                     len(sheet_url.encode("utf-8")), len(json.dumps(data, default=str).encode("utf-8")),
+                                     error=data.get("error"))
+                if "error" in data:
+                    raise ValueError(data["error"])
+
+            # Step 2: fill known cells from the memo, then one LLM call for the rest and formatting
+            translated, pending = self._prepare_cells(data)
+            report = self._format_report(data, translated, pending, additional_context, recorder)
+
+            # Step 3: persist and deliver concurrently
+            started = time.monotonic()
+            sink_results = self.sinks.dispatch(ReportPayload(
+                report=report,
+                data=data,
+                user_input=f"Generate report from Google Sheet: {sheet_url}",
+                sheet_url=sheet_url
+            ))
+            recorder.record_tool("sinks", time.monotonic() - started,
+                                 error=None if all(r["status"] == "success" for r in sink_results.values())
+                                 else "one or more sinks failed")
+
+            timings = recorder.summary()
+            agent_metrics.record(timings, success=True)
+            logger.info(f"✅ {self.name} pipeline completed for {sheet_url} in {timings['total_seconds']:.2f}s")
+            return {
+                "success": True,
+                "output": report,
+                "agent": self.name,
+                "sinks": sink_results,
+                "context": {
+                    "task_type": "report_generation",
+                    "output_format": "structured_report",
+                    "mode": "pipeline",
+                    "data_source": data_source,
+                    "llm_calls": 1,
+                    "translation_memo": {"hits": len(translated), "misses": len(pending)}
+                },
+                "timings": timings
+            }
+        except Exception as e:
+            logger.error(f"❌ Error in {self.name} pipeline: {str(e)}")
+            timings = recorder.summary()
+            agent_metrics.record(timings, success=False)
+            return {
+                "success": False,
+                "error": str(e),
+                "agent": self.name,
+                "timings": timings
+            }
+
+    def _prepare_cells(self, data: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Split translatable cells into memo hits (already translated) and pending ones"""
+        cells = {
+            column: value.strip() for column, value in data.items()
+            if column.lower() != 'date' and isinstance(value, str)
+            and value.strip() and value.strip().lower() not in ['none', 'null', 'nan']
+        }
+        known = self.memo.lookup(cells.values()) if self.memo and cells else {}
+
+        translated = {column: known[text] for column, text in cells.items() if text in known}
+        pending = {column: text for column, text in cells.items() if text not in known}
+        return translated, pending
+
+    def _build_input(self, data: Dict[str, Any], translated: Dict[str, str], pending: Dict[str, str],
+                     additional_context: str = "") -> str:
+        """Render the sheet row as the user message"""
+        fields = {
+            column: value for column, value in data.items()
+            if column not in translated and column not in pending
+        }
+        sections = []
+        for title, values in (("Fields", fields), ("Already translated", translated), ("Needs translation", pending)):
+            if values:
+                lines = [f"{key}: {'' if value is None else value}" for key, value in values.items()]
+                sections.append(f"{title}:\n" + "\n".join(lines))
+
+        message = "Latest data from Google Sheet:\n\n" + "\n\n".join(sections)
+        if additional_context:
+            message += f"\n\nAdditional context: {additional_context}"
+        return message
+
+    def _format_report(self, data: Dict[str, Any], translated: Dict[str, str], pending: Dict[str, str],
+                       additional_context: str = "", recorder: Optional[AgentRunRecorder] = None) -> str:
+        """Translate pending cells and format the row with a single LLM call"""
+        started = time.monotonic()
+        try:
+            raw = self.llm_provider.generate(
+                self.system_prompt,
+                self._build_input(data, translated, pending, additional_context)
+            )
+        except Exception as e:
+            if recorder:
+                recorder.record_llm(time.monotonic() - started, error=str(e))
+            raise
+        if recorder:
+            recorder.record_llm(time.monotonic() - started)
+        report, translations = self._parse_output(raw)
+        if not report:
+            raise ValueError("LLM returned an empty report")
+
+        if self.memo and translations:
+            self.memo.store({pending[column]: text for column, text in translations.items() if column in pending})
+        return report
+
+    def _parse_output(self, raw: str) -> Tuple[str, Dict[str, str]]:
+        """Extract the report and cell translations from the model's JSON answer"""
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip())
+        try:
+            parsed = json.loads(text)
+        except json.JSONDecodeError:
+            # Plain-text answer: use it as the report, nothing to memoize
+            logger.warning("⚠️ Pipeline output was not JSON, skipping translation memo update")
+            return raw.strip(), {}
+
+        if not isinstance(parsed, dict):
+            return raw.strip(), {}
+        translations = parsed.get("translations") or {}
+        if not isinstance(translations, dict):
+            translations = {}
+        return str(parsed.get("report", "")).strip(), {str(k): str(v) for k, v in translations.items() if v}
@@ -0,0 +1,191 @@
+# ==========================================
+# src/agents/report_sinks.py
+# Concurrent post-generation report sinks
+# ==========================================
+
+import contextvars
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.interfaces import BaseTool
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+@dataclass
+class ReportPayload:
+    """Everything a sink may need to persist or deliver a report"""
+    report: str
+    data: Dict[str, Any]
+    user_input: str
+    sheet_url: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def idempotency_key(self) -> str:
+        """Identity of a delivery: the same report for the same sheet"""
+        payload = f"{self.sheet_url or ''}\n{self.report}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+@dataclass
+class ReportSink:
+    """A named side effect applied to a finished report"""
+    name: str
+    send: Callable[[ReportPayload], Dict[str, Any]]
+    timeout: float
+
+class SinkDispatcher:
+    """Runs all sinks concurrently, each bounded by its own timeout
+
+    A send that times out cannot be interrupted once it has started, so it may still be delivered late. Until it
+    finishes, dispatching the same report again skips that sink; if it then succeeds, the next dispatch of the
+    same report skips it once more (that retry was for a delivery that did go out).
+    """
+
+    def __init__(self, sinks: List[ReportSink], max_late_deliveries: int = 256):
+        self.sinks = sinks
+        # Spare workers for sends abandoned after their timeout, so a retry does not queue behind them
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, 2 * len(sinks)),
+            thread_name_prefix="report-sink"
+        )
+        self.max_late_deliveries = max(1, max_late_deliveries)
+
+        self._lock = threading.Lock()
+        # (sink, idempotency key) -> whether the caller was already told the send timed out
+        self._in_flight: Dict[Tuple[str, str], bool] = {}
+        self._late: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+
+    def dispatch(self, payload: ReportPayload) -> Dict[str, Dict[str, Any]]:
+        """Send the payload to every sink and collect per-sink results"""
+        started = time.monotonic()
+        key = payload.idempotency_key()
+
+        results: Dict[str, Dict[str, Any]] = {}
+        futures = {}
+        for sink in self.sinks:
+            if not self._claim((sink.name, key)):
+                logger.warning(f"⏭️ Sink '{sink.name}' skipped, this report was already sent or is still sending")
+                results[sink.name] = {"status": "skipped", "elapsed_seconds": 0.0,
+                                      "error": "Duplicate of a delivery that is in flight or went out late"}
+                continue
+            # Each sink runs in a copy of the caller's context (e.g. the per-sheet Slack target)
+            futures[sink.name] = (sink, self._executor.submit(contextvars.copy_context().run, self._timed_send,
+                                                              sink, payload, key))
+
+        for name, (sink, future) in futures.items():
+            # All sinks started together, so each deadline is relative to the common start
+            remaining = max(0.0, sink.timeout - (time.monotonic() - started))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                outcome = self._time_out((name, key), future)
+                if outcome is not None:
+                    # Finished right at the deadline
+                    results[name] = outcome
+                    continue
+                logger.warning(f"⏱️ Sink '{name}' timed out after {sink.timeout:.1f}s")
+                results[name] = {
+                    "status": "timeout",
+                    "elapsed_seconds": round(time.monotonic() - started, 3),
+                    "error": f"Timed out after {sink.timeout:.1f}s",
+                    # A send that never started is cancelled; a started one may still be delivered
+                    "cancelled": future.cancelled()
+                }
+            except Exception as e:
+                results[name] = {
+                    "status": "error",
+                    "elapsed_seconds": round(time.monotonic() - started, 3),
+                    "error": str(e)
+                }
+
+        logger.info(f"📤 Dispatched report to {len(self.sinks)} sinks in {time.monotonic() - started:.2f}s")
+        return results
+
+    def _claim(self, delivery: Tuple[str, str]) -> bool:
+        """Reserve a delivery unless the same one is in flight or just went out late"""
+        with self._lock:
+            if delivery in self._in_flight:
+                return False
+            if delivery in self._late:
+                del self._late[delivery]
+                return False
+            self._in_flight[delivery] = False
+            return True
+
+    def _time_out(self, delivery: Tuple[str, str], future) -> Optional[Dict[str, Any]]:
+        """Cancel a timed-out send, or mark it so a late success is remembered; returns its result if it finished"""
+        with self._lock:
+            if future.cancel():
+                self._in_flight.pop(delivery, None)
+                return None
+            if delivery in self._in_flight:
+                self._in_flight[delivery] = True
+                return None
+        return future.result()
+
+    def _finish(self, delivery: Tuple[str, str], succeeded: bool) -> None:
+        """Release a delivery; a success the caller was told had timed out is remembered"""
+        with self._lock:
+            timed_out = self._in_flight.pop(delivery, False)
+            if timed_out and succeeded:
+                self._late[delivery] = None
+                while len(self._late) > self.max_late_deliveries:
+                    self._late.popitem(last=False)
+        if timed_out and succeeded:
+            logger.warning(f"⏱️ Sink '{delivery[0]}' delivered after its timeout")
+
+    def _timed_send(self, sink: ReportSink, payload: ReportPayload, key: str) -> Dict[str, Any]:
+        """Call a sink and normalize its result"""
+        start = time.monotonic()
+        try:
+            result = sink.send(payload)
+            status = "success" if result.get("status") == "success" else "error"
+            outcome: Dict[str, Any] = {"status": status, "result": result}
+            if status == "error":
+                outcome["error"] = result.get("error") or result.get("message") or "Unknown error"
+                logger.warning(f"⚠️ Sink '{sink.name}' failed: {outcome['error']}")
+        except Exception as e:
+            logger.error(f"❌ Sink '{sink.name}' raised: {str(e)}")
+            outcome = {"status": "error", "error": str(e)}
+        outcome["elapsed_seconds"] = round(time.monotonic() - start, 3)
+        self._finish((sink.name, key), outcome["status"] == "success")
+        return outcome
+
+def mongo_sink(save_tool: BaseTool, timeout: float) -> ReportSink:
+    """Persist the report through SaveChatHistoryTool"""
+    def send(payload: ReportPayload) -> Dict[str, Any]:
+        return save_tool.execute(
+            user_input=payload.user_input,
+            response=payload.report,
+            conversation_data=json.dumps(payload.data, ensure_ascii=False, default=str)
+        )
+    return ReportSink(name="mongo", send=send, timeout=timeout)
+
+def slack_sink(slack_tool: BaseTool, timeout: float) -> ReportSink:
+    """Deliver the report through SendSlackMessageTool"""
+    def send(payload: ReportPayload) -> Dict[str, Any]:
+        return slack_tool.execute(message=payload.report)
+    return ReportSink(name="slack", send=send, timeout=timeout)
+
+def build_sinks(names: List[str], tools: Dict[str, BaseTool], default_timeout: float,
+                timeouts: Optional[Dict[str, float]] = None) -> List[ReportSink]:
+    """Build the configured sinks from registered tools"""
+    factories = {
+        "mongo": lambda timeout: mongo_sink(tools["save_chat_history_DB"], timeout),
+        "slack": lambda timeout: slack_sink(tools["send_slack_message"], timeout)
+    }
+    timeouts = timeouts or {}
+
+    sinks = []
+    for name in names:
+        if name not in factories:
+            logger.warning(f"⚠️ Unknown report sink '{name}', skipping")
+            continue
+        sinks.append(factories[name](timeouts.get(name, default_timeout)))
+    return sinks
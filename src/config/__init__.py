@@ -1,4 +1,4 @@
 # Configuration module
-from .settings import config, DatabaseConfig, LLMConfig, AppConfig, SlackConfig, SchedulerConfig
+from .settings import config, DatabaseConfig, LLMConfig, AppConfig, SlackConfig, SchedulerConfig, MonitoredSheet, AgentPoolConfig, AgentRunnerConfig, SinkConfig, LLMCacheConfig, TranslationMemoConfig, SheetFetchConfig, SheetCacheConfig, SheetStoreConfig, StateStoreConfig, LeaderElectionConfig
 
-__all__ = ['config', 'DatabaseConfig', 'LLMConfig', 'AppConfig', 'SlackConfig', 'SchedulerConfig']
+__all__ = ['config', 'DatabaseConfig', 'LLMConfig', 'AppConfig', 'SlackConfig', 'SchedulerConfig', 'MonitoredSheet', 'AgentPoolConfig', 'AgentRunnerConfig', 'SinkConfig', 'LLMCacheConfig', 'TranslationMemoConfig', 'SheetFetchConfig', 'SheetCacheConfig', 'SheetStoreConfig', 'StateStoreConfig', 'LeaderElectionConfig']
@@ -3,6 +3,7 @@
 # Centralized Configuration Management
 # ==========================================
 
+import json
 import os
 from typing import Optional
 from dataclasses import dataclass
@@ -17,13 +18,21 @@ class DatabaseConfig:
     mongodb_uri: str
     mongodb_db_name: str
     mongodb_collection_name: str
+    mongodb_jobs_collection_name: str
+    mongodb_jobs_ttl_seconds: int
+    mongodb_jobs_deadline_seconds: int
     
     @classmethod
     def from_env(cls) -> 'DatabaseConfig':
         return cls(
             mongodb_uri=os.getenv("MONGODB_URI", "mongodb://localhost:27017"),
             mongodb_db_name=os.getenv("MONGODB_DB_NAME", "report"),
-            mongodb_collection_name=os.getenv("MONGODB_COLLECTION_NAME", "daily_report")
+            mongodb_collection_name=os.getenv("MONGODB_COLLECTION_NAME", "daily_report"),
+            mongodb_jobs_collection_name=os.getenv("MONGODB_JOBS_COLLECTION_NAME", "report_jobs"),
+            # Finished job records expire after this long (0 keeps them forever)
+            mongodb_jobs_ttl_seconds=max(0, int(os.getenv("MONGODB_JOBS_TTL_SECONDS", "604800"))),
+            # Jobs still queued or running this long after creation are failed (their worker died or hung)
+            mongodb_jobs_deadline_seconds=max(1, int(os.getenv("MONGODB_JOBS_DEADLINE_SECONDS", "3600")))
         )
 
 @dataclass
@@ -47,21 +56,95 @@ class LLMConfig:
             verbose=os.getenv("LLM_VERBOSE", "False").lower() == "true"
         )
 
+@dataclass
+class LLMCacheConfig:
+    """LLM result cache configuration settings"""
+    enabled: bool
+    max_entries: int
+    ttl_seconds: int
+    mongo_enabled: bool
+    mongo_collection_name: str
+
+    @classmethod
+    def from_env(cls) -> 'LLMCacheConfig':
+        return cls(
+            enabled=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256")),
+            ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+            mongo_enabled=os.getenv("LLM_CACHE_MONGO_ENABLED", "false").lower() == "true",
+            mongo_collection_name=os.getenv("LLM_CACHE_COLLECTION_NAME", "llm_cache")
+        )
+
+@dataclass
+class TranslationMemoConfig:
+    """Per-cell translation memo configuration settings"""
+    enabled: bool
+    target_language: str
+    mongo_enabled: bool
+    mongo_collection_name: str
+    max_entries: int
+
+    @classmethod
+    def from_env(cls) -> 'TranslationMemoConfig':
+        return cls(
+            enabled=os.getenv("TRANSLATION_MEMO_ENABLED", "true").lower() == "true",
+            target_language=os.getenv("TRANSLATION_TARGET_LANGUAGE", "English"),
+            mongo_enabled=os.getenv("TRANSLATION_MEMO_MONGO_ENABLED", "true").lower() == "true",
+            mongo_collection_name=os.getenv("TRANSLATION_MEMO_COLLECTION_NAME", "translation_memo"),
+            max_entries=int(os.getenv("TRANSLATION_MEMO_MAX_ENTRIES", "4096"))
+        )
+
 @dataclass
 class SlackConfig:
     """Slack configuration settings"""
     bot_token: str
     user_id: str
     channel_id: Optional[str]
+    request_timeout: float
 
     @classmethod
     def from_env(cls) -> 'SlackConfig':
         return cls(
             bot_token=os.getenv("SLACK_BOT_TOKEN", ""),
             user_id=os.getenv("SLACK_USER_ID", ""),
-            channel_id=os.getenv("SLACK_CHANNEL_ID")
+            channel_id=os.getenv("SLACK_CHANNEL_ID"),
+            request_timeout=float(os.getenv("SLACK_REQUEST_TIMEOUT", "10"))
         )
 
+@dataclass
+class MonitoredSheet:
+    """A sheet checked by the scheduler, with its own Slack target and reminder policy"""
+    name: str
+    sheet_url: str
+    slack_target: Optional[str] = None
+    max_reminders: int = 3
+    tabs: Optional[dict] = None
+
+def load_monitored_sheets(default_max_reminders: int) -> list:
+    """Monitored sheets from SCHEDULER_SHEETS_FILE or SCHEDULER_SHEETS (JSON list), else DEFAULT_SHEET_URL"""
+    sheets_file = os.getenv("SCHEDULER_SHEETS_FILE")
+    if sheets_file:
+        with open(sheets_file, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    else:
+        entries = json.loads(os.getenv("SCHEDULER_SHEETS") or "[]")
+
+    if not entries:
+        default_sheet_url = os.getenv("DEFAULT_SHEET_URL")
+        return [MonitoredSheet(name="default", sheet_url=default_sheet_url,
+                               max_reminders=default_max_reminders)] if default_sheet_url else []
+
+    return [
+        MonitoredSheet(
+            name=entry.get("name") or f"sheet-{index + 1}",
+            sheet_url=entry["sheet_url"],
+            slack_target=entry.get("slack_target"),
+            max_reminders=int(entry.get("max_reminders", default_max_reminders)),
+            tabs=entry.get("tabs")
+        )
+        for index, entry in enumerate(entries)
+    ]
+
 @dataclass
 class SchedulerConfig:
     """Scheduler configuration settings"""
@@ -69,17 +152,170 @@ class SchedulerConfig:
     timezone: str
     check_times: list
     max_reminders: int
+    report_mode: str
+    concurrency: int
+    sheets: list
 
     @classmethod
     def from_env(cls) -> 'SchedulerConfig':
         check_times_str = os.getenv("SCHEDULER_CHECK_TIMES", "10:00,12:00,15:00")
         check_times = [time.strip() for time in check_times_str.split(",")]
+        max_reminders = int(os.getenv("SCHEDULER_MAX_REMINDERS", "3"))
 
         return cls(
             enabled=os.getenv("SCHEDULER_ENABLED", "true").lower() == "true",
             timezone=os.getenv("SCHEDULER_TIMEZONE", "Asia/Ho_Chi_Minh"),
             check_times=check_times,
-            max_reminders=int(os.getenv("SCHEDULER_MAX_REMINDERS", "3"))
+            max_reminders=max_reminders,
+            report_mode=os.getenv("SCHEDULER_REPORT_MODE", "agent").lower(),
+            concurrency=max(1, int(os.getenv("SCHEDULER_CONCURRENCY", "4"))),
+            sheets=load_monitored_sheets(max_reminders)
+        )
+
+@dataclass
+class AgentPoolConfig:
+    """Agent pool configuration settings"""
+    size: int
+    acquire_timeout: float
+
+    @classmethod
+    def from_env(cls) -> 'AgentPoolConfig':
+        return cls(
+            size=max(1, int(os.getenv("AGENT_POOL_SIZE", "2"))),
+            acquire_timeout=float(os.getenv("AGENT_POOL_ACQUIRE_TIMEOUT", "60"))
+        )
+
+@dataclass
+class AgentRunnerConfig:
+    """Agent runner (worker pool) configuration settings"""
+    workers: int
+    queue_size: int
+    retry_after: int
+
+    @classmethod
+    def from_env(cls) -> 'AgentRunnerConfig':
+        return cls(
+            workers=max(1, int(os.getenv("AGENT_RUNNER_WORKERS", os.getenv("AGENT_POOL_SIZE", "2")))),
+            queue_size=max(0, int(os.getenv("AGENT_RUNNER_QUEUE_SIZE", "8"))),
+            retry_after=int(os.getenv("AGENT_RUNNER_RETRY_AFTER", "30"))
+        )
+
+@dataclass
+class SinkConfig:
+    """Report sink (post-generation side effects) configuration settings"""
+    enabled: list
+    timeout: float
+    timeouts: dict
+
+    @classmethod
+    def from_env(cls) -> 'SinkConfig':
+        enabled_str = os.getenv("REPORT_SINKS", "mongo,slack")
+        enabled = [name.strip() for name in enabled_str.split(",") if name.strip()]
+
+        # Per-sink overrides, e.g. "slack:10,mongo:5"
+        timeouts = {}
+        for item in os.getenv("REPORT_SINK_TIMEOUTS", "").split(","):
+            if ":" in item:
+                name, value = item.split(":", 1)
+                timeouts[name.strip()] = float(value)
+
+        return cls(
+            enabled=enabled,
+            timeout=float(os.getenv("REPORT_SINK_TIMEOUT", "20")),
+            timeouts=timeouts
+        )
+
+@dataclass
+class SheetFetchConfig:
+    """Google Sheets fetcher (HTTP session, timeouts, retries) configuration settings"""
+    connect_timeout: float
+    read_timeout: float
+    max_retries: int
+    backoff_base: float
+    backoff_max: float
+    pool_size: int
+
+    @classmethod
+    def from_env(cls) -> 'SheetFetchConfig':
+        return cls(
+            connect_timeout=float(os.getenv("SHEET_FETCH_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("SHEET_FETCH_READ_TIMEOUT", "30")),
+            max_retries=max(0, int(os.getenv("SHEET_FETCH_MAX_RETRIES", "3"))),
+            backoff_base=float(os.getenv("SHEET_FETCH_BACKOFF_BASE", "0.5")),
+            backoff_max=float(os.getenv("SHEET_FETCH_BACKOFF_MAX", "8")),
+            pool_size=max(1, int(os.getenv("SHEET_FETCH_POOL_SIZE", "10")))
+        )
+
+@dataclass
+class SheetCacheConfig:
+    """Parsed sheet cache (conditional downloads) configuration settings"""
+    enabled: bool
+    ttl_seconds: float
+    max_sheets: int
+
+    @classmethod
+    def from_env(cls) -> 'SheetCacheConfig':
+        return cls(
+            enabled=os.getenv("SHEET_CACHE_ENABLED", "true").lower() == "true",
+            ttl_seconds=float(os.getenv("SHEET_CACHE_TTL_SECONDS", "60")),
+            max_sheets=max(1, int(os.getenv("SHEET_CACHE_MAX_SHEETS", "32")))
+        )
+
+@dataclass
+class SheetStoreConfig:
+    """On-disk sheet snapshot store (Arrow IPC, diffed per fetch) configuration settings"""
+    enabled: bool
+    directory: str
+    max_snapshots: int
+
+    @classmethod
+    def from_env(cls) -> 'SheetStoreConfig':
+        # Defaults to a folder next to the scheduler state file (the data volume in Docker)
+        state_dir = os.path.dirname(os.getenv("SCHEDULER_STATE_FILE", "daily_report_state.json"))
+        return cls(
+            enabled=os.getenv("SHEET_STORE_ENABLED", "true").lower() == "true",
+            directory=os.getenv("SHEET_STORE_DIR") or os.path.join(state_dir or "data", "sheets"),
+            max_snapshots=max(1, int(os.getenv("SHEET_STORE_MAX_SNAPSHOTS", "30")))
+        )
+
+@dataclass
+class StateStoreConfig:
+    """Daily scheduler state storage (JSON file written behind, SQLite or shared MongoDB) configuration settings"""
+    backend: str
+    state_file: str
+    sqlite_path: str
+    mongo_collection_name: str
+    flush_interval: float
+    fsync: bool
+    compact: bool
+
+    @classmethod
+    def from_env(cls) -> 'StateStoreConfig':
+        state_file = os.getenv("SCHEDULER_STATE_FILE", "daily_report_state.json")
+        return cls(
+            backend=os.getenv("STATE_BACKEND", "json").strip().lower(),
+            state_file=state_file,
+            # Defaults to a database next to the JSON state file (the data volume in Docker)
+            sqlite_path=os.getenv("STATE_SQLITE_PATH") or os.path.splitext(state_file)[0] + ".db",
+            mongo_collection_name=os.getenv("STATE_MONGO_COLLECTION_NAME", "scheduler_state"),
+            flush_interval=max(0.0, float(os.getenv("STATE_FLUSH_INTERVAL", "1.0"))),
+            fsync=os.getenv("STATE_FSYNC", "false").lower() == "true",
+            compact=os.getenv("STATE_COMPACT", "true").lower() == "true"
+        )
+
+@dataclass
+class LeaderElectionConfig:
+    """Scheduler leader lease (one active scheduler across replicas) configuration settings"""
+    enabled: bool
+    collection_name: str
+    lease_seconds: float
+
+    @classmethod
+    def from_env(cls) -> 'LeaderElectionConfig':
+        return cls(
+            enabled=os.getenv("SCHEDULER_LEADER_ELECTION", "false").lower() == "true",
+            collection_name=os.getenv("SCHEDULER_LOCK_COLLECTION_NAME", "scheduler_locks"),
+            lease_seconds=max(3.0, float(os.getenv("SCHEDULER_LEADER_LEASE_SECONDS", "60")))
         )
 
 @dataclass
@@ -94,8 +330,18 @@ class AppConfig:
     # Sub-configurations
     database: DatabaseConfig
     llm: LLMConfig
+    llm_cache: LLMCacheConfig
+    translation_memo: TranslationMemoConfig
     slack: SlackConfig
     scheduler: SchedulerConfig
+    agent_pool: AgentPoolConfig
+    agent_runner: AgentRunnerConfig
+    sinks: SinkConfig
+    sheet_fetch: SheetFetchConfig
+    sheet_cache: SheetCacheConfig
+    sheet_store: SheetStoreConfig
+    state_store: StateStoreConfig
+    leader_election: LeaderElectionConfig
     
     @classmethod
     def from_env(cls) -> 'AppConfig':
@@ -107,8 +353,18 @@ class AppConfig:
             api_port=int(os.getenv("API_PORT", "5000")),
             database=DatabaseConfig.from_env(),
             llm=LLMConfig.from_env(),
+            llm_cache=LLMCacheConfig.from_env(),
+            translation_memo=TranslationMemoConfig.from_env(),
             slack=SlackConfig.from_env(),
-            scheduler=SchedulerConfig.from_env()
+            scheduler=SchedulerConfig.from_env(),
+            agent_pool=AgentPoolConfig.from_env(),
+            agent_runner=AgentRunnerConfig.from_env(),
+            sinks=SinkConfig.from_env(),
+            sheet_fetch=SheetFetchConfig.from_env(),
+            sheet_cache=SheetCacheConfig.from_env(),
+            sheet_store=SheetStoreConfig.from_env(),
+            state_store=StateStoreConfig.from_env(),
+            leader_election=LeaderElectionConfig.from_env()
         )
 
 # Global config instance
@@ -83,3 +83,21 @@ class LLMInterface(ABC):
     def name(self) -> str:
         """Get the LLM name"""
         pass
+
+    def get_model_config(self) -> Dict[str, Any]:
+        """Get the settings that determine model output (used for cache keys)"""
+        return {"name": self.name}
+
+    def generate(self, system_prompt: str, user_message: str) -> str:
+        """Run a single system + user completion and return the text"""
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        response = self.get_llm().invoke([
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_message)
+        ])
+        content = response.content if hasattr(response, "content") else response
+
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+        return str(content).strip()
@@ -3,12 +3,14 @@
 # Refactored MongoDB Integration
 # ==========================================
 
+import time
 from typing import List, Dict, Any, Optional
 from pymongo import MongoClient
 from pymongo.collection import Collection
 from pymongo.database import Database
 from src.core.interfaces import DatabaseInterface
 from src.config.settings import config
+from src.monitoring.metrics import MONGO_INSERT_DURATION
 from src.logs.logger import Logger
 
 logger = Logger(__name__)
@@ -18,7 +20,8 @@ class MongoDB(DatabaseInterface):
     Refactored MongoDB operations with proper error handling and configuration
     """
 
-    def __init__(self):
+    def __init__(self, collection_name: Optional[str] = None):
+        self._collection_name = collection_name or config.database.mongodb_collection_name
         self._client: Optional[MongoClient] = None
         self._db: Optional[Database] = None
         self._collection: Optional[Collection] = None
@@ -29,7 +32,7 @@ class MongoDB(DatabaseInterface):
         try:
             self._client = MongoClient(config.database.mongodb_uri)
             self._db = self._client[config.database.mongodb_db_name]
-            self._collection = self._db[config.database.mongodb_collection_name]
+            self._collection = self._db[self._collection_name]
 
             # Test connection
             self._client.admin.command('ping')
@@ -106,12 +109,36 @@ class MongoDB(DatabaseInterface):
 
     def insert_one(self, doc: Dict[str, Any]):
         """Insert one document into the collection"""
+        start = time.perf_counter()
         try:
-            return self.collection.insert_one(doc)
+            result = self.collection.insert_one(doc)
+            MONGO_INSERT_DURATION.labels(collection=self._collection_name, status="success").observe(
+                time.perf_counter() - start
+            )
+            return result
         except Exception as e:
+            MONGO_INSERT_DURATION.labels(collection=self._collection_name, status="error").observe(
+                time.perf_counter() - start
+            )
             logger.error(f"❌ Error inserting document: {str(e)}")
             raise
 
+    def find_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Find a single document in the collection"""
+        try:
+            return self.collection.find_one(query)
+        except Exception as e:
+            logger.error(f"❌ Error finding document: {str(e)}")
+            raise
+
+    def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        """Update a single document in the collection"""
+        try:
+            return self.collection.update_one(query, update, upsert=upsert)
+        except Exception as e:
+            logger.error(f"❌ Error updating document: {str(e)}")
+            raise
+
     def find(self, query: Dict[str, Any]):
         """Find documents in the collection"""
         try:
@@ -0,0 +1,4 @@
+# Jobs module
+from .report_jobs import ReportJobManager, ReportJobStore, JobStatus, JobKind
+
+__all__ = ['ReportJobManager', 'ReportJobStore', 'JobStatus', 'JobKind']
@@ -0,0 +1,210 @@
+# ==========================================
+# src/jobs/report_jobs.py
+# Asynchronous Report Jobs persisted in MongoDB
+# ==========================================
+
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from src.agents.agent_runner import AgentRunner
+from src.config.settings import config
+from src.db.mongo.mongo_db import MongoDB
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+# Jobs are owned by the process that queued them (uvicorn workers in one container share a hostname)
+WORKER = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+class JobStatus(Enum):
+    """Report job status enumeration"""
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+class JobKind(Enum):
+    """Work a job runs"""
+    REPORT = "report"
+    SCHEDULER_CHECK = "scheduler_check"
+
+# Recorded on jobs that never finished, because the process running them restarted or hung
+OVERDUE_ERROR = "Did not finish before its deadline (the service restarted or the run hung)"
+
+class ReportJobStore:
+    """MongoDB persistence for report job records"""
+
+    def __init__(self, db: Optional[MongoDB] = None, ttl_seconds: Optional[int] = None):
+        self._db = db
+        self.ttl_seconds = config.database.mongodb_jobs_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._connect_lock = threading.Lock()
+
+    @property
+    def db(self) -> MongoDB:
+        """Get the jobs collection, connecting (and creating its indexes) on first use"""
+        if self._db is None:
+            with self._connect_lock:
+                if self._db is None:
+                    db = MongoDB(collection_name=config.database.mongodb_jobs_collection_name)
+                    self._ensure_indexes(db)
+                    self._db = db
+        return self._db
+
+    def _ensure_indexes(self, db: MongoDB) -> None:
+        """Expire finished jobs after their finish, and unfinished ones (finish never recorded) after their deadline"""
+        if self.ttl_seconds > 0:
+            db.collection.create_index("finished_at", expireAfterSeconds=self.ttl_seconds,
+                                       name="finished_at_ttl")
+            db.collection.create_index("deadline_at", expireAfterSeconds=self.ttl_seconds,
+                                       name="deadline_at_ttl")
+
+    def create(self, job: Dict[str, Any]) -> None:
+        """Insert a new job record"""
+        self.db.insert_one({"_id": job["job_id"], **job})
+
+    def update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        """Set fields on an existing job record"""
+        self.db.update_one({"_id": job_id}, {"$set": fields})
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record by ID"""
+        document = self.db.find_one({"_id": job_id})
+        if document is None:
+            return None
+        document.pop("_id", None)
+        return document
+
+    def delete(self, job_id: str) -> None:
+        """Delete a job record"""
+        self.db.delete({"_id": job_id})
+
+    def fail_unfinished(self, now: datetime, fields: Dict[str, Any]) -> int:
+        """Set fields on queued or running jobs past their deadline (records from before deadlines count too)"""
+        result = self.db.collection.update_many(
+            {"status": {"$in": [JobStatus.QUEUED.value, JobStatus.RUNNING.value]},
+             "$or": [{"deadline_at": {"$lt": now}}, {"deadline_at": {"$exists": False}}]},
+            {"$set": {**fields, "status": JobStatus.FAILED.value}}
+        )
+        return result.modified_count
+
+class ReportJobManager:
+    """Enqueues report generation (and manual scheduler checks) on the agent runner and tracks it as a job"""
+
+    def __init__(self, runner: AgentRunner, report_fn: Callable[..., Dict[str, Any]],
+                 store: Optional[ReportJobStore] = None, worker: str = WORKER,
+                 check_fn: Optional[Callable[..., Dict[str, Any]]] = None,
+                 deadline_seconds: Optional[int] = None):
+        self.runner = runner
+        self.report_fn = report_fn
+        self.check_fn = check_fn
+        self.store = store or ReportJobStore()
+        self.worker = worker
+        self.deadline_seconds = config.database.mongodb_jobs_deadline_seconds if deadline_seconds is None \
+            else deadline_seconds
+
+    def submit(self, sheet_url: str, additional_context: str = "", mode: str = "agent",
+               force: bool = False) -> Dict[str, Any]:
+        """Create a report job record and enqueue it, raises AgentRunnerBusyError when saturated"""
+        params = {"sheet_url": sheet_url, "additional_context": additional_context, "mode": mode, "force": force}
+        return self._enqueue(JobKind.REPORT, self.report_fn, params)
+
+    def submit_check(self, force: bool = False) -> Dict[str, Any]:
+        """Create a scheduler check job record and enqueue it, raises AgentRunnerBusyError when saturated"""
+        if self.check_fn is None:
+            raise ValueError("No scheduler check function configured")
+        return self._enqueue(JobKind.SCHEDULER_CHECK, self.check_fn, {"force": force})
+
+    def get(self, job_id: str, kind: Optional[JobKind] = None) -> Optional[Dict[str, Any]]:
+        """Get the current job record, optionally only if it is of the given kind; overdue jobs read as failed"""
+        job = self.store.get(job_id)
+        if job is None or (kind is not None and job.get("kind", JobKind.REPORT.value) != kind.value):
+            return None
+        deadline_at = job.get("deadline_at")
+        if job["status"] in (JobStatus.QUEUED.value, JobStatus.RUNNING.value) and deadline_at is not None \
+                and deadline_at < datetime.now():
+            job.update(status=JobStatus.FAILED.value, error=OVERDUE_ERROR)
+        return job
+
+    def fail_interrupted(self) -> int:
+        """Mark jobs left queued or running past their deadline (e.g. their process restarted) as failed; returns how many"""
+        failed = self.store.fail_unfinished(datetime.now(), {
+            "finished_at": datetime.now(),
+            "deadline_at": None,
+            "error": OVERDUE_ERROR
+        })
+        if failed:
+            logger.warning(f"⚠️ Marked {failed} interrupted report job(s) as failed")
+        return failed
+
+    def _enqueue(self, kind: JobKind, fn: Callable[..., Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a queued job record and hand it to the runner; the record is removed if the runner refuses it"""
+        created_at = datetime.now()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind.value,
+            "status": JobStatus.QUEUED.value,
+            **params,
+            "worker": self.worker,
+            "created_at": created_at,
+            # Cleared on finish; until then it bounds how long the record can claim to be queued or running
+            "deadline_at": created_at + timedelta(seconds=self.deadline_seconds),
+            "started_at": None,
+            "finished_at": None,
+            "timings": {},
+            "result": None,
+            "error": None
+        }
+        self.store.create(job)
+
+        try:
+            self.runner.submit(self._execute, job["job_id"], job["created_at"], fn, params)
+        except Exception:
+            # Never admitted: don't leave a record that will never run
+            self.store.delete(job["job_id"])
+            raise
+
+        logger.info(f"📥 {kind.value} job {job['job_id']} queued")
+        return job
+
+    def _execute(self, job_id: str, created_at: datetime, fn: Callable[..., Dict[str, Any]],
+                 params: Dict[str, Any]):
+        """Run the job on a worker thread and record the outcome"""
+        started_at = datetime.now()
+        fields: Dict[str, Any] = {}
+        try:
+            # Inside the try, so a failed write still ends in the FAILED update below
+            self.store.update(job_id, {"status": JobStatus.RUNNING.value, "started_at": started_at})
+            logger.info(f"🔄 Job {job_id} started")
+            result = fn(**params)
+            status = JobStatus.COMPLETED if result.get("success") else JobStatus.FAILED
+            fields["result"] = result
+            fields["error"] = result.get("error")
+        except Exception as e:
+            status = JobStatus.FAILED
+            fields["error"] = str(e)
+            logger.error(f"❌ Job {job_id} failed: {str(e)}")
+
+        finished_at = datetime.now()
+        fields.update({
+            "status": status.value,
+            "finished_at": finished_at,
+            "deadline_at": None,
+            "timings": {
+                "queue_seconds": round((started_at - created_at).total_seconds(), 3),
+                "run_seconds": round((finished_at - started_at).total_seconds(), 3),
+                "total_seconds": round((finished_at - created_at).total_seconds(), 3)
+            }
+        })
+
+        try:
+            self.store.update(job_id, fields)
+        except Exception as e:
+            logger.error(f"❌ Error saving job {job_id}: {str(e)}")
+            raise
+
+        logger.info(f"🏁 Job {job_id} finished with status {status.value}")
@@ -3,6 +3,7 @@
 # Refactored Gemini LLM Provider
 # ==========================================
 
+from typing import Any, Dict
 from langchain_google_genai import ChatGoogleGenerativeAI
 from src.core.interfaces import LLMInterface
 from src.config import settings as config
@@ -15,6 +16,7 @@ class GeminiLLM(LLMInterface):
 
     def __init__(self):
         self._llm = None
+        self._config = config.LLMConfig.from_env()
         self._name = "Gemini 2.0 Flash"
         self._initialize_llm()
         logger.info(f"✅ {self._name} initialized successfully")
@@ -22,7 +24,7 @@ class GeminiLLM(LLMInterface):
     def _initialize_llm(self):
         """Initialize the Gemini LLM with configuration"""
         try:
-            llm = config.LLMConfig.from_env()
+            llm = self._config
             self._llm = ChatGoogleGenerativeAI(
                 model=llm.model_name,
                 temperature=llm.temperature,
@@ -45,4 +47,14 @@ class GeminiLLM(LLMInterface):
     @property
     def name(self) -> str:
         """Get the LLM name"""
-        return self._name
\ No newline at end of file
+        return self._name
+
+    def get_model_config(self) -> Dict[str, Any]:
+        """Get the settings that determine model output"""
+        return {
+            "model_name": self._config.model_name,
+            "temperature": self._config.temperature,
+            "top_p": self._config.top_p,
+            "top_k": self._config.top_k,
+            "max_output_tokens": self._config.max_output_tokens
+        }
\ No newline at end of file
@@ -0,0 +1,239 @@
+# ==========================================
+# src/llms/llm_cache.py
+# Content-addressed LLM result cache
+# ==========================================
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from src.config.settings import config
+from src.core.interfaces import LLMInterface
+from src.db.mongo.mongo_db import MongoDB
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+class LLMResultCache:
+    """Two-tier cache: in-memory LRU in front of an optional MongoDB collection with TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 86400,
+                 mongo_enabled: bool = False, mongo_collection_name: str = "llm_cache",
+                 db: Optional[MongoDB] = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.mongo_enabled = mongo_enabled or db is not None
+        self.mongo_collection_name = mongo_collection_name
+
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = db
+        self._db_ready = False
+        self._stats = {"memory_hits": 0, "mongo_hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(model_config: Dict[str, Any], system_prompt: str, input_data: str) -> str:
+        """Hash the model settings, system prompt and normalized input"""
+        normalized = "\n".join(" ".join(line.split()) for line in input_data.strip().splitlines() if line.strip())
+        payload = json.dumps(
+            {"model": model_config, "system_prompt": system_prompt, "input": normalized},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached result, promoting MongoDB hits into memory"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._entries[key]
+
+        stored = self._mongo_get(key)
+        with self._lock:
+            if stored is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["mongo_hits"] += 1
+        self._memory_set(key, stored)
+        return stored
+
+    def set(self, key: str, value: str) -> None:
+        """Store a result in both tiers"""
+        self._memory_set(key, value)
+        self._mongo_set(key, value)
+        with self._lock:
+            self._stats["writes"] += 1
+
+    def _memory_set(self, key: str, value: str) -> None:
+        """Insert into the LRU tier, evicting the least recently used entry"""
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_db(self) -> Optional[MongoDB]:
+        """Get the MongoDB tier, creating the TTL index on first use"""
+        if not self.mongo_enabled:
+            return None
+        if self._db is None:
+            try:
+                self._db = MongoDB(collection_name=self.mongo_collection_name)
+            except Exception:
+                # Don't pay the connection timeout on every lookup
+                self.mongo_enabled = False
+                raise
+        if not self._db_ready:
+            self._db.collection.create_index("expires_at", expireAfterSeconds=0)
+            self._db_ready = True
+        return self._db
+
+    def _mongo_get(self, key: str) -> Optional[str]:
+        """Read from the MongoDB tier, treating failures as misses"""
+        try:
+            db = self._get_db()
+            if db is None:
+                return None
+            document = db.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+            return document["value"] if document else None
+        except Exception as e:
+            self._record_error(f"reading LLM cache from MongoDB: {str(e)}")
+            return None
+
+    def _mongo_set(self, key: str, value: str) -> None:
+        """Write to the MongoDB tier, never failing the caller"""
+        try:
+            db = self._get_db()
+            if db is None:
+                return
+            db.update_one(
+                {"_id": key},
+                {"$set": {
+                    "value": value,
+                    "created_at": datetime.utcnow(),
+                    "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            self._record_error(f"writing LLM cache to MongoDB: {str(e)}")
+
+    def _record_error(self, message: str) -> None:
+        """Count and log a cache tier error"""
+        with self._lock:
+            self._stats["errors"] += 1
+        logger.warning(f"⚠️ Error {message}")
+
+    def clear(self) -> None:
+        """Drop all in-memory entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counts"""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["mongo_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hits": hits,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "mongo_enabled": self.mongo_enabled
+            }
+
+class LangChainResultCache(BaseCache):
+    """LangChain cache over LLMResultCache, so every chat model call of a ReAct run is cached as well"""
+
+    def __init__(self, cache: LLMResultCache):
+        self.cache = cache
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        """Hash the serialized messages (tool results included) and the model settings and bound tools"""
+        payload = json.dumps({"prompt": prompt, "llm": llm_string}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Cached generations of the call, or None"""
+        value = self.cache.get(self.make_key(prompt, llm_string))
+        if value is None:
+            return None
+        try:
+            return [ChatGeneration(message=message) for message in messages_from_dict(json.loads(value))]
+        except Exception as e:
+            self.cache._record_error(f"reading a cached chat generation: {str(e)}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """Cache the generations of a chat model call (plain text completions are not cached)"""
+        chat_generations = [generation for generation in return_val if isinstance(generation, ChatGeneration)]
+        if not chat_generations or len(chat_generations) != len(return_val):
+            return
+        messages = messages_to_dict([generation.message for generation in chat_generations])
+        self.cache.set(self.make_key(prompt, llm_string), json.dumps(messages, ensure_ascii=False, default=str))
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop all in-memory entries"""
+        self.cache.clear()
+
+class CachedLLM(LLMInterface):
+    """LLM provider wrapper that serves repeated completions from the cache"""
+
+    def __init__(self, provider: LLMInterface, cache: LLMResultCache):
+        self.provider = provider
+        self.cache = cache
+        self._llm = None
+
+    def get_llm(self) -> Any:
+        """Get the wrapped chat model with the cache attached (used by agent-mode ReAct runs)"""
+        if self._llm is None:
+            # A copy, so the provider's own model (used by generate) is not cached twice
+            self._llm = self.provider.get_llm().model_copy(update={"cache": LangChainResultCache(self.cache)})
+        return self._llm
+
+    @property
+    def name(self) -> str:
+        """Get the wrapped LLM name"""
+        return self.provider.name
+
+    def get_model_config(self) -> Dict[str, Any]:
+        """Get the wrapped provider's model settings"""
+        return self.provider.get_model_config()
+
+    def generate(self, system_prompt: str, user_message: str) -> str:
+        """Return a cached completion or generate and cache a new one"""
+        key = LLMResultCache.make_key(self.get_model_config(), system_prompt, user_message)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("💾 LLM cache hit")
+            return cached
+
+        result = self.provider.generate(system_prompt, user_message)
+        if result:
+            self.cache.set(key, result)
+        return result
+
+# Global LLM cache instance shared by all agents
+llm_cache = LLMResultCache(
+    max_entries=config.llm_cache.max_entries,
+    ttl_seconds=config.llm_cache.ttl_seconds,
+    mongo_enabled=config.llm_cache.mongo_enabled,
+    mongo_collection_name=config.llm_cache.mongo_collection_name
+)
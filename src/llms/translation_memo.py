@@ -0,0 +1,153 @@
+# ==========================================
+# src/llms/translation_memo.py
+# Per-cell translation memo persisted in MongoDB
+# ==========================================
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from src.config.settings import config
+from src.db.mongo.mongo_db import MongoDB
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+class TranslationMemo:
+    """Remembers translations of sheet cells keyed on (source text hash, target language)
+
+    Recent translations are kept in an in-memory LRU in front of MongoDB, which holds all of them.
+    """
+
+    def __init__(self, target_language: str = "English", mongo_enabled: bool = True,
+                 mongo_collection_name: str = "translation_memo", db: Optional[MongoDB] = None,
+                 max_entries: int = 4096):
+        self.target_language = target_language
+        self.mongo_enabled = mongo_enabled or db is not None
+        self.mongo_collection_name = mongo_collection_name
+        self.max_entries = max(1, max_entries)
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = db
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "errors": 0}
+
+    def make_key(self, text: str) -> str:
+        """Hash the normalized source text together with the target language"""
+        normalized = text.strip()
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return f"{self.target_language.lower()}:{digest}"
+
+    def lookup(self, texts: Iterable[str]) -> Dict[str, str]:
+        """Return known translations for the given source texts"""
+        by_key: Dict[str, List[str]] = {}
+        for text in set(texts):
+            by_key.setdefault(self.make_key(text), []).append(text)
+
+        known: Dict[str, str] = {}
+        with self._lock:
+            for key in by_key:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    known[key] = self._memory[key]
+
+        missing = [key for key in by_key if key not in known]
+        if missing:
+            from_db = self._mongo_lookup(missing)
+            known.update(from_db)
+            with self._lock:
+                self._remember(from_db)
+
+        with self._lock:
+            self._stats["hits"] += len(known)
+            self._stats["misses"] += len(by_key) - len(known)
+        return {text: known[key] for key, sources in by_key.items() if key in known for text in sources}
+
+    def store(self, translations: Dict[str, str]) -> None:
+        """Remember translations for source texts"""
+        entries = {self.make_key(source): target for source, target in translations.items() if target}
+        if not entries:
+            return
+
+        with self._lock:
+            self._remember(entries)
+            self._stats["stored"] += len(entries)
+        self._mongo_store(entries)
+
+    def _remember(self, entries: Dict[str, str]) -> None:
+        """Insert into the LRU tier, evicting the least recently used translations (lock held)"""
+        for key, translation in entries.items():
+            self._memory[key] = translation
+            self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _get_db(self) -> Optional[MongoDB]:
+        """Get the MongoDB collection, connecting on first use"""
+        if not self.mongo_enabled:
+            return None
+        if self._db is None:
+            try:
+                self._db = MongoDB(collection_name=self.mongo_collection_name)
+            except Exception:
+                # Don't pay the connection timeout on every report
+                self.mongo_enabled = False
+                raise
+        return self._db
+
+    def _mongo_lookup(self, keys: list) -> Dict[str, str]:
+        """Read translations from MongoDB, treating failures as misses"""
+        try:
+            db = self._get_db()
+            if db is None:
+                return {}
+            return {document["_id"]: document["translation"] for document in db.find({"_id": {"$in": keys}})}
+        except Exception as e:
+            self._record_error(f"reading translation memo: {str(e)}")
+            return {}
+
+    def _mongo_store(self, entries: Dict[str, str]) -> None:
+        """Write translations to MongoDB, never failing the caller"""
+        try:
+            db = self._get_db()
+            if db is None:
+                return
+            # One round trip for all cells of a report
+            updated_at = datetime.now()
+            db.collection.bulk_write([
+                UpdateOne(
+                    {"_id": key},
+                    {"$set": {
+                        "translation": translation,
+                        "language": self.target_language,
+                        "updated_at": updated_at
+                    }},
+                    upsert=True
+                )
+                for key, translation in entries.items()
+            ], ordered=False)
+        except Exception as e:
+            self._record_error(f"writing translation memo: {str(e)}")
+
+    def _record_error(self, message: str) -> None:
+        """Count and log a persistence error"""
+        with self._lock:
+            self._stats["errors"] += 1
+        logger.warning(f"⚠️ Error {message}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get memo hit/miss counts"""
+        with self._lock:
+            return {**self._stats, "entries": len(self._memory), "max_entries": self.max_entries}
+
+# Global translation memo shared by all agents
+translation_memo = TranslationMemo(
+    target_language=config.translation_memo.target_language,
+    mongo_enabled=config.translation_memo.mongo_enabled,
+    mongo_collection_name=config.translation_memo.mongo_collection_name,
+    max_entries=config.translation_memo.max_entries
+)
@@ -0,0 +1,4 @@
+# Monitoring module
+from .metrics import instrument_tool, render_latest
+
+__all__ = ['instrument_tool', 'render_latest']
@@ -0,0 +1,112 @@
+# ==========================================
+# src/monitoring/metrics.py
+# Prometheus Metrics
+# ==========================================
+
+import time
+from functools import wraps
+from typing import Any, Dict, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Agent runs and Slack/LLM calls take seconds, so extend the default buckets upwards
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "report_agent_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=SLOW_BUCKETS
+)
+
+AGENT_RUNS_IN_FLIGHT = Gauge(
+    "report_agent_agent_runs_in_flight",
+    "Agent runs currently executing",
+    ["mode"]
+)
+
+TOOL_DURATION = Histogram(
+    "report_agent_tool_duration_seconds",
+    "Tool execution latency",
+    ["tool", "status"],
+    buckets=SLOW_BUCKETS
+)
+
+MONGO_INSERT_DURATION = Histogram(
+    "report_agent_mongo_insert_duration_seconds",
+    "MongoDB insert_one latency",
+    ["collection", "status"]
+)
+
+SLACK_REQUEST_DURATION = Histogram(
+    "report_agent_slack_request_duration_seconds",
+    "Slack Web API request latency",
+    ["method"],
+    buckets=SLOW_BUCKETS
+)
+
+SLACK_ERRORS = Counter(
+    "report_agent_slack_errors_total",
+    "Slack Web API errors",
+    ["method", "error"]
+)
+
+SCHEDULER_JOB_DURATION = Histogram(
+    "report_agent_scheduler_job_duration_seconds",
+    "Scheduler job duration",
+    ["job"],
+    buckets=SLOW_BUCKETS
+)
+
+SHEET_FETCH_DURATION = Histogram(
+    "report_agent_sheet_fetch_duration_seconds",
+    "Google Sheets CSV export download latency (including retries)",
+    ["status"],
+    buckets=SLOW_BUCKETS
+)
+
+SHEET_FETCH_BYTES = Counter(
+    "report_agent_sheet_fetch_bytes_total",
+    "Bytes downloaded from Google Sheets"
+)
+
+SHEET_FETCH_RETRIES = Counter(
+    "report_agent_sheet_fetch_retries_total",
+    "Google Sheets download retries",
+    ["reason"]
+)
+
+SHEET_CACHE_RESULTS = Counter(
+    "report_agent_sheet_cache_results_total",
+    "Sheet cache lookups by result (fresh, not_modified, unchanged, miss)",
+    ["result"]
+)
+
+def instrument_tool(tool: Any) -> Any:
+    """Wrap a tool's execute() so every call is timed, labelled by tool name"""
+    execute = tool.execute
+    if getattr(execute, "_instrumented", False) is True:
+        return tool
+
+    @wraps(execute)
+    def timed_execute(**kwargs) -> Dict[str, Any]:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = execute(**kwargs)
+            status = "error" if isinstance(result, dict) and "error" in result else "success"
+            return result
+        finally:
+            TOOL_DURATION.labels(tool=tool.name, status=status).observe(time.perf_counter() - start)
+
+    setattr(timed_execute, "_instrumented", True)
+    tool.execute = timed_execute
+    return tool
+
+def observe_slack_error(method: str, error: str) -> None:
+    """Count a failed Slack API call"""
+    SLACK_ERRORS.labels(method=method, error=error).inc()
+
+def render_latest() -> Tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,7 +1,7 @@
 # Scheduler module
-from .scheduler_service import SchedulerService as get_scheduler_service
+from .scheduler_service import SchedulerService, get_scheduler_service
 from .state_manager import state_manager
 from .report_checker import ReportChecker
 from .reminder_service import ReminderService
 
-__all__ = ['get_scheduler_service', 'state_manager', 'ReportChecker', 'ReminderService']
+__all__ = ['SchedulerService', 'get_scheduler_service', 'state_manager', 'ReportChecker', 'ReminderService']
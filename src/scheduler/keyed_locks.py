@@ -0,0 +1,37 @@
+# ==========================================
+# src/scheduler/keyed_locks.py
+# Per-Key Locks (one lock per sheet and day)
+# ==========================================
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator, List
+
+class KeyedLocks:
+    """A lock per key, created on demand and dropped when no thread holds or waits for it"""
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: Dict[Hashable, threading.RLock] = {}
+        self._users: Dict[Hashable, int] = {}
+
+    @contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        """Hold the lock of a key; different keys never wait on each other"""
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.RLock())
+            self._users[key] = self._users.get(key, 0) + 1
+        try:
+            with lock:
+                yield
+        finally:
+            with self._guard:
+                self._users[key] -= 1
+                if self._users[key] == 0:
+                    del self._users[key]
+                    del self._locks[key]
+
+    def held_keys(self) -> List[Hashable]:
+        """Keys currently held or waited for"""
+        with self._guard:
+            return list(self._locks)
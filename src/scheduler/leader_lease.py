@@ -0,0 +1,113 @@
+# ==========================================
+# src/scheduler/leader_lease.py
+# Lease-Based Scheduler Leader Lock (MongoDB)
+# ==========================================
+
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from src.config.settings import config
+from src.db.mongo.mongo_db import MongoDB
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+class LeaderLease:
+    """One replica holds a renewable lease document; the others skip scheduled jobs until it expires"""
+
+    def __init__(self, name: str = "scheduler", lease_seconds: float = 60, enabled: bool = True,
+                 collection_name: str = "scheduler_locks", db: Optional[MongoDB] = None):
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.enabled = enabled
+        self.collection_name = collection_name
+        self.holder = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._db = db
+
+        self._lock = threading.Lock()
+        self._is_leader = False
+        self._expires_at: Optional[datetime] = None
+
+    @property
+    def db(self) -> MongoDB:
+        """Get the lock collection, connecting on first use"""
+        if self._db is None:
+            self._db = MongoDB(collection_name=self.collection_name)
+        return self._db
+
+    def acquire(self) -> bool:
+        """Take or renew the lease; returns whether this replica is the leader"""
+        if not self.enabled:
+            return True
+
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        try:
+            # Matches only our own lease or an expired one; otherwise the upsert collides on _id
+            self.db.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"holder": self.holder}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"holder": self.holder, "expires_at": expires_at, "renewed_at": now}},
+                upsert=True
+            )
+            leader = True
+        except DuplicateKeyError:
+            leader = False
+        except Exception as e:
+            # Without the lock store no replica can prove it leads, so none runs the jobs
+            logger.error(f"❌ Error renewing scheduler lease: {str(e)}")
+            leader = False
+
+        with self._lock:
+            if leader != self._is_leader:
+                if leader:
+                    logger.info(f"👑 Became scheduler leader ({self.holder})")
+                else:
+                    logger.warning(f"⚠️ Not the scheduler leader ({self.holder})")
+            self._is_leader = leader
+            self._expires_at = expires_at if leader else None
+        return leader
+
+    def is_leader(self) -> bool:
+        """Whether this replica holds a lease that has not expired locally"""
+        if not self.enabled:
+            return True
+        with self._lock:
+            return self._is_leader and self._expires_at is not None and \
+                datetime.now(timezone.utc) < self._expires_at
+
+    def release(self) -> None:
+        """Give up the lease so another replica can take over right away (on shutdown)"""
+        if not self.enabled or not self.is_leader():
+            return
+        try:
+            self.db.delete({"_id": self.name, "holder": self.holder})
+            logger.info(f"👋 Scheduler lease released ({self.holder})")
+        except Exception as e:
+            logger.error(f"❌ Error releasing scheduler lease: {str(e)}")
+        with self._lock:
+            self._is_leader = False
+            self._expires_at = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lease status of this replica"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "holder": self.holder,
+                "is_leader": self._is_leader,
+                "lease_seconds": self.lease_seconds,
+                "expires_at": self._expires_at.isoformat() if self._expires_at else None
+            }
+
+# Global scheduler lease (always leader unless SCHEDULER_LEADER_ELECTION is enabled)
+leader_lease = LeaderLease(
+    lease_seconds=config.leader_election.lease_seconds,
+    enabled=config.leader_election.enabled,
+    collection_name=config.leader_election.collection_name
+)
@@ -4,11 +4,14 @@
 # ==========================================
 
 import polars as pl
-import requests
 from datetime import datetime, date
 from typing import Dict, Any, Optional, Tuple
-from io import BytesIO
 from src.config import settings as config
+from src.sheets.schema import TAB_COLUMN, SchemaProfiles, SheetProfile, schema_profiles
+from src.sheets.sheet_cache import SheetCache, sheet_cache
+from src.sheets.sheet_store import SheetStore, sheet_store
+from src.sheets.sheet_tabs import SheetTabs, normalize_tabs, sheet_tab_reader
+from src.sheets.snapshot import SheetSnapshot
 from src.logs.logger import Logger
 
 logger = Logger(__name__)
@@ -16,14 +19,28 @@ logger = Logger(__name__)
 class ReportChecker:
     """Checks if daily report content exists in Google Sheets"""
     
-    def __init__(self):
+    def __init__(self, sheets: Optional[SheetCache] = None, profiles: Optional[SchemaProfiles] = None,
+                 store: Optional[SheetStore] = None, sheet_tabs: Optional[SheetTabs] = None):
         self.logger = Logger("ReportChecker")
+        self.sheets = sheets or sheet_cache
+        self.profiles = profiles or schema_profiles
+        self.store = store or sheet_store
+        self.sheet_tabs = sheet_tabs or sheet_tab_reader
     
-    def check_today_report(self, sheet_url: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    def check_today_report(self, sheet_url: str,
+                           tabs: Optional[Dict[str, str]] = None) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
         Check if today's report exists in Google Sheets
         Returns: (report_exists, report_data)
         """
+        snapshot = self.find_today_snapshot(sheet_url, tabs=tabs)
+        return (True, snapshot.entry()) if snapshot else (False, None)
+    
+    def find_today_snapshot(self, sheet_url: str, tabs: Optional[Dict[str, str]] = None) -> Optional[SheetSnapshot]:
+        """
+        Find today's report row in Google Sheets (across all given tabs)
+        Returns: snapshot of the row (reused for report generation), or None
+        """
         try:
             self.logger.info(f"🔍 Checking today's report in Google Sheets...")
             
@@ -33,101 +50,106 @@ class ReportChecker:
             
             self.logger.info(f"📅 Looking for report date: {today_str}")
             
-            # Fetch data from Google Sheets
-            data = self._fetch_sheet_data(sheet_url)
+            # Fetch data from Google Sheets (scanned lazily, nothing parsed yet)
+            data, stale = self._scan_sheet_data(sheet_url, tabs)
             if data is None:
                 self.logger.warning("⚠️ No data fetched from Google Sheets")
-                return False, None
+                return None
             
-            # Check if today's report exists
-            report_data = self._find_today_report(data, today_str)
+            # Check if today's report exists, matching dates with the sheet's cached format
+            profile = self.profiles.profile_scan(sheet_url, data)
+            try:
+                report_row = self._find_today_row(data, today, profile)
+            except pl.exceptions.PolarsError as e:
+                self.logger.warning(f"⚠️ Sheet dates no longer match the cached format, re-detecting: {str(e)}")
+                self.profiles.invalidate(sheet_url)
+                report_row = self._find_today_row(data, today, self.profiles.profile_scan(sheet_url, data))
             
-            if report_data:
+            if report_row is not None:
                 self.logger.info(f"✅ Found today's report: {today_str}")
-                return True, report_data
+                return SheetSnapshot(sheet_url=sheet_url, frame=report_row, stale=stale)
             else:
                 self.logger.info(f"❌ No report found for today: {today_str}")
-                return False, None
+                return None
                 
         except Exception as e:
             self.logger.error(f"❌ Error checking today's report: {str(e)}")
-            return False, None
+            return None
     
-    def _fetch_sheet_data(self, sheet_url: str) -> Optional[pl.DataFrame]:
-        """Fetch data from Google Sheets"""
+    def _scan_sheet_data(self, sheet_url: str,
+                         tabs: Optional[Dict[str, str]] = None) -> Tuple[Optional[pl.LazyFrame], bool]:
+        """Fetch data from Google Sheets as a lazy scan over the downloaded body; also returns whether it is stale"""
         try:
-            # Convert Google Sheets URL to CSV export URL
-            if "docs.google.com/spreadsheets" in sheet_url:
-                if "/edit" in sheet_url:
-                    sheet_id = sheet_url.split("/d/")[1].split("/edit")[0]
-                else:
-                    sheet_id = sheet_url.split("/")[-1]
-                csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-            else:
-                csv_url = sheet_url
-            
-            self.logger.info(f"📥 Fetching data from: {csv_url}")
-            
-            # Fetch CSV data
-            response = requests.get(csv_url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse CSV with polars
-            df = pl.read_csv(BytesIO(response.content), encoding="utf8")
-            
-            if df.is_empty():
-                self.logger.warning("⚠️ Empty dataframe from Google Sheets")
-                return None
+            self.logger.info(f"📥 Fetching data from: {sheet_url}")
             
-            self.logger.info(f"📊 Fetched {len(df)} rows from Google Sheets")
-            return df
+            # Download over the shared session (reused while unchanged); parsing is deferred
+            tabs = normalize_tabs(tabs)
+            if tabs:
+                return self.sheet_tabs.scan(sheet_url, tabs), False
+            return self.sheets.scan(sheet_url), False
             
         except Exception as e:
             self.logger.error(f"❌ Error fetching sheet data: {str(e)}")
-            return None
+            
+            # Fall back to the last snapshot on disk (e.g. right after a restart while the sheet is unreachable)
+            stored = self.store.scan_latest(sheet_url, tabs)
+            if stored is not None:
+                self.logger.warning("🗂️ Using the last stored sheet snapshot (stale)")
+            return stored, stored is not None
     
-    def _find_today_report(self, df: pl.DataFrame, today_str: str) -> Optional[Dict[str, Any]]:
-        """Find today's report in the dataframe"""
+    def _find_today_row(self, data: pl.LazyFrame, today: date, profile: SheetProfile) -> Optional[pl.DataFrame]:
+        """Find today's report in the sheet as a one-row frame"""
+        today_str = today.strftime("%d/%m/%Y")
         try:
-            # Check if Date column exists
-            if 'Date' not in df.columns:
+            # Check if Date column exists (detected from the header)
+            if profile.date_column is None:
                 self.logger.warning("⚠️ No 'Date' column found in the sheet")
                 return None
             
-            # Filter for today's date
-            today_rows = df.filter(pl.col('Date').str.contains(today_str, literal=True))
+            if profile.date_format is not None:
+                is_today = profile.date_expr() == today
+            else:
+                # Unrecognised date format: fall back to matching the dd/mm/yyyy text
+                is_today = pl.col(profile.date_column).str.contains(today_str, literal=True)
+            
+            # The date filter (and the one-row limit for a single tab) is pushed into the CSV reader
+            today_scan = data.filter(is_today)
+            if TAB_COLUMN not in data.collect_schema().names():
+                today_scan = today_scan.head(1)
+            today_rows = today_scan.collect()
             
             if today_rows.is_empty():
                 self.logger.info(f"📅 No rows found for date: {today_str}")
                 return None
             
-            # Get the first matching row
-            row_dict = today_rows.to_dicts()[0]
+            # Check if the row has meaningful content (first tab, in configured order, that has it)
+            for index, row in enumerate(today_rows.iter_rows(named=True)):
+                if self._has_meaningful_content(row, profile):
+                    self.logger.info(f"✅ Found meaningful content for {today_str}")
+                    return today_rows.slice(index, 1)
             
-            # Check if the row has meaningful content
-            if self._has_meaningful_content(row_dict):
-                self.logger.info(f"✅ Found meaningful content for {today_str}")
-                return row_dict
-            else:
-                self.logger.info(f"📝 Found date {today_str} but no meaningful content")
-                return None
+            self.logger.info(f"📝 Found date {today_str} but no meaningful content")
+            return None
                 
+        except pl.exceptions.PolarsError:
+            raise
         except Exception as e:
             self.logger.error(f"❌ Error finding today's report: {str(e)}")
             return None
     
-    def _has_meaningful_content(self, row_dict: Dict[str, Any]) -> bool:
+    def _has_meaningful_content(self, row_dict: Dict[str, Any], profile: Optional[SheetProfile] = None) -> bool:
         """Check if the row has meaningful content beyond just the date"""
         try:
-            # Skip the Date column and check other columns
-            content_columns = [key for key in row_dict.keys() if key.lower() != 'date']
+            profile = profile or SheetProfile.from_columns(list(row_dict))
+            
+            # Skip the date column (as detected for the sheet) and check other columns
+            content_columns = [key for key in row_dict.keys() if key not in (profile.date_column, TAB_COLUMN)]
             
             for column in content_columns:
                 value = row_dict.get(column, "")
-                str_value = str(value).strip() if value is not None else ""
-                if str_value and str_value.lower() not in ['none', 'null', '', 'nan']:
+                if self._is_meaningful(value):
                     # Found non-empty, meaningful content
-                    self.logger.info(f"📝 Found content in column '{column}': {str_value[:50]}...")
+                    self.logger.info(f"📝 Found content in column '{column}': {str(value).strip()[:50]}...")
                     return True
             
             self.logger.info("📝 No meaningful content found in any column")
@@ -137,26 +159,26 @@ class ReportChecker:
             self.logger.error(f"❌ Error checking meaningful content: {str(e)}")
             return False
     
-    def validate_report_completeness(self, report_data: Dict[str, Any]) -> bool:
-        """Validate if the report has all required fields"""
+    @staticmethod
+    def _is_meaningful(value: Any) -> bool:
+        """A cell value other than blanks and placeholder words"""
+        str_value = str(value).strip() if value is not None else ""
+        return bool(str_value) and str_value.lower() not in ['none', 'null', '', 'nan']
+    
+    def validate_report_completeness(self, report_data: Dict[str, Any],
+                                     profile: Optional[SheetProfile] = None) -> bool:
+        """Validate if the report has all required fields (date and progress columns come from the sheet profile)"""
         try:
-            required_fields = ['Date']
-            optional_fields = ['Completed', 'Inprogress', 'In Progress', 'Blocker', 'Blocked']
+            profile = profile or SheetProfile.from_columns(list(report_data))
             
             # Check required fields
-            for field in required_fields:
-                if field not in report_data or not report_data[field]:
-                    self.logger.warning(f"⚠️ Missing required field: {field}")
-                    return False
-            
-            # Check if at least one optional field has content
-            has_content = False
-            for field in optional_fields:
-                if field in report_data and report_data[field]:
-                    value = str(report_data[field]).strip()
-                    if value and value.lower() not in ['none', 'null', '', 'nan']:
-                        has_content = True
-                        break
+            if profile.date_column is None or not report_data.get(profile.date_column):
+                self.logger.warning(f"⚠️ Missing required field: {profile.date_column or 'Date'}")
+                return False
+            
+            # Check if at least one progress field has content
+            has_content = any(self._is_meaningful(report_data.get(column))
+                              for column in profile.progress_columns.values())
             
             if not has_content:
                 self.logger.warning("⚠️ No content found in any progress fields")
@@ -169,22 +191,22 @@ class ReportChecker:
             self.logger.error(f"❌ Error validating report completeness: {str(e)}")
             return False
     
-    def get_report_summary(self, report_data: Dict[str, Any]) -> str:
+    def get_report_summary(self, report_data: Dict[str, Any], profile: Optional[SheetProfile] = None) -> str:
         """Get a summary of the report for logging"""
         try:
+            profile = profile or SheetProfile.from_columns(list(report_data))
             summary_parts = []
             
-            if 'Date' in report_data:
-                summary_parts.append(f"Date: {report_data['Date']}")
-            
-            content_fields = ['Completed', 'Inprogress', 'In Progress', 'Blocker', 'Blocked']
-            for field in content_fields:
-                if field in report_data and report_data[field]:
-                    value = str(report_data[field]).strip()
-                    if value and value.lower() not in ['none', 'null', '', 'nan']:
-                        # Truncate long content
-                        truncated = value[:100] + "..." if len(value) > 100 else value
-                        summary_parts.append(f"{field}: {truncated}")
+            if profile.date_column is not None:
+                summary_parts.append(f"Date: {report_data[profile.date_column]}")
+            
+            for column in profile.progress_columns.values():
+                value = report_data.get(column)
+                if self._is_meaningful(value):
+                    value = str(value).strip()
+                    # Truncate long content
+                    truncated = value[:100] + "..." if len(value) > 100 else value
+                    summary_parts.append(f"{column}: {truncated}")
             
             return " | ".join(summary_parts) if summary_parts else "Empty report"
             
@@ -3,42 +3,102 @@
 # Main Scheduler Service
 # ==========================================
 
+import threading
+import time
 import pytz
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from typing import Dict, Any
+from apscheduler.triggers.interval import IntervalTrigger
+from typing import Callable, Dict, Any, Optional
 
 from src.scheduler.state_manager import state_manager, ReportStatus
+from src.scheduler.leader_lease import LeaderLease, leader_lease
 from src.scheduler.report_checker import ReportChecker
 from src.scheduler.reminder_service import ReminderService
+from src.agents.agent_pool import AgentPool
 from src.agents.agent_report import AgentReporter
 from src.tools.tool_registry import tool_registry
-from src.config import settings as config
+from src.monitoring.metrics import SCHEDULER_JOB_DURATION
+from src.sheets.sheet_fetcher import to_export_url
+from src.sheets.snapshot import SheetSnapshot, report_variant
+from src.tools.send_slack_message import use_slack_target
 from src.logs.logger import Logger
 
 logger = Logger(__name__)
 
-from src.config.settings import SchedulerConfig
+from src.config.settings import MonitoredSheet, SchedulerConfig
 scheduler = SchedulerConfig.from_env()
 
+# Extra context of scheduled reports (part of their reuse key)
+SCHEDULED_REPORT_CONTEXT = "Automated daily report generation"
+
 class SchedulerService:
     """Main scheduler service for automated daily reports"""
     
-    def __init__(self):
-        self.scheduler = None
-        self.report_checker = ReportChecker()
-        self.reminder_service = ReminderService()
+    def __init__(self, lease: Optional[LeaderLease] = None):
+        self.scheduler: Optional[BackgroundScheduler] = None
         self.timezone = pytz.timezone(scheduler.timezone)
         self.logger = Logger("SchedulerService")
+        self.concurrency = scheduler.concurrency
+        
+        # Only the replica holding the lease runs the scheduled jobs
+        self.leader_lease = lease or leader_lease
         
-        # Initialize agent
-        self.agent = AgentReporter()
-        tools = tool_registry.get_langchain_tools()
-        self.agent.add_tools(tools)
+        # Collaborators are built on first use, so startup and status calls never pay for them
+        self._components_lock = threading.Lock()
+        self._report_checker: Optional[ReportChecker] = None
+        self._reminder_service: Optional[ReminderService] = None
+        self._agent_pool: Optional[AgentPool] = None
         
         self.logger.info("🕐 Scheduler Service initialized")
     
+    def _component(self, attribute: str, factory: Callable[[], Any]) -> Any:
+        """Get a collaborator, building it once on first use"""
+        component = getattr(self, attribute)
+        if component is None:
+            with self._components_lock:
+                component = getattr(self, attribute)
+                if component is None:
+                    component = factory()
+                    setattr(self, attribute, component)
+        return component
+    
+    @property
+    def report_checker(self) -> ReportChecker:
+        """Sheet checker for today's row"""
+        return self._component("_report_checker", ReportChecker)
+    
+    @report_checker.setter
+    def report_checker(self, report_checker: ReportChecker):
+        self._report_checker = report_checker
+    
+    @property
+    def reminder_service(self) -> ReminderService:
+        """Slack reminders and error notifications"""
+        return self._component("_reminder_service", ReminderService)
+    
+    @reminder_service.setter
+    def reminder_service(self, reminder_service: ReminderService):
+        self._reminder_service = reminder_service
+    
+    @property
+    def agent_pool(self) -> AgentPool:
+        """One agent per concurrently processed sheet (the agents themselves are created on first use)"""
+        return self._component("_agent_pool", lambda: AgentPool(factory=self._build_agent, size=self.concurrency))
+    
+    @agent_pool.setter
+    def agent_pool(self, agent_pool: AgentPool):
+        self._agent_pool = agent_pool
+    
+    @staticmethod
+    def _build_agent() -> AgentReporter:
+        """Create a report agent with the registered tools"""
+        agent = AgentReporter()
+        agent.add_tools(tool_registry.get_langchain_tools())
+        return agent
+    
     def start(self):
         """Start the scheduler"""
         if not scheduler.enabled:
@@ -53,7 +113,7 @@ class SchedulerService:
                 hour, minute = map(int, check_time.split(':'))
                 
                 self.scheduler.add_job(
-                    func=self.daily_check_job,
+                    func=self._as_leader(self.daily_check_job),
                     trigger=CronTrigger(hour=hour, minute=minute, timezone=self.timezone),
                     id=f"daily_check_{check_time}",
                     name=f"Daily Report Check at {check_time}",
@@ -65,13 +125,24 @@ class SchedulerService:
             
             # Schedule cleanup job (daily at midnight)
             self.scheduler.add_job(
-                func=self.cleanup_job,
+                func=self._as_leader(self.cleanup_job),
                 trigger=CronTrigger(hour=0, minute=0, timezone=self.timezone),
                 id="daily_cleanup",
                 name="Daily State Cleanup",
                 max_instances=1
             )
             
+            # Keep the lease renewed, so leadership stays with one replica across jobs
+            if self.leader_lease.enabled:
+                self.scheduler.add_job(
+                    func=self.leader_lease.acquire,
+                    trigger=IntervalTrigger(seconds=max(1, self.leader_lease.lease_seconds / 3)),
+                    id="leader_lease",
+                    name="Scheduler Leader Lease Renewal",
+                    max_instances=1,
+                    next_run_time=datetime.now(self.timezone)
+                )
+            
             self.scheduler.start()
             self.logger.info("🚀 Scheduler started successfully")
             
@@ -84,104 +155,177 @@ class SchedulerService:
         if self.scheduler and self.scheduler.running:
             self.scheduler.shutdown()
             self.logger.info("⏹️ Scheduler stopped")
+        
+        # Write state changes still waiting for the flush interval
+        state_manager.flush()
+        
+        # Let another replica take over without waiting for the lease to expire
+        self.leader_lease.release()
     
-    def daily_check_job(self):
-        """Main daily check job"""
-        try:
-            current_time = datetime.now().strftime("%H:%M")
-            self.logger.info(f"🔍 Starting daily check at {current_time}")
-            
-            # Check if already completed today
-            if state_manager.is_completed_today():
-                self.logger.info("✅ Today's report already completed, skipping check")
-                return
-            
-            # Update state
-            state_manager.update_status(ReportStatus.CHECKING)
-            state_manager.increment_check_count()
-            
-            # Check if report exists
-            sheet_url = config.AppConfig.from_env().default_sheet_url
-            if not sheet_url:
-                self.logger.error("❌ No default sheet URL configured")
-                state_manager.mark_failed("No sheet URL configured")
-                return
-            
-            # Check for today's report
-            report_exists, report_data = self.report_checker.check_today_report(sheet_url)
-            
-            if report_exists and report_data:
-                self.logger.info("✅ Found today's report, processing...")
-                self._process_found_report(sheet_url, report_data)
-            else:
-                self.logger.info("❌ No report found, sending reminder...")
-                self._handle_missing_report()
+    def _as_leader(self, job: Callable[[], Any]) -> Callable[[], Any]:
+        """Wrap a scheduled job so only the replica holding the leader lease runs it"""
+        def run():
+            if not self.leader_lease.acquire():
+                self.logger.info(f"⏭️ Another replica holds the scheduler lease, skipping {job.__name__}")
+                return None
+            return job()
+        run.__name__ = job.__name__
+        return run
+    
+    @SCHEDULER_JOB_DURATION.labels(job="daily_check").time()
+    def daily_check_job(self, force: bool = False) -> Dict[str, str]:
+        """Main daily check job: checks every monitored sheet concurrently, returns each sheet's outcome"""
+        current_time = datetime.now().strftime("%H:%M")
+        sheets = SchedulerConfig.from_env().sheets
+        if not sheets:
+            self.logger.error("❌ No default sheet URL configured")
+            state_manager.mark_failed("No sheet URL configured")
+            return {}
+        
+        self.logger.info(f"🔍 Starting daily check of {len(sheets)} sheet(s) at {current_time}")
+        started = time.monotonic()
+        
+        # Bounded fan-out: a round takes as long as its slowest sheet, not the sum
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(sheets)),
+                                thread_name_prefix="sheet-check") as executor:
+            outcomes = list(executor.map(lambda sheet: self._check_sheet(sheet, force), sheets))
+        
+        results = {sheet.name: outcome for sheet, outcome in zip(sheets, outcomes)}
+        
+        # The round's state changes were coalesced; persist them once it is over
+        state_manager.flush()
+        self.logger.info(f"🏁 Daily check round finished in {time.monotonic() - started:.2f}s: {results}")
+        return results
+    
+    @staticmethod
+    def scheduled_variant() -> str:
+        """Reuse key of reports generated by the scheduler (its mode and context)"""
+        return report_variant(scheduler.report_mode, SCHEDULED_REPORT_CONTEXT)
+    
+    @staticmethod
+    def sheet_for_url(sheet_url: str) -> Optional[MonitoredSheet]:
+        """The monitored sheet with this URL (same sheet and tab), None if no monitored sheet covers it"""
+        for sheet in SchedulerConfig.from_env().sheets:
+            if to_export_url(sheet.sheet_url) == to_export_url(sheet_url):
+                return sheet
+        return None
+    
+    def _check_sheet(self, sheet: MonitoredSheet, force: bool = False) -> str:
+        """Check one monitored sheet; failures are contained and recorded in its own state"""
+        # Reminders, error notifications and the report itself go to the sheet's Slack target; the sheet
+        # lock keeps a manual trigger and a scheduled round from checking the same sheet at once
+        with use_slack_target(sheet.slack_target), state_manager.sheet_lock(sheet.name):
+            try:
+                # Check if already completed today
+                if state_manager.is_completed_today(sheet.name) and not force:
+                    self.logger.info(f"✅ [{sheet.name}] Today's report already completed, skipping check")
+                    return "completed"
                 
-        except Exception as e:
-            error_msg = f"Error in daily check job: {str(e)}"
-            self.logger.error(f"❌ {error_msg}")
-            state_manager.mark_failed(error_msg)
-            self.reminder_service.send_error_notification(error_msg)
+                # Update state
+                state_manager.update_status(ReportStatus.CHECKING, sheet=sheet.name)
+                state_manager.increment_check_count(sheet.name)
+                
+                # Check for today's report (the only sheet download in this check)
+                snapshot = self.report_checker.find_today_snapshot(sheet.sheet_url, tabs=sheet.tabs)
+                
+                if snapshot is None:
+                    self.logger.info(f"❌ [{sheet.name}] No report found, sending reminder...")
+                    return self._handle_missing_report(sheet)
+                
+                # Same row as the last successful report: nothing to regenerate, post or store
+                if not force and state_manager.get_report(sheet.sheet_url, snapshot.content_hash(), sheet=sheet.name,
+                                                          variant=self.scheduled_variant()) is not None:
+                    self.logger.info(f"♻️ [{sheet.name}] Today's row is unchanged since the last report, "
+                                     "skipping generation")
+                    state_manager.mark_completed(sheet.name)
+                    return "unchanged"
+                
+                self.logger.info(f"✅ [{sheet.name}] Found today's report, processing...")
+                return self._process_found_report(sheet, snapshot)
+                
+            except Exception as e:
+                error_msg = f"Error in daily check job: {str(e)}"
+                self.logger.error(f"❌ [{sheet.name}] {error_msg}")
+                state_manager.mark_failed(error_msg, sheet=sheet.name)
+                self.reminder_service.send_error_notification(error_msg)
+                return "failed"
     
-    def _process_found_report(self, sheet_url: str, report_data: Dict[str, Any]):
-        """Process found report"""
+    def _process_found_report(self, sheet: MonitoredSheet, snapshot: SheetSnapshot) -> str:
+        """Process found report from the row fetched by the check"""
         try:
-            self.logger.info("🔄 Processing found report...")
-            state_manager.mark_report_found()
-            state_manager.update_status(ReportStatus.PROCESSING)
+            self.logger.info(f"🔄 [{sheet.name}] Processing found report...")
+            state_manager.mark_report_found(sheet.name)
+            state_manager.update_status(ReportStatus.PROCESSING, sheet=sheet.name)
             
-            # Generate report using agent
-            result = self.agent.generate_report(
-                sheet_url=sheet_url,
-                additional_context="Automated daily report generation"
-            )
+            # Generate report on a pooled agent (sheets in a round are processed in parallel)
+            with self.agent_pool.acquire() as agent:
+                result = agent.generate_report(
+                    sheet_url=sheet.sheet_url,
+                    additional_context=SCHEDULED_REPORT_CONTEXT,
+                    mode=scheduler.report_mode,
+                    snapshot=snapshot
+                )
             
             if result.get("success"):
-                # Mark as completed
-                state_manager.mark_completed()
+                # Mark as completed and remember which row the report was generated from
+                state_manager.record_report(sheet.sheet_url, snapshot.content_hash(), result, sheet=sheet.name,
+                                            variant=self.scheduled_variant())
+                state_manager.mark_completed(sheet.name)
 
                 # Success notification disabled - report itself is the notification
-                # report_summary = self.report_checker.get_report_summary(report_data)
+                # report_summary = self.report_checker.get_report_summary(snapshot.row())
                 # self.reminder_service.send_success_notification(report_summary)
 
-                self.logger.info("🎉 Report processing completed successfully")
+                self.logger.info(f"🎉 [{sheet.name}] Report processing completed successfully")
+                return "generated"
             else:
                 error_msg = result.get("error", "Unknown error in report generation")
-                self.logger.error(f"❌ Report generation failed: {error_msg}")
-                state_manager.mark_failed(error_msg)
+                self.logger.error(f"❌ [{sheet.name}] Report generation failed: {error_msg}")
+                state_manager.mark_failed(error_msg, sheet=sheet.name)
                 self.reminder_service.send_error_notification(error_msg)
+                return "failed"
                 
         except Exception as e:
             error_msg = f"Error processing found report: {str(e)}"
-            self.logger.error(f"❌ {error_msg}")
-            state_manager.mark_failed(error_msg)
+            self.logger.error(f"❌ [{sheet.name}] {error_msg}")
+            state_manager.mark_failed(error_msg, sheet=sheet.name)
             self.reminder_service.send_error_notification(error_msg)
+            return "failed"
     
-    def _handle_missing_report(self):
-        """Handle missing report - send reminder if appropriate"""
+    def _handle_missing_report(self, sheet: MonitoredSheet) -> str:
+        """Handle missing report - send reminder if the sheet's policy allows it"""
         try:
-            if state_manager.should_send_reminder():
-                reminder_count = state_manager.get_reminder_count()
-                
+            # Counted before sending, so concurrent checks can never exceed the sheet's reminder limit
+            reminder_count = state_manager.claim_reminder(sheet.name, max_reminders=sheet.max_reminders)
+            if reminder_count is not None:
                 # Send reminder
-                result = self.reminder_service.send_reminder(reminder_count)
+                try:
+                    result = self.reminder_service.send_reminder(reminder_count)
+                except Exception:
+                    state_manager.release_reminder(sheet.name)
+                    raise
                 
                 if result.get("success"):
-                    state_manager.increment_notification_count()
-                    state_manager.update_status(ReportStatus.REMINDED)
-                    self.logger.info(f"📢 Reminder {reminder_count + 1} sent successfully")
+                    state_manager.update_status(ReportStatus.REMINDED, sheet=sheet.name)
+                    self.logger.info(f"📢 [{sheet.name}] Reminder {reminder_count + 1} sent successfully")
+                    return "reminded"
                 else:
+                    state_manager.release_reminder(sheet.name)
                     error_msg = result.get("error", "Failed to send reminder")
-                    self.logger.error(f"❌ Failed to send reminder: {error_msg}")
+                    self.logger.error(f"❌ [{sheet.name}] Failed to send reminder: {error_msg}")
+                    return "failed"
             else:
-                self.logger.info("⏭️ Maximum reminders reached or conditions not met")
-                state_manager.update_status(ReportStatus.WAITING)
+                self.logger.info(f"⏭️ [{sheet.name}] Maximum reminders reached or conditions not met")
+                state_manager.update_status(ReportStatus.WAITING, sheet=sheet.name)
+                return "waiting"
                 
         except Exception as e:
             error_msg = f"Error handling missing report: {str(e)}"
-            self.logger.error(f"❌ {error_msg}")
-            state_manager.mark_failed(error_msg)
+            self.logger.error(f"❌ [{sheet.name}] {error_msg}")
+            state_manager.mark_failed(error_msg, sheet=sheet.name)
+            return "failed"
     
+    @SCHEDULER_JOB_DURATION.labels(job="cleanup").time()
     def cleanup_job(self):
         """Daily cleanup job"""
         try:
@@ -215,11 +359,19 @@ class SchedulerService:
             return {
                 "scheduler": scheduler_status,
                 "state": state_manager.get_stats(),
+                "leader": self.leader_lease.get_stats(),
                 "config": {
                     "enabled": scheduler.enabled,
                     "timezone": scheduler.timezone,
                     "check_times": scheduler.check_times,
-                    "max_reminders": scheduler.max_reminders
+                    "max_reminders": scheduler.max_reminders,
+                    "report_mode": scheduler.report_mode,
+                    "concurrency": self.concurrency,
+                    "sheets": [
+                        {"name": sheet.name, "slack_target": sheet.slack_target, "max_reminders": sheet.max_reminders,
+                         "tabs": sheet.tabs}
+                        for sheet in SchedulerConfig.from_env().sheets
+                    ]
                 }
             }
             
@@ -227,16 +379,31 @@ class SchedulerService:
             self.logger.error(f"❌ Error getting status: {str(e)}")
             return {"error": str(e)}
     
-    def trigger_manual_check(self) -> Dict[str, Any]:
+    def trigger_manual_check(self, force: bool = False) -> Dict[str, Any]:
         """Trigger manual check (for testing/debugging)"""
         try:
-            self.logger.info("🔧 Manual check triggered")
-            self.daily_check_job()
-            return {"success": True, "message": "Manual check completed"}
+            # Sheet locks are per process, so a round off the leader would race the leader's round
+            if not self.leader_lease.acquire():
+                error_msg = "Another replica holds the scheduler lease, trigger the check there"
+                self.logger.warning(f"⏭️ {error_msg}")
+                return {"success": False, "error": error_msg}
+            self.logger.info(f"🔧 Manual check triggered{' (forced)' if force else ''}")
+            results = self.daily_check_job(force=force)
+            return {"success": True, "message": "Manual check completed", "sheets": results}
         except Exception as e:
             error_msg = f"Error in manual check: {str(e)}"
             self.logger.error(f"❌ {error_msg}")
             return {"success": False, "error": error_msg}
 
-# Global scheduler service instance
-scheduler_service = SchedulerService()
+# Application-wide scheduler service, created on first use and shared by the lifespan and the API
+_scheduler_service: Optional[SchedulerService] = None
+_scheduler_service_lock = threading.Lock()
+
+def get_scheduler_service() -> SchedulerService:
+    """Get the shared scheduler service"""
+    global _scheduler_service
+    if _scheduler_service is None:
+        with _scheduler_service_lock:
+            if _scheduler_service is None:
+                _scheduler_service = SchedulerService()
+    return _scheduler_service
@@ -0,0 +1,531 @@
+# ==========================================
+# src/scheduler/state_backends.py
+# Pluggable Storage for Daily Scheduler State (JSON file, SQLite WAL)
+# ==========================================
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.config.settings import StateStoreConfig
+from src.db.mongo.mongo_db import MongoDB
+from src.scheduler.state_writer import StateWriter
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+# Per-sheet, per-day state fields and their initial values
+STATE_FIELDS = {
+    "status": "PENDING",
+    "check_count": 0,
+    "last_check": None,
+    "report_found": False,
+    "notifications_sent": 0,
+    "completed_at": None,
+    "error_count": 0,
+    "last_error": None
+}
+
+# State key of the single sheet configured through DEFAULT_SHEET_URL (and of API-triggered reports)
+DEFAULT_SHEET = "default"
+
+def _check_fields(fields: Dict[str, Any]) -> None:
+    """Reject unknown state fields (SQL column names are built from them)"""
+    unknown = set(fields) - set(STATE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown state fields: {sorted(unknown)}")
+
+class StateBackend(ABC):
+    """Storage of one state row per (day, sheet) plus the reports generated for it"""
+
+    name = "base"
+
+    @abstractmethod
+    def ensure(self, day: str, sheet: str) -> Dict[str, Any]:
+        """State of a sheet for the day, created with the initial values if missing"""
+
+    @abstractmethod
+    def get(self, day: str, sheet: str) -> Optional[Dict[str, Any]]:
+        """State of a sheet for the day, or None if it has none (never creates it)"""
+
+    @abstractmethod
+    def update(self, day: str, sheet: str, values: Optional[Dict[str, Any]] = None,
+               increments: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Set and increment fields of an existing state row in one step; returns the new state"""
+
+    @abstractmethod
+    def compare_and_set(self, day: str, sheet: str, expected: Dict[str, Any],
+                        values: Optional[Dict[str, Any]] = None,
+                        increments: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        """Update the state row only if its fields still equal `expected`; returns the new state, or None"""
+
+    @staticmethod
+    def _written(state: Optional[Dict[str, Any]], day: str, sheet: str) -> Dict[str, Any]:
+        """State after an unconditional write; the row only goes missing if it was deleted meanwhile"""
+        if state is None:
+            raise RuntimeError(f"State of sheet '{sheet}' for {day} was removed during the update")
+        return state
+
+    @abstractmethod
+    def list_sheets(self, day: str) -> List[str]:
+        """Sheets with state for the day"""
+
+    @abstractmethod
+    def put_report(self, day: str, sheet: str, sheet_key: str, record: Dict[str, Any]) -> None:
+        """Store (or replace) the report generated for a sheet URL"""
+
+    @abstractmethod
+    def get_report(self, day: str, sheet: str, sheet_key: str) -> Optional[Dict[str, Any]]:
+        """Stored report for a sheet URL, if any"""
+
+    @abstractmethod
+    def delete_before(self, day: str) -> int:
+        """Delete every state older than the day; returns the number of days (JSON) or rows (SQL) removed"""
+
+    def flush(self) -> bool:
+        """Write pending changes now (for backends that buffer them)"""
+        return False
+
+    def close(self) -> None:
+        """Flush and release the backend"""
+        self.flush()
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Get backend statistics"""
+
+class JsonFileBackend(StateBackend):
+    """Whole state in memory, written behind to one JSON file (small deployments)"""
+
+    name = "json"
+
+    def __init__(self, state_file: str, flush_interval: float = 1.0, fsync: bool = False, compact: bool = True):
+        self.state_file = state_file
+        self.compact = compact
+        self._lock = threading.RLock()
+
+        # Ensure directory exists
+        state_dir = os.path.dirname(self.state_file)
+        if state_dir and not os.path.exists(state_dir):
+            os.makedirs(state_dir, exist_ok=True)
+
+        self.state_data = self._load_state()
+
+        # Mutations are coalesced and written behind, atomically
+        self.writer = StateWriter(self.state_file, serialize=self._serialize,
+                                  flush_interval=flush_interval, fsync=fsync)
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Load state from file"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r') as f:
+                    data = json.load(f)
+                    logger.info(f"📂 State loaded from {self.state_file}")
+                    return data
+            else:
+                logger.info("📂 No existing state file, starting fresh")
+                return {}
+        except Exception as e:
+            logger.error(f"❌ Error loading state: {str(e)}")
+            return {}
+
+    def _serialize(self) -> str:
+        """Current state as JSON (compact unless pretty-printing is configured)"""
+        with self._lock:
+            if self.compact:
+                return json.dumps(self.state_data, separators=(',', ':'), default=str)
+            return json.dumps(self.state_data, indent=2, default=str)
+
+    def _sheets(self, day: str, create: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Sheet states of a day, creating the day unless only reading"""
+        day_state = self.state_data.get(day)
+        if day_state is None:
+            if not create:
+                return {}
+            day_state = self.state_data[day] = {"date": day, "sheets": {}}
+        elif "sheets" not in day_state:
+            # State written before sheets were tracked separately belongs to the default sheet
+            legacy = {key: value for key, value in day_state.items() if key != "date"}
+            day_state = self.state_data[day] = {"date": day, "sheets": {DEFAULT_SHEET: legacy}}
+        return day_state["sheets"]
+
+    def _row(self, day: str, sheet: str) -> Dict[str, Any]:
+        """Live state dict of a sheet for the day, created if missing"""
+        sheets = self._sheets(day)
+        if sheet not in sheets:
+            sheets[sheet] = {**STATE_FIELDS, "reports": {}}
+            self.writer.mark_dirty()
+        return sheets[sheet]
+
+    def ensure(self, day: str, sheet: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._row(day, sheet)
+            return {key: row.get(key, default) for key, default in STATE_FIELDS.items()}
+
+    def get(self, day: str, sheet: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._sheets(day, create=False).get(sheet)
+            if row is None:
+                return None
+            return {key: row.get(key, default) for key, default in STATE_FIELDS.items()}
+
+    def update(self, day: str, sheet: str, values: Optional[Dict[str, Any]] = None,
+               increments: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        return self._written(self.compare_and_set(day, sheet, {}, values=values, increments=increments), day, sheet)
+
+    def compare_and_set(self, day: str, sheet: str, expected: Dict[str, Any],
+                        values: Optional[Dict[str, Any]] = None,
+                        increments: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        values, increments = values or {}, increments or {}
+        _check_fields({**expected, **values, **increments})
+        with self._lock:
+            row = self._row(day, sheet)
+            if any(row.get(key, STATE_FIELDS[key]) != value for key, value in expected.items()):
+                return None
+            row.update(values)
+            for key, amount in increments.items():
+                row[key] = row.get(key, 0) + amount
+            self.writer.mark_dirty()
+            return {key: row.get(key, default) for key, default in STATE_FIELDS.items()}
+
+    def list_sheets(self, day: str) -> List[str]:
+        with self._lock:
+            return list(self._sheets(day, create=False))
+
+    def put_report(self, day: str, sheet: str, sheet_key: str, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._row(day, sheet).setdefault("reports", {})[sheet_key] = record
+            self.writer.mark_dirty()
+
+    def get_report(self, day: str, sheet: str, sheet_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._sheets(day, create=False).get(sheet, {}).get("reports", {}).get(sheet_key)
+
+    def delete_before(self, day: str) -> int:
+        cutoff = date.fromisoformat(day)
+        with self._lock:
+            keys_to_remove = []
+            for date_key in self.state_data:
+                try:
+                    if date.fromisoformat(date_key) < cutoff:
+                        keys_to_remove.append(date_key)
+                except ValueError:
+                    continue
+
+            for key in keys_to_remove:
+                del self.state_data[key]
+            if keys_to_remove:
+                self.writer.mark_dirty()
+            return len(keys_to_remove)
+
+    def flush(self) -> bool:
+        return self.writer.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "path": self.state_file, **self.writer.get_stats()}
+
+class SQLiteBackend(StateBackend):
+    """One indexed row per (day, sheet) in an embedded SQLite database in WAL mode"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+        # One connection shared by every thread (statements are single-row and short), so scheduler rounds and
+        # request threads never add connections or file descriptors
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.RLock()
+
+        state_dir = os.path.dirname(self.path)
+        if state_dir and not os.path.exists(state_dir):
+            os.makedirs(state_dir, exist_ok=True)
+        self._create_schema()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared connection (autocommit, so every statement is its own transaction)"""
+        with self._db_lock:
+            if self._db is None:
+                connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                             check_same_thread=False)
+                connection.row_factory = sqlite3.Row
+                # WAL still lets other processes read while this one writes
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                self._db = connection
+            yield self._db
+
+    def _create_schema(self) -> None:
+        """Create the state and report tables"""
+        with self._connection() as connection:
+            self._create_tables(connection)
+        logger.info(f"🗄️ SQLite state store ready at {self.path}")
+
+    @staticmethod
+    def _create_tables(connection: sqlite3.Connection) -> None:
+        """Create the state and report tables on a connection"""
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS sheet_state (
+                day TEXT NOT NULL,
+                sheet TEXT NOT NULL,
+                status TEXT NOT NULL,
+                check_count INTEGER NOT NULL DEFAULT 0,
+                last_check TEXT,
+                report_found INTEGER NOT NULL DEFAULT 0,
+                notifications_sent INTEGER NOT NULL DEFAULT 0,
+                completed_at TEXT,
+                error_count INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                PRIMARY KEY (day, sheet)
+            ) WITHOUT ROWID
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS sheet_report (
+                day TEXT NOT NULL,
+                sheet TEXT NOT NULL,
+                sheet_key TEXT NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (day, sheet, sheet_key)
+            ) WITHOUT ROWID
+        """)
+
+    @staticmethod
+    def _state(row: sqlite3.Row) -> Dict[str, Any]:
+        """State dict of a row (SQLite has no boolean type)"""
+        state = {key: row[key] for key in STATE_FIELDS}
+        state["report_found"] = bool(state["report_found"])
+        return state
+
+    def ensure(self, day: str, sheet: str) -> Dict[str, Any]:
+        with self._connection() as connection:
+            connection.execute("INSERT OR IGNORE INTO sheet_state (day, sheet, status) VALUES (?, ?, ?)",
+                               (day, sheet, STATE_FIELDS["status"]))
+            row = connection.execute("SELECT * FROM sheet_state WHERE day = ? AND sheet = ?",
+                                     (day, sheet)).fetchone()
+        return self._state(row)
+
+    def get(self, day: str, sheet: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as connection:
+            row = connection.execute("SELECT * FROM sheet_state WHERE day = ? AND sheet = ?",
+                                     (day, sheet)).fetchone()
+        return self._state(row) if row else None
+
+    def update(self, day: str, sheet: str, values: Optional[Dict[str, Any]] = None,
+               increments: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        state = self.compare_and_set(day, sheet, {}, values=values, increments=increments)
+        if state is None:
+            # First write of the day for this sheet
+            self.ensure(day, sheet)
+            state = self.compare_and_set(day, sheet, {}, values=values, increments=increments)
+        return self._written(state, day, sheet)
+
+    def compare_and_set(self, day: str, sheet: str, expected: Dict[str, Any],
+                        values: Optional[Dict[str, Any]] = None,
+                        increments: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        values, increments = values or {}, increments or {}
+        _check_fields({**expected, **values, **increments})
+        assignments = [f"{key} = ?" for key in values] + [f"{key} = {key} + ?" for key in increments]
+        if not assignments:
+            # Nothing to change: a no-op assignment still returns the row when the condition holds
+            assignments = ["status = status"]
+
+        # The condition is part of the UPDATE, so the check and the write are one atomic statement
+        conditions = ["day = ?", "sheet = ?"] + [f"{key} IS ?" for key in expected]
+        with self._connection() as connection:
+            row = connection.execute(
+                f"UPDATE sheet_state SET {', '.join(assignments)} WHERE {' AND '.join(conditions)} RETURNING *",
+                (*values.values(), *increments.values(), day, sheet, *expected.values())
+            ).fetchone()
+        return self._state(row) if row else None
+
+    def list_sheets(self, day: str) -> List[str]:
+        with self._connection() as connection:
+            rows = connection.execute("SELECT sheet FROM sheet_state WHERE day = ? ORDER BY sheet",
+                                      (day,)).fetchall()
+        return [row["sheet"] for row in rows]
+
+    def put_report(self, day: str, sheet: str, sheet_key: str, record: Dict[str, Any]) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO sheet_report (day, sheet, sheet_key, record) VALUES (?, ?, ?, ?)",
+                (day, sheet, sheet_key, json.dumps(record, default=str))
+            )
+
+    def get_report(self, day: str, sheet: str, sheet_key: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT record FROM sheet_report WHERE day = ? AND sheet = ? AND sheet_key = ?",
+                (day, sheet, sheet_key)
+            ).fetchone()
+        return json.loads(row["record"]) if row else None
+
+    def delete_before(self, day: str) -> int:
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                removed = connection.execute("DELETE FROM sheet_state WHERE day < ?", (day,)).rowcount
+                connection.execute("DELETE FROM sheet_report WHERE day < ?", (day,))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return removed
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT COUNT(*) AS rows, COUNT(DISTINCT day) AS days FROM sheet_state"
+            ).fetchone()
+        return {"backend": self.name, "path": self.path, "rows": row["rows"], "days": row["days"]}
+
+class MongoStateBackend(StateBackend):
+    """One document per day shared by every replica; each change is a single atomic $set/$inc"""
+
+    name = "mongo"
+
+    def __init__(self, collection_name: str = "scheduler_state", db: Optional[MongoDB] = None):
+        self.collection_name = collection_name
+        self._db = db
+
+    @property
+    def db(self) -> MongoDB:
+        """Get the state collection, connecting on first use"""
+        if self._db is None:
+            self._db = MongoDB(collection_name=self.collection_name)
+        return self._db
+
+    @staticmethod
+    def _path(sheet: str) -> str:
+        """Field path of a sheet inside the day document"""
+        if "." in sheet or sheet.startswith("$"):
+            raise ValueError(f"Sheet names used as MongoDB keys cannot contain '.' or start with '$': {sheet}")
+        return f"sheets.{sheet}"
+
+    @staticmethod
+    def _report_key(sheet_key: str) -> str:
+        """Sheet URLs contain dots, so reports are keyed by a hash of the URL"""
+        return hashlib.sha256(sheet_key.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _state(document: Optional[Dict[str, Any]], sheet: str) -> Optional[Dict[str, Any]]:
+        """State dict of a sheet in a day document"""
+        row = (document or {}).get("sheets", {}).get(sheet)
+        if row is None:
+            return None
+        return {key: row.get(key, default) for key, default in STATE_FIELDS.items()}
+
+    def ensure(self, day: str, sheet: str) -> Dict[str, Any]:
+        path = self._path(sheet)
+        try:
+            self.db.collection.update_one(
+                {"_id": day, path: {"$exists": False}},
+                {"$set": {path: {**STATE_FIELDS, "reports": {}}}, "$setOnInsert": {"date": day}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # The day document already holds this sheet (possibly created by another replica just now)
+            pass
+        return self._written(self.get(day, sheet), day, sheet)
+
+    def get(self, day: str, sheet: str) -> Optional[Dict[str, Any]]:
+        path = self._path(sheet)
+        return self._state(self.db.collection.find_one({"_id": day}, {path: 1}), sheet)
+
+    def update(self, day: str, sheet: str, values: Optional[Dict[str, Any]] = None,
+               increments: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        state = self.compare_and_set(day, sheet, {}, values=values, increments=increments)
+        if state is None:
+            # First write of the day for this sheet
+            self.ensure(day, sheet)
+            state = self.compare_and_set(day, sheet, {}, values=values, increments=increments)
+        return self._written(state, day, sheet)
+
+    def compare_and_set(self, day: str, sheet: str, expected: Dict[str, Any],
+                        values: Optional[Dict[str, Any]] = None,
+                        increments: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        values, increments = values or {}, increments or {}
+        _check_fields({**expected, **values, **increments})
+        path = self._path(sheet)
+
+        # The expected values are part of the filter, so the check and the write are one atomic operation
+        query = {"_id": day, path: {"$exists": True}, **{f"{path}.{key}": value for key, value in expected.items()}}
+        update = {}
+        if values:
+            update["$set"] = {f"{path}.{key}": value for key, value in values.items()}
+        if increments:
+            update["$inc"] = {f"{path}.{key}": amount for key, amount in increments.items()}
+
+        if not update:
+            document = self.db.collection.find_one(query, {path: 1})
+        else:
+            document = self.db.collection.find_one_and_update(query, update, projection={path: 1},
+                                                              return_document=ReturnDocument.AFTER)
+        return self._state(document, sheet)
+
+    def list_sheets(self, day: str) -> List[str]:
+        document = self.db.find_one({"_id": day})
+        return list((document or {}).get("sheets", {}))
+
+    def put_report(self, day: str, sheet: str, sheet_key: str, record: Dict[str, Any]) -> None:
+        field = f"{self._path(sheet)}.reports.{self._report_key(sheet_key)}"
+        self.db.update_one({"_id": day}, {"$set": {field: {**record, "sheet_key": sheet_key}},
+                                          "$setOnInsert": {"date": day}}, upsert=True)
+
+    def get_report(self, day: str, sheet: str, sheet_key: str) -> Optional[Dict[str, Any]]:
+        field = f"{self._path(sheet)}.reports.{self._report_key(sheet_key)}"
+        document = self.db.collection.find_one({"_id": day}, {field: 1})
+        record = (document or {}).get("sheets", {}).get(sheet, {}).get("reports", {}).get(self._report_key(sheet_key))
+        if record is None:
+            return None
+        record.pop("sheet_key", None)
+        return record
+
+    def delete_before(self, day: str) -> int:
+        # Day documents are keyed by ISO date, so the range is a single _id index scan
+        return self.db.delete({"_id": {"$lt": day}}).deleted_count
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        try:
+            days = self.db.collection.estimated_document_count()
+        except Exception as e:
+            logger.error(f"❌ Error counting state documents: {str(e)}")
+            days = None
+        return {"backend": self.name, "collection": self.collection_name, "days": days}
+
+def create_state_backend(store_config: StateStoreConfig) -> StateBackend:
+    """Build the configured state backend"""
+    if store_config.backend == "sqlite":
+        return SQLiteBackend(store_config.sqlite_path)
+    if store_config.backend == "mongo":
+        return MongoStateBackend(store_config.mongo_collection_name)
+    if store_config.backend != "json":
+        raise ValueError(f"Unknown state backend: {store_config.backend}")
+    return JsonFileBackend(
+        store_config.state_file,
+        flush_interval=store_config.flush_interval,
+        fsync=store_config.fsync,
+        compact=store_config.compact
+    )
@@ -3,12 +3,16 @@
 # Daily Report State Management
 # ==========================================
 
-import json
-import os
-from datetime import datetime, date
-from typing import Dict, Any, Optional
+import atexit
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Iterator, Optional
 from enum import Enum
 from src.config import settings as config
+from src.sheets.sheet_fetcher import to_export_url
+from src.scheduler.keyed_locks import KeyedLocks
+from src.scheduler.state_backends import DEFAULT_SHEET, STATE_FIELDS, StateBackend, create_state_backend
 from src.logs.logger import Logger
 
 logger = Logger(__name__)
@@ -27,172 +31,198 @@ class ReportStatus(Enum):
 class DailyStateManager:
     """Manages daily report generation state"""
 
-    def __init__(self, state_file: Optional[str] = None):
-        # Use environment variable or default path
-        if state_file is None:
-            state_file = os.getenv("SCHEDULER_STATE_FILE", "daily_report_state.json")
+    def __init__(self, state_file: Optional[str] = None, backend: Optional[StateBackend] = None,
+                 flush_interval: Optional[float] = None, fsync: Optional[bool] = None,
+                 compact: Optional[bool] = None):
+        # Explicit arguments override the environment (a state_file without a backend is a JSON file)
+        overrides: Dict[str, Any] = {"state_file": state_file, "flush_interval": flush_interval, "fsync": fsync, "compact": compact}
+        store_config = replace(config.StateStoreConfig.from_env(),
+                               **{key: value for key, value in overrides.items() if value is not None})
+        if state_file is not None:
+            store_config = replace(store_config, backend="json")
 
-        self.state_file = state_file
-
-        # Ensure directory exists
-        state_dir = os.path.dirname(self.state_file)
-        if state_dir and not os.path.exists(state_dir):
-            os.makedirs(state_dir, exist_ok=True)
-
-        self.state_data = self._load_state()
-        logger.info(f"📊 Daily State Manager initialized with file: {self.state_file}")
+        self.backend = backend or create_state_backend(store_config)
+        
+        # Scheduler threads and API requests share this manager; each (day, sheet) has its own lock
+        self._sheet_locks = KeyedLocks()
+        logger.info(f"📊 Daily State Manager initialized with {self.backend.name} backend")
     
-    def _load_state(self) -> Dict[str, Any]:
-        """Load state from file"""
-        try:
-            if os.path.exists(self.state_file):
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"📂 State loaded from {self.state_file}")
-                    return data
-            else:
-                logger.info("📂 No existing state file, starting fresh")
-                return {}
-        except Exception as e:
-            logger.error(f"❌ Error loading state: {str(e)}")
-            return {}
+    def flush(self) -> bool:
+        """Write pending state changes now"""
+        return self.backend.flush()
     
-    def _save_state(self):
-        """Save state to file"""
-        try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self.state_data, f, indent=2, default=str)
-            logger.info(f"💾 State saved to {self.state_file}")
-        except Exception as e:
-            logger.error(f"❌ Error saving state: {str(e)}")
+    def close(self):
+        """Flush and release the state backend"""
+        self.backend.close()
     
     def get_today_key(self) -> str:
         """Get today's date key"""
         return date.today().isoformat()
     
-    def get_today_state(self) -> Dict[str, Any]:
-        """Get today's state"""
-        today_key = self.get_today_key()
-        if today_key not in self.state_data:
-            # Initialize today's state
-            self.state_data[today_key] = {
-                "date": today_key,
-                "status": ReportStatus.PENDING.value,
-                "check_count": 0,
-                "last_check": None,
-                "report_found": False,
-                "notifications_sent": 0,
-                "completed_at": None,
-                "error_count": 0,
-                "last_error": None
-            }
-            self._save_state()
-        
-        return self.state_data[today_key]
+    @contextmanager
+    def sheet_lock(self, sheet: str = DEFAULT_SHEET) -> Iterator[None]:
+        """Serialize work on one sheet's state for today; other sheets are not blocked"""
+        with self._sheet_locks.hold((self.get_today_key(), sheet)):
+            yield
+    
+    def get_today_state(self, sheet: str = DEFAULT_SHEET) -> Dict[str, Any]:
+        """Get today's state of a monitored sheet"""
+        return self.backend.ensure(self.get_today_key(), sheet)
+    
+    def peek_today_state(self, sheet: str = DEFAULT_SHEET) -> Dict[str, Any]:
+        """Get today's state of a sheet without creating it (initial values if it has none yet)"""
+        return self.backend.get(self.get_today_key(), sheet) or dict(STATE_FIELDS)
     
-    def update_status(self, status: ReportStatus, **kwargs):
+    def _update(self, sheet: str, values: Optional[Dict[str, Any]] = None,
+                increments: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Apply a single-row update to today's state of a sheet"""
+        return self.backend.update(self.get_today_key(), sheet, values=values, increments=increments)
+    
+    def update_status(self, status: ReportStatus, sheet: str = DEFAULT_SHEET,
+                      increments: Optional[Dict[str, int]] = None, **kwargs):
         """Update today's status"""
-        today_state = self.get_today_state()
-        today_state["status"] = status.value
-        today_state["last_check"] = datetime.now().isoformat()
-        
-        # Update additional fields
-        for key, value in kwargs.items():
-            if key in today_state:
-                today_state[key] = value
-        
-        self._save_state()
-        logger.info(f"📊 Status updated to: {status.value}")
+        values = {
+            "status": status.value,
+            "last_check": datetime.now().isoformat(),
+            # Update additional fields
+            **{key: value for key, value in kwargs.items() if key in STATE_FIELDS}
+        }
+        self._update(sheet, values=values, increments=increments)
+        logger.info(f"📊 [{sheet}] Status updated to: {status.value}")
     
-    def increment_check_count(self):
+    def increment_check_count(self, sheet: str = DEFAULT_SHEET):
         """Increment check count"""
-        today_state = self.get_today_state()
-        today_state["check_count"] += 1
-        self._save_state()
-        logger.info(f"🔍 Check count: {today_state['check_count']}")
+        today_state = self._update(sheet, increments={"check_count": 1})
+        logger.info(f"🔍 [{sheet}] Check count: {today_state['check_count']}")
     
-    def increment_notification_count(self):
+    def increment_notification_count(self, sheet: str = DEFAULT_SHEET):
         """Increment notification count"""
-        today_state = self.get_today_state()
-        today_state["notifications_sent"] += 1
-        self._save_state()
-        logger.info(f"📢 Notifications sent: {today_state['notifications_sent']}")
+        today_state = self._update(sheet, increments={"notifications_sent": 1})
+        logger.info(f"📢 [{sheet}] Notifications sent: {today_state['notifications_sent']}")
     
-    def mark_report_found(self):
+    def mark_report_found(self, sheet: str = DEFAULT_SHEET):
         """Mark report as found"""
-        self.update_status(ReportStatus.FOUND, report_found=True)
+        self.update_status(ReportStatus.FOUND, sheet=sheet, report_found=True)
     
-    def mark_completed(self):
+    def mark_completed(self, sheet: str = DEFAULT_SHEET):
         """Mark today as completed"""
         self.update_status(
-            ReportStatus.COMPLETED, 
+            ReportStatus.COMPLETED,
+            sheet=sheet,
             completed_at=datetime.now().isoformat()
         )
     
-    def mark_failed(self, error_message: str):
+    def mark_failed(self, error_message: str, sheet: str = DEFAULT_SHEET):
         """Mark today as failed"""
-        today_state = self.get_today_state()
-        today_state["error_count"] += 1
         self.update_status(
             ReportStatus.FAILED,
+            sheet=sheet,
+            increments={"error_count": 1},
             last_error=error_message
         )
     
-    def is_completed_today(self) -> bool:
+    @staticmethod
+    def _report_slot(sheet_url: str, variant: str) -> str:
+        """Stored report slot: one per sheet (and tab) and generation variant"""
+        return f"{to_export_url(sheet_url)}#{variant}" if variant else to_export_url(sheet_url)
+    
+    def record_report(self, sheet_url: str, content_hash: str, result: Dict[str, Any], sheet: str = DEFAULT_SHEET,
+                      variant: str = ""):
+        """Remember the content hash of the processed row and the report generated from it"""
+        today_key = self.get_today_key()
+        self.backend.ensure(today_key, sheet)
+        self.backend.put_report(today_key, sheet, self._report_slot(sheet_url, variant), {
+            "content_hash": content_hash,
+            "generated_at": datetime.now().isoformat(),
+            "result": {key: result.get(key) for key in ("success", "output", "agent", "context")}
+        })
+        logger.info(f"🧾 [{sheet}] Report recorded for row {content_hash[:12]}")
+    
+    def get_report(self, sheet_url: str, content_hash: str, sheet: str = DEFAULT_SHEET,
+                   variant: str = "") -> Optional[Dict[str, Any]]:
+        """Get today's report for the sheet if it was generated the same way from a row with the same content hash"""
+        record = self.backend.get_report(self.get_today_key(), sheet, self._report_slot(sheet_url, variant))
+        if record is None or record["content_hash"] != content_hash:
+            return None
+        return {**record["result"], "reused": True, "generated_at": record["generated_at"]}
+    
+    def is_completed_today(self, sheet: str = DEFAULT_SHEET) -> bool:
         """Check if today is already completed"""
-        today_state = self.get_today_state()
+        today_state = self.peek_today_state(sheet)
         return today_state["status"] == ReportStatus.COMPLETED.value
     
-    def should_send_reminder(self) -> bool:
-        """Check if should send reminder"""
-        today_state = self.get_today_state()
+    def should_send_reminder(self, sheet: str = DEFAULT_SHEET, max_reminders: Optional[int] = None) -> bool:
+        """Check if should send reminder (the sheet's own limit, else the configured default)"""
+        if max_reminders is None:
+            max_reminders = config.SchedulerConfig.from_env().max_reminders
+        today_state = self.peek_today_state(sheet)
         return (
-            today_state["notifications_sent"] < config.SchedulerConfig.from_env().max_reminders and
+            today_state["notifications_sent"] < max_reminders and
             not today_state["report_found"] and
             today_state["status"] not in [ReportStatus.COMPLETED.value, ReportStatus.PROCESSING.value]
         )
     
-    def get_reminder_count(self) -> int:
+    def claim_reminder(self, sheet: str = DEFAULT_SHEET, max_reminders: Optional[int] = None) -> Optional[int]:
+        """Atomically reserve the next reminder if the policy allows one; returns its 0-based number, or None"""
+        if max_reminders is None:
+            max_reminders = config.SchedulerConfig.from_env().max_reminders
+        today_key = self.get_today_key()
+        while True:
+            today_state = self.get_today_state(sheet)
+            if not (
+                today_state["notifications_sent"] < max_reminders and
+                not today_state["report_found"] and
+                today_state["status"] not in [ReportStatus.COMPLETED.value, ReportStatus.PROCESSING.value]
+            ):
+                return None
+            
+            # Compare-and-set: only counts if nobody changed the fields the decision was based on
+            expected = {key: today_state[key] for key in ("notifications_sent", "report_found", "status")}
+            if self.backend.compare_and_set(today_key, sheet, expected,
+                                            increments={"notifications_sent": 1}) is not None:
+                return today_state["notifications_sent"]
+    
+    def release_reminder(self, sheet: str = DEFAULT_SHEET):
+        """Give back a claimed reminder that could not be sent"""
+        self._update(sheet, increments={"notifications_sent": -1})
+    
+    def get_reminder_count(self, sheet: str = DEFAULT_SHEET) -> int:
         """Get current reminder count"""
-        today_state = self.get_today_state()
+        today_state = self.peek_today_state(sheet)
         return today_state["notifications_sent"]
     
     def cleanup_old_states(self, days_to_keep: int = 30):
         """Clean up old state data"""
         try:
-            cutoff_date = date.today().replace(day=date.today().day - days_to_keep)
-            keys_to_remove = []
-            
-            for date_key in self.state_data.keys():
-                try:
-                    state_date = datetime.fromisoformat(date_key).date()
-                    if state_date < cutoff_date:
-                        keys_to_remove.append(date_key)
-                except:
-                    continue
-            
-            for key in keys_to_remove:
-                del self.state_data[key]
+            cutoff_date = date.today() - timedelta(days=days_to_keep)
+            removed = self.backend.delete_before(cutoff_date.isoformat())
             
-            if keys_to_remove:
-                self._save_state()
-                logger.info(f"🧹 Cleaned up {len(keys_to_remove)} old state entries")
+            if removed:
+                logger.info(f"🧹 Cleaned up {removed} old state entries")
                 
         except Exception as e:
             logger.error(f"❌ Error cleaning up old states: {str(e)}")
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get statistics"""
-        today_state = self.get_today_state()
+        """Get statistics per monitored sheet (read-only: sheets without state today are not listed)"""
         return {
             "today": self.get_today_key(),
+            "sheets": {sheet: self._sheet_stats(sheet) for sheet in self.backend.list_sheets(self.get_today_key())},
+            "persistence": self.backend.get_stats()
+        }
+    
+    def _sheet_stats(self, sheet: str) -> Dict[str, Any]:
+        """Get statistics of one sheet"""
+        today_state = self.peek_today_state(sheet)
+        return {
             "status": today_state["status"],
             "check_count": today_state["check_count"],
             "notifications_sent": today_state["notifications_sent"],
             "report_found": today_state["report_found"],
-            "completed": self.is_completed_today(),
-            "should_remind": self.should_send_reminder()
+            "completed": self.is_completed_today(sheet),
+            "last_error": today_state["last_error"]
         }
 
-# Global state manager instance
+# Global state manager instance, flushed on interpreter exit as well as on app shutdown
 state_manager = DailyStateManager()
+atexit.register(state_manager.close)
@@ -0,0 +1,100 @@
+# ==========================================
+# src/scheduler/state_writer.py
+# Write-Behind, Atomic State File Persistence
+# ==========================================
+
+import os
+import threading
+from typing import Callable, Optional
+
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+class StateWriter:
+    """Coalesces state mutations into one atomic file write (temp file + rename) per flush interval"""
+
+    def __init__(self, path: str, serialize: Callable[[], str], flush_interval: float = 1.0,
+                 fsync: bool = False):
+        self.path = path
+        self.serialize = serialize
+        self.flush_interval = max(0.0, flush_interval)
+        self.fsync = fsync
+
+        # Two locks so a mutation marking the state dirty never waits on a file write in progress
+        self._dirty_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._written_sequence = 0
+        self._timer: Optional[threading.Timer] = None
+        self._stats = {"mutations": 0, "writes": 0, "errors": 0}
+
+    def mark_dirty(self) -> None:
+        """Record a mutation; it is written by the next flush (immediately when the interval is 0)"""
+        with self._dirty_lock:
+            self._dirty = True
+            self._stats["mutations"] += 1
+            if self.flush_interval > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> bool:
+        """Write the current state if anything changed since the last write; returns whether it wrote"""
+        with self._dirty_lock:
+            if self._timer is not None and self._timer is not threading.current_thread():
+                self._timer.cancel()
+            self._timer = None
+            if not self._dirty:
+                return False
+            self._dirty = False
+            sequence = self._stats["mutations"]
+
+        # Serialized outside both locks: callers mark the state dirty while holding their own lock
+        try:
+            payload = self.serialize()
+            with self._write_lock:
+                # A concurrent flush that saw later mutations already wrote a newer state
+                if sequence < self._written_sequence:
+                    return False
+                self._write(payload)
+                self._written_sequence = sequence
+        except Exception as e:
+            # Keep the mutation pending so the next flush retries it
+            with self._dirty_lock:
+                self._dirty = True
+                self._stats["errors"] += 1
+            logger.error(f"❌ Error saving state: {str(e)}")
+            return False
+
+        with self._dirty_lock:
+            self._stats["writes"] += 1
+        logger.info(f"💾 State saved to {self.path}")
+        return True
+
+    def _write(self, payload: str) -> None:
+        """Replace the state file atomically, so a crash leaves either the old or the new state"""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(payload)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def close(self) -> None:
+        """Flush pending mutations (called on shutdown)"""
+        self.flush()
+
+    def get_stats(self) -> dict:
+        """Get mutation and write counters"""
+        with self._dirty_lock:
+            return {
+                **self._stats,
+                "pending": self._dirty,
+                "flush_interval": self.flush_interval,
+                "fsync": self.fsync
+            }
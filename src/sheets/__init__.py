@@ -0,0 +1,11 @@
+# Sheets module
+from .sheet_fetcher import SheetFetcher, SheetFetchError, sheet_fetcher, to_export_url
+from .sheet_cache import SheetCache, sheet_cache
+from .schema import SchemaProfiles, SheetProfile, schema_profiles
+from .sheet_store import SheetStore, sheet_store
+from .sheet_tabs import SheetTabs, sheet_tab_reader
+from .snapshot import SheetSnapshot, use_snapshot
+
+__all__ = ['SheetFetcher', 'SheetFetchError', 'sheet_fetcher', 'to_export_url', 'SheetCache', 'sheet_cache',
+           'SchemaProfiles', 'SheetProfile', 'schema_profiles', 'SheetStore', 'sheet_store',
+           'SheetTabs', 'sheet_tab_reader', 'SheetSnapshot', 'use_snapshot']
@@ -0,0 +1,42 @@
+# ==========================================
+# src/sheets/rows.py
+# Vectorized Sheet Row Selection
+# ==========================================
+
+from typing import Any, Dict, Optional
+
+import polars as pl
+
+from src.sheets.schema import TAB_COLUMN, SheetProfile, non_blank
+
+def _has_content(df: pl.DataFrame, column: str) -> pl.Expr:
+    """Expression: the cell holds something other than blanks/null"""
+    if df.schema[column] == pl.Utf8:
+        return pl.col(column).str.strip_chars().str.len_bytes().gt(0).fill_null(False)
+    return pl.col(column).is_not_null()
+
+def select_latest_entry(df: pl.DataFrame, date_column: str = 'Date',
+                        profile: Optional[SheetProfile] = None) -> Optional[Dict[str, Any]]:
+    """Latest row by date that has any content besides the date, or None if there is no such row"""
+    if profile is not None and profile.date_column is not None:
+        date_column = profile.date_column
+    content_columns = [column for column in df.columns if column not in (date_column, TAB_COLUMN)]
+    if date_column not in df.columns or not content_columns:
+        return None
+
+    # One pass: parse dates once, mask rows without content, take the arg-max date
+    has_content = pl.any_horizontal([_has_content(df, column) for column in content_columns])
+    if profile is not None and profile.date_format is not None:
+        # Known format: one strict parse, raises if the sheet stopped matching it
+        index = df.select(pl.when(has_content).then(profile.date_expr()).arg_max()).item()
+        return df.row(index, named=True) if index is not None else None
+
+    dates = non_blank(pl.col(date_column))
+    try:
+        index = df.select(pl.when(has_content).then(dates.str.to_date()).arg_max()).item()
+    except pl.exceptions.PolarsError:
+        # Dates with a time part: the date-only parser rejects them
+        index = df.select(
+            pl.when(has_content).then(dates.str.to_datetime().dt.date()).arg_max()
+        ).item()
+    return df.row(index, named=True) if index is not None else None
@@ -0,0 +1,183 @@
+# ==========================================
+# src/sheets/schema.py
+# Per-Sheet Schema Profiles (date format and progress columns)
+# ==========================================
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from src.sheets.sheet_fetcher import to_export_url
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+# Tried in order; day-first comes before month-first because the team sheets write dd/mm/yyyy
+DATE_FORMATS = (
+    "%d/%m/%Y",
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y/%m/%d",
+    "%d/%m/%Y %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+)
+
+# Column added to rows merged from several tabs of one sheet
+TAB_COLUMN = "Tab"
+
+# Canonical progress column -> header spellings seen in the sheets
+PROGRESS_COLUMNS = {
+    "Completed": ("Completed",),
+    "Inprogress": ("Inprogress", "In Progress"),
+    "Blocker": ("Blocker", "Blocked"),
+}
+
+def _normalize(name: str) -> str:
+    """Header comparison key: case, spaces, dashes and underscores ignored"""
+    return re.sub(r"[\s_-]", "", name).lower()
+
+def header_hash(columns: List[str]) -> str:
+    """Stable hash of the header row"""
+    return hashlib.sha256("\x1f".join(columns).encode("utf-8")).hexdigest()[:16]
+
+def find_date_column(columns: List[str]) -> Optional[str]:
+    """The `Date` column, or the first header mentioning a date"""
+    for column in columns:
+        if _normalize(column) == "date":
+            return column
+    return next((column for column in columns if "date" in _normalize(column)), None)
+
+def map_progress_columns(columns: List[str]) -> Dict[str, str]:
+    """Map each canonical progress column to the header the sheet actually uses"""
+    by_key = {_normalize(column): column for column in columns}
+    mapping = {}
+    for canonical, aliases in PROGRESS_COLUMNS.items():
+        match = next((by_key[_normalize(alias)] for alias in aliases if _normalize(alias) in by_key), None)
+        if match is not None:
+            mapping[canonical] = match
+    return mapping
+
+def non_blank(column: pl.Expr) -> pl.Expr:
+    """Stripped text of a cell, or null when it is empty or whitespace-only"""
+    stripped = column.str.strip_chars()
+    return pl.when(stripped.str.len_bytes() > 0).then(stripped)
+
+def _strptime(column: pl.Expr, date_format: str, strict: bool) -> pl.Expr:
+    """Parse into pl.Date with an explicit format (datetime formats are truncated to the day)"""
+    if "%H" in date_format:
+        return column.str.strptime(pl.Datetime, date_format, strict=strict).dt.date()
+    return column.str.strptime(pl.Date, date_format, strict=strict)
+
+def detect_date_format(values: pl.Series) -> Optional[str]:
+    """First known format that parses every non-blank value, or None"""
+    if values.dtype != pl.Utf8:
+        return None
+    frame = values.to_frame("value").select(non_blank(pl.col("value")).alias("value")).drop_nulls()
+    if frame.is_empty():
+        return None
+
+    for date_format in DATE_FORMATS:
+        parsed = frame.select(_strptime(pl.col("value"), date_format, strict=False).is_not_null().all()).item()
+        if parsed:
+            return date_format
+    return None
+
+@dataclass(frozen=True)
+class SheetProfile:
+    """Detected layout of one sheet tab: date column, its format and the progress columns"""
+    header_hash: str
+    date_column: Optional[str]
+    date_format: Optional[str]
+    progress_columns: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_columns(cls, columns: List[str]) -> 'SheetProfile':
+        """Profile read from the header alone (no date format; e.g. for a row already extracted)"""
+        return cls(
+            header_hash=header_hash(columns),
+            date_column=find_date_column(columns),
+            date_format=None,
+            progress_columns=map_progress_columns(columns)
+        )
+
+    def date_expr(self) -> pl.Expr:
+        """Strict, vectorized parse of the date column with the detected format (blank cells become null)"""
+        if self.date_column is None or self.date_format is None:
+            raise ValueError("Sheet profile has no detected date column and format")
+        return _strptime(non_blank(pl.col(self.date_column)), self.date_format, strict=True)
+
+class SchemaProfiles:
+    """Caches sheet profiles by sheet (ID and tab) and header hash so detection runs once per layout"""
+
+    def __init__(self, max_profiles: int = 128):
+        self.max_profiles = max(1, max_profiles)
+        self._profiles: "OrderedDict[Tuple[str, str], SheetProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "detections": 0}
+
+    def profile_frame(self, url: str, df: pl.DataFrame) -> SheetProfile:
+        """Profile for a parsed sheet"""
+        return self._profile(url, df.columns, lambda column: df.get_column(column))
+
+    def profile_scan(self, url: str, data: pl.LazyFrame) -> SheetProfile:
+        """Profile for a lazily scanned sheet; on a miss only the date column is read"""
+        columns = data.collect_schema().names()
+        return self._profile(url, columns, lambda column: data.select(column).collect().to_series())
+
+    def _profile(self, url: str, columns: List[str], load_dates: Callable[[str], pl.Series]) -> SheetProfile:
+        """Get the cached profile for this header, detecting it on first sight"""
+        key = (to_export_url(url), header_hash(columns))
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                self._stats["hits"] += 1
+                return profile
+
+        profile = SheetProfile.from_columns(columns)
+        if profile.date_column:
+            profile = replace(profile, date_format=detect_date_format(load_dates(profile.date_column)))
+        logger.info(f"🧭 Sheet profile detected: date column {profile.date_column!r}, "
+                    f"format {profile.date_format!r}, progress columns {profile.progress_columns}")
+
+        with self._lock:
+            self._stats["detections"] += 1
+            self._profiles[key] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def invalidate(self, url: str) -> None:
+        """Drop every profile of a sheet (e.g. when its dates stopped matching the cached format)"""
+        sheet = to_export_url(url)
+        with self._lock:
+            for key in [key for key in self._profiles if key[0] == sheet]:
+                del self._profiles[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get profile cache statistics"""
+        with self._lock:
+            return {
+                **self._stats,
+                "profiles": {
+                    sheet: {
+                        "header_hash": profile.header_hash,
+                        "date_column": profile.date_column,
+                        "date_format": profile.date_format,
+                        "progress_columns": profile.progress_columns
+                    }
+                    for (sheet, _), profile in self._profiles.items()
+                }
+            }
+
+# Global schema profiles shared by the agent tool and the scheduler
+schema_profiles = SchemaProfiles()
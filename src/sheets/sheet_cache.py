@@ -0,0 +1,209 @@
+# ==========================================
+# src/sheets/sheet_cache.py
+# Parsed Sheet Cache with Conditional Downloads
+# ==========================================
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import polars as pl
+
+from src.config.settings import config
+from src.monitoring.metrics import SHEET_CACHE_RESULTS
+from src.sheets.sheet_fetcher import SheetFetchError, SheetFetcher, parse_csv, scan_csv, sheet_fetcher, to_export_url
+from src.sheets.sheet_store import SheetStore, sheet_store
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+@dataclass
+class CachedSheet:
+    """Downloaded sheet body, its parsed frame (once needed) and the validators needed to revalidate it"""
+    content: bytes
+    content_hash: str
+    frame: Optional[pl.DataFrame] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    checked_at: float = 0.0
+    stats: Dict[str, int] = field(default_factory=lambda: {"fresh": 0, "not_modified": 0, "unchanged": 0, "miss": 0})
+
+class SheetCache:
+    """Serves sheets from memory while fresh, then revalidates with ETag/Last-Modified or a content hash"""
+
+    def __init__(self, fetcher: SheetFetcher, ttl_seconds: float = 60.0, max_sheets: int = 32, enabled: bool = True,
+                 store: Optional[SheetStore] = None):
+        self.fetcher = fetcher
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_sheets = max(1, max_sheets)
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[str, CachedSheet]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sheet_locks: Dict[str, threading.Lock] = {}
+
+        # Snapshots are parsed and diffed on one background thread, never on the request path; a tab that
+        # changes again before its save runs only has its newest body saved
+        self._pending_snapshots: Dict[str, Tuple[str, bytes]] = {}
+        self._snapshot_executor: Optional[ThreadPoolExecutor] = None
+
+    def _sheet_lock(self, key: str) -> threading.Lock:
+        """Per-sheet lock so concurrent readers share one download"""
+        with self._lock:
+            return self._sheet_locks.setdefault(key, threading.Lock())
+
+    def fetch_frame(self, url: str) -> pl.DataFrame:
+        """Get the parsed sheet, downloading and parsing only when it changed"""
+        if not self.enabled:
+            return self.fetcher.fetch_frame(url)
+
+        key = to_export_url(url)
+        with self._sheet_lock(key):
+            entry = self._get_entry(key, url)
+            if entry.frame is None:
+                entry.frame = parse_csv(entry.content)
+            return entry.frame
+
+    def scan(self, url: str) -> pl.LazyFrame:
+        """Lazily scan the cached sheet body, downloading only when it changed"""
+        if not self.enabled:
+            return self.fetcher.scan(url)
+
+        key = to_export_url(url)
+        with self._sheet_lock(key):
+            return scan_csv(self._get_entry(key, url).content)
+
+    def _get_entry(self, key: str, url: str) -> CachedSheet:
+        """Get a current entry for the sheet, revalidating it once the TTL has passed (sheet lock held)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None and time.monotonic() - entry.checked_at < self.ttl_seconds:
+            return self._hit(entry, "fresh")
+
+        download = self.fetcher.fetch(
+            url,
+            etag=entry.etag if entry else None,
+            last_modified=entry.last_modified if entry else None
+        )
+        if entry is not None and download.not_modified:
+            entry.checked_at = time.monotonic()
+            return self._hit(entry, "not_modified")
+        if download.content is None:
+            raise SheetFetchError(f"No content downloaded for {url}")
+
+        content_hash = hashlib.sha256(download.content).hexdigest()
+        if entry is not None and entry.content_hash == content_hash:
+            entry.etag, entry.last_modified = download.etag, download.last_modified
+            entry.checked_at = time.monotonic()
+            return self._hit(entry, "unchanged")
+
+        fresh_entry = CachedSheet(
+            content=download.content,
+            content_hash=content_hash,
+            etag=download.etag,
+            last_modified=download.last_modified,
+            checked_at=time.monotonic()
+        )
+        if entry is not None:
+            fresh_entry.stats = entry.stats
+        if self.store is not None:
+            self._snapshot(url, fresh_entry)
+        self._store(key, fresh_entry)
+        return self._hit(fresh_entry, "miss")
+
+    def _snapshot(self, url: str, entry: CachedSheet) -> None:
+        """Queue a changed body for the snapshot store"""
+        key = to_export_url(url)
+        with self._lock:
+            queued = key in self._pending_snapshots
+            self._pending_snapshots[key] = (url, entry.content)
+            if queued:
+                return
+            if self._snapshot_executor is None:
+                self._snapshot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheet-snapshot")
+            executor = self._snapshot_executor
+        executor.submit(self._persist_snapshot, key)
+
+    def _persist_snapshot(self, key: str) -> None:
+        """Parse the newest queued body of a tab and save it to the store (snapshot thread)"""
+        with self._lock:
+            url, content = self._pending_snapshots.pop(key)
+        if self.store is None:
+            return
+        try:
+            self.store.save(url, parse_csv(content))
+        except Exception as e:
+            logger.error(f"❌ Error saving sheet snapshot: {str(e)}")
+
+    def flush_snapshots(self) -> None:
+        """Wait until every queued snapshot is saved (tests and shutdown)"""
+        with self._lock:
+            executor = self._snapshot_executor
+        if executor is not None:
+            # The single snapshot thread runs saves in order, so a no-op finishing means all earlier ones did
+            executor.submit(lambda: None).result()
+
+    def _hit(self, entry: CachedSheet, result: str) -> CachedSheet:
+        """Count a lookup result and return the entry"""
+        with self._lock:
+            entry.stats[result] += 1
+        SHEET_CACHE_RESULTS.labels(result=result).inc()
+        if result != "miss":
+            logger.info(f"💾 Sheet cache {result.replace('_', ' ')}, reusing downloaded sheet")
+        return entry
+
+    def _store(self, key: str, entry: CachedSheet) -> None:
+        """Insert an entry, evicting the least recently used sheet"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_sheets:
+                evicted, _ = self._entries.popitem(last=False)
+                self._sheet_locks.pop(evicted, None)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Drop one sheet, or every sheet when no URL is given"""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(to_export_url(url), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-sheet hit statistics"""
+        now = time.monotonic()
+        with self._lock:
+            sheets = {
+                key: {
+                    **entry.stats,
+                    "hits": entry.stats["fresh"] + entry.stats["not_modified"] + entry.stats["unchanged"],
+                    "bytes": len(entry.content),
+                    "parsed": entry.frame is not None,
+                    "age_seconds": round(now - entry.checked_at, 1),
+                    "validator": "etag" if entry.etag else "last_modified" if entry.last_modified else "content_hash"
+                }
+                for key, entry in self._entries.items()
+            }
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl_seconds,
+                "pending_snapshots": len(self._pending_snapshots),
+                "sheets": sheets
+            }
+
+# Global sheet cache shared by the agent tool and the scheduler
+sheet_cache = SheetCache(
+    fetcher=sheet_fetcher,
+    ttl_seconds=config.sheet_cache.ttl_seconds,
+    max_sheets=config.sheet_cache.max_sheets,
+    enabled=config.sheet_cache.enabled,
+    store=sheet_store if config.sheet_store.enabled else None
+)
@@ -0,0 +1,169 @@
+# ==========================================
+# src/sheets/sheet_fetcher.py
+# Shared Google Sheets Fetcher
+# ==========================================
+
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import polars as pl
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config.settings import config
+from src.monitoring.metrics import SHEET_FETCH_BYTES, SHEET_FETCH_DURATION, SHEET_FETCH_RETRIES
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+SHEET_ID_PATTERN = re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)")
+GID_PATTERN = re.compile(r"gid=(\d+)")
+
+# Transient statuses worth retrying; everything else fails fast
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class SheetFetchError(Exception):
+    """Raised when a sheet cannot be downloaded after all retries"""
+
+@dataclass
+class SheetDownload:
+    """Result of a (possibly conditional) sheet download"""
+    content: Optional[bytes]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+def to_export_url(url: str) -> str:
+    """Convert a Google Sheets URL to its CSV export URL, keeping the tab (gid)"""
+    match = SHEET_ID_PATTERN.search(url)
+    if "docs.google.com/spreadsheets" not in url or not match:
+        return url
+
+    parsed = urlparse(url)
+    gid = parse_qs(parsed.query).get("gid", [None])[0]
+    if gid is None:
+        fragment_gid = GID_PATTERN.search(parsed.fragment)
+        gid = fragment_gid.group(1) if fragment_gid else None
+
+    export_url = f"https://docs.google.com/spreadsheets/d/{match.group(1)}/export?format=csv"
+    return f"{export_url}&gid={gid}" if gid else export_url
+
+def tab_url(url: str, gid: str) -> str:
+    """CSV export URL of one tab of a Google Sheet"""
+    export_url = to_export_url(url)
+    if not SHEET_ID_PATTERN.search(export_url):
+        raise ValueError(f"Tabs are only supported for Google Sheets URLs: {url}")
+    return f"{export_url.split('&gid=')[0]}&gid={gid}"
+
+def parse_csv(content: bytes) -> pl.DataFrame:
+    """Parse a CSV export into a DataFrame (reads the body in place, no BytesIO copy)"""
+    return pl.read_csv(content, encoding="utf8")
+
+def scan_csv(content: bytes) -> pl.LazyFrame:
+    """Lazily scan a CSV export so filters and column selections are pushed into the reader"""
+    return pl.scan_csv(content, encoding="utf8")
+
+class SheetFetcher:
+    """Downloads sheet CSV exports over one pooled keep-alive session with timeouts and jittered retries"""
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 30.0, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0, pool_size: int = 10,
+                 session: Optional[requests.Session] = None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = session or self._build_session(pool_size)
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        """Create a session whose connection pool is shared by all threads"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> SheetDownload:
+        """Download the CSV export of a sheet, conditionally when validators are given"""
+        csv_url = to_export_url(url)
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(csv_url, headers=headers,
+                                            timeout=(self.connect_timeout, self.read_timeout))
+                if response.status_code == 304:
+                    SHEET_FETCH_DURATION.labels(status="not_modified").observe(time.perf_counter() - start)
+                    return SheetDownload(content=None, etag=etag, last_modified=last_modified, not_modified=True)
+                if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                    reason = str(response.status_code)
+                else:
+                    response.raise_for_status()
+                    content = response.content
+                    SHEET_FETCH_DURATION.labels(status="success").observe(time.perf_counter() - start)
+                    SHEET_FETCH_BYTES.inc(len(content))
+                    return SheetDownload(
+                        content=content,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified")
+                    )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.max_retries:
+                    SHEET_FETCH_DURATION.labels(status="error").observe(time.perf_counter() - start)
+                    raise SheetFetchError(f"Failed to fetch {csv_url} after {attempt + 1} attempts: {str(e)}") from e
+                reason = type(e).__name__
+            except requests.exceptions.RequestException as e:
+                SHEET_FETCH_DURATION.labels(status="error").observe(time.perf_counter() - start)
+                raise SheetFetchError(f"Failed to fetch {csv_url}: {str(e)}") from e
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            SHEET_FETCH_RETRIES.labels(reason=reason).inc()
+            logger.warning(f"⚠️ Sheet fetch failed ({reason}), retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+
+    def fetch_bytes(self, url: str) -> bytes:
+        """Download the CSV export of a sheet"""
+        download = self.fetch(url)
+        # Only conditional requests can come back without content
+        if download.content is None:
+            raise SheetFetchError(f"No content downloaded for {url}")
+        return download.content
+
+    def fetch_frame(self, url: str) -> pl.DataFrame:
+        """Download and parse a sheet into a DataFrame"""
+        return parse_csv(self.fetch_bytes(url))
+
+    def scan(self, url: str) -> pl.LazyFrame:
+        """Download a sheet and scan it lazily"""
+        return scan_csv(self.fetch_bytes(url))
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self.session.close()
+
+# Global fetcher shared by the agent tool and the scheduler
+sheet_fetcher = SheetFetcher(
+    connect_timeout=config.sheet_fetch.connect_timeout,
+    read_timeout=config.sheet_fetch.read_timeout,
+    max_retries=config.sheet_fetch.max_retries,
+    backoff_base=config.sheet_fetch.backoff_base,
+    backoff_max=config.sheet_fetch.backoff_max,
+    pool_size=config.sheet_fetch.pool_size
+)
@@ -0,0 +1,173 @@
+# ==========================================
+# src/sheets/sheet_store.py
+# On-Disk Sheet Snapshot Store (Arrow IPC) with Row Diffing
+# ==========================================
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import polars as pl
+
+from src.config.settings import config
+from src.sheets.rows import select_latest_entry
+from src.sheets.schema import TAB_COLUMN, SchemaProfiles, schema_profiles
+from src.sheets.sheet_fetcher import GID_PATTERN, SHEET_ID_PATTERN, tab_url, to_export_url
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+SNAPSHOT_SUFFIX = ".arrow"
+
+@dataclass
+class SnapshotDiff:
+    """Rows of a fetch that are new or changed since the previous snapshot"""
+    sheet_key: str
+    path: Optional[str]
+    rows: int
+    changed: pl.DataFrame
+    removed: int
+    written: bool
+
+def sheet_key(url: str) -> str:
+    """Directory name for a sheet tab: `<sheet id>-<gid>`, or a URL hash for other sources"""
+    export_url = to_export_url(url)
+    match = SHEET_ID_PATTERN.search(export_url)
+    if match is None:
+        return hashlib.sha256(export_url.encode("utf-8")).hexdigest()[:16]
+    gid = GID_PATTERN.search(export_url)
+    return f"{match.group(1)}-{gid.group(1) if gid else 0}"
+
+def _row_hashes(df: pl.DataFrame) -> pl.Series:
+    """Per-row hash over the text form of every cell, so re-inferred dtypes compare equal"""
+    return df.select(pl.all().cast(pl.Utf8)).hash_rows()
+
+class SheetStore:
+    """Keeps every changed fetch as an uncompressed Arrow IPC file (memory-mapped on read) per sheet tab"""
+
+    def __init__(self, directory: str, max_snapshots: int = 30, enabled: bool = True,
+                 profiles: Optional[SchemaProfiles] = None):
+        self.directory = directory
+        self.max_snapshots = max(1, max_snapshots)
+        self.enabled = enabled
+        self.profiles = profiles or schema_profiles
+
+        self._lock = threading.Lock()
+        self._last_diffs: Dict[str, Dict[str, Any]] = {}
+
+    def _sheet_dir(self, url: str) -> str:
+        """Snapshot folder of a sheet tab"""
+        return os.path.join(self.directory, sheet_key(url))
+
+    def list_snapshots(self, url: str) -> List[str]:
+        """Snapshot paths of a sheet tab, oldest first"""
+        sheet_dir = self._sheet_dir(url)
+        if not self.enabled or not os.path.isdir(sheet_dir):
+            return []
+        names = sorted(name for name in os.listdir(sheet_dir) if name.endswith(SNAPSHOT_SUFFIX))
+        return [os.path.join(sheet_dir, name) for name in names]
+
+    def latest(self, url: str) -> Optional[pl.DataFrame]:
+        """Most recent snapshot of the sheet, read without a network fetch"""
+        snapshots = self.list_snapshots(url)
+        return pl.read_ipc(snapshots[-1]) if snapshots else None
+
+    def scan_latest(self, url: str, tabs: Optional[Dict[str, str]] = None) -> Optional[pl.LazyFrame]:
+        """Most recent snapshot as a lazy scan, so filters are applied while reading
+
+        With tabs, each tab's own snapshot (keyed by its gid) is merged and labelled like a live multi-tab read.
+        """
+        if tabs:
+            tab_scans = {name: self.scan_latest(tab_url(url, gid)) for name, gid in tabs.items()}
+            labelled = [scan.with_columns(pl.lit(name).alias(TAB_COLUMN)) for name, scan in tab_scans.items()
+                        if scan is not None]
+            return pl.concat(labelled, how="diagonal_relaxed") if labelled else None
+        snapshots = self.list_snapshots(url)
+        return pl.scan_ipc(snapshots[-1]) if snapshots else None
+
+    def latest_entry(self, url: str, tabs: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Latest non-empty row of the most recent snapshot (of every given tab)"""
+        if tabs:
+            scan = self.scan_latest(url, tabs)
+            df = scan.collect() if scan is not None else None
+        else:
+            df = self.latest(url)
+        if df is None or df.is_empty():
+            return None
+        return select_latest_entry(df, profile=self.profiles.profile_frame(url, df))
+
+    def save(self, url: str, df: pl.DataFrame) -> SnapshotDiff:
+        """Diff a fetched sheet against the last snapshot and persist it when anything changed"""
+        key = sheet_key(url)
+        with self._lock:
+            previous = self.latest(url)
+            hashes = _row_hashes(df)
+            if previous is not None and previous.columns == df.columns:
+                previous_hashes = _row_hashes(previous)
+                changed = df.filter(~hashes.is_in(previous_hashes.implode()))
+                removed = int((~previous_hashes.is_in(hashes.implode())).sum())
+            else:
+                changed, removed = df, previous.height if previous is not None else 0
+
+            path = None
+            written = previous is None or not changed.is_empty() or removed > 0
+            if written:
+                path = self._write(url, df)
+                self._prune(url)
+
+            self._last_diffs[key] = {
+                "rows": df.height,
+                "changed": changed.height,
+                "removed": removed,
+                "written": written,
+                "at": datetime.now().isoformat()
+            }
+
+        if written:
+            logger.info(f"🗂️ Sheet snapshot saved: {changed.height} new/changed rows, {removed} removed ({key})")
+        return SnapshotDiff(sheet_key=key, path=path, rows=df.height, changed=changed, removed=removed,
+                            written=written)
+
+    def _write(self, url: str, df: pl.DataFrame) -> str:
+        """Write a timestamped snapshot atomically (temp file, then rename)"""
+        sheet_dir = self._sheet_dir(url)
+        os.makedirs(sheet_dir, exist_ok=True)
+        path = os.path.join(sheet_dir, datetime.now().strftime("%Y%m%dT%H%M%S%f") + SNAPSHOT_SUFFIX)
+        temp_path = path + ".tmp"
+        df.write_ipc(temp_path, compression="uncompressed")
+        os.replace(temp_path, path)
+        return path
+
+    def _prune(self, url: str) -> None:
+        """Keep only the newest `max_snapshots` files of a sheet tab"""
+        for path in self.list_snapshots(url)[:-self.max_snapshots]:
+            os.remove(path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot counts and the last diff per sheet tab"""
+        with self._lock:
+            sheets = {}
+            if os.path.isdir(self.directory):
+                for key in sorted(os.listdir(self.directory)):
+                    sheet_dir = os.path.join(self.directory, key)
+                    snapshots = sorted(name for name in os.listdir(sheet_dir) if name.endswith(SNAPSHOT_SUFFIX))
+                    sheets[key] = {
+                        "snapshots": len(snapshots),
+                        "latest": snapshots[-1] if snapshots else None,
+                        "last_diff": self._last_diffs.get(key)
+                    }
+            return {
+                "enabled": self.enabled,
+                "directory": self.directory,
+                "sheets": sheets
+            }
+
+# Global snapshot store on the scheduler data volume
+sheet_store = SheetStore(
+    directory=config.sheet_store.directory,
+    max_snapshots=config.sheet_store.max_snapshots,
+    enabled=config.sheet_store.enabled
+)
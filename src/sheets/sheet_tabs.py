@@ -0,0 +1,60 @@
+# ==========================================
+# src/sheets/sheet_tabs.py
+# Multi-Tab Sheets Fetched in Parallel
+# ==========================================
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Union
+
+import polars as pl
+
+from src.config.settings import config
+from src.sheets.schema import TAB_COLUMN
+from src.sheets.sheet_cache import SheetCache, sheet_cache
+from src.sheets.sheet_fetcher import tab_url
+from src.logs.logger import Logger
+
+logger = Logger(__name__)
+
+def normalize_tabs(tabs: Union[Dict[str, Any], List[Any], None]) -> Dict[str, str]:
+    """Tab name -> gid; a plain list of gids uses each gid as its name"""
+    if not tabs:
+        return {}
+    if isinstance(tabs, dict):
+        return {str(name): str(gid) for name, gid in tabs.items()}
+    return {str(gid): str(gid) for gid in tabs}
+
+class SheetTabs:
+    """Downloads the configured tabs of a sheet concurrently over the shared session and merges them"""
+
+    def __init__(self, sheets: SheetCache, max_workers: int = 10):
+        self.sheets = sheets
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="sheet-tab")
+
+    def fetch_frame(self, url: str, tabs: Dict[str, str]) -> pl.DataFrame:
+        """All tabs as one frame, each row labelled with its tab"""
+        frames = self._read_tabs(self.sheets.fetch_frame, url, tabs)
+        return pl.concat(
+            [frame.with_columns(pl.lit(name).alias(TAB_COLUMN)) for name, frame in frames.items()],
+            how="diagonal_relaxed"
+        )
+
+    def scan(self, url: str, tabs: Dict[str, str]) -> pl.LazyFrame:
+        """All tabs as one lazy scan (downloads happen now, in parallel; parsing is deferred)"""
+        scans = self._read_tabs(self.sheets.scan, url, tabs)
+        return pl.concat(
+            [scan.with_columns(pl.lit(name).alias(TAB_COLUMN)) for name, scan in scans.items()],
+            how="diagonal_relaxed"
+        )
+
+    def _read_tabs(self, read: Callable[[str], Any], url: str, tabs: Dict[str, str]) -> Dict[str, Any]:
+        """Read every tab on the worker pool, keeping the configured tab order"""
+        if not tabs:
+            raise ValueError("No tabs configured")
+        futures = {name: self._executor.submit(read, tab_url(url, gid)) for name, gid in tabs.items()}
+        results = {name: future.result() for name, future in futures.items()}
+        logger.info(f"📑 Read {len(results)} tabs of the sheet")
+        return results
+
+# Global multi-tab reader, as wide as the fetcher's connection pool
+sheet_tab_reader = SheetTabs(sheet_cache, max_workers=config.sheet_fetch.pool_size)
@@ -0,0 +1,72 @@
+# ==========================================
+# src/sheets/snapshot.py
+# Sheet Row Snapshot shared across one report run
+# ==========================================
+
+import contextvars
+import hashlib
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+import polars as pl
+
+from src.sheets.sheet_fetcher import to_export_url
+
+@dataclass(frozen=True)
+class SheetSnapshot:
+    """Already-fetched sheet row, kept as a one-row Polars (Arrow) frame"""
+    sheet_url: str
+    frame: pl.DataFrame
+    fetched_at: datetime = field(default_factory=datetime.now)
+    # Read from the on-disk snapshot store because the sheet was unreachable
+    stale: bool = False
+
+    @classmethod
+    def from_row(cls, sheet_url: str, row: Dict[str, Any]) -> "SheetSnapshot":
+        """Snapshot of a row that was already read as a dictionary (a `stale` flag is taken off the row)"""
+        row = dict(row)
+        stale = bool(row.pop("stale", False))
+        return cls(sheet_url=sheet_url, frame=pl.DataFrame([row]), stale=stale)
+
+    def row(self) -> Dict[str, Any]:
+        """The snapshot row as a dictionary (converted only at the prompt boundary)"""
+        return self.frame.row(0, named=True)
+
+    def entry(self) -> Dict[str, Any]:
+        """The row as returned to callers, flagged `stale` when it came from the snapshot store"""
+        return {**self.row(), "stale": True} if self.stale else self.row()
+
+    def content_hash(self) -> str:
+        """Hash of the row content, to tell whether it changed since it was last reported"""
+        payload = json.dumps(self.row(), sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def matches(self, url: str) -> bool:
+        """Whether the snapshot was taken from the given sheet (and tab)"""
+        return to_export_url(url) == to_export_url(self.sheet_url)
+
+def report_variant(mode: str, additional_context: str = "") -> str:
+    """Key of how a report was generated (mode and extra context), so reuse never crosses requests that differ"""
+    payload = json.dumps([mode, additional_context or ""], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+_current_snapshot: contextvars.ContextVar[Optional[SheetSnapshot]] = contextvars.ContextVar(
+    "current_sheet_snapshot", default=None
+)
+
+@contextmanager
+def use_snapshot(snapshot: Optional[SheetSnapshot]) -> Iterator[None]:
+    """Let sheet reads in this run be served from the snapshot instead of the network"""
+    token = _current_snapshot.set(snapshot)
+    try:
+        yield
+    finally:
+        _current_snapshot.reset(token)
+
+def current_snapshot(url: str) -> Optional[SheetSnapshot]:
+    """Get the active snapshot for the given sheet, if any"""
+    snapshot = _current_snapshot.get()
+    return snapshot if snapshot is not None and snapshot.matches(url) else None
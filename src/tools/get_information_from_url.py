@@ -3,10 +3,15 @@
 # Refactored URL Data Fetching Tool
 # ==========================================
 
-import requests
 import polars as pl
-from io import BytesIO
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from src.sheets.sheet_cache import SheetCache, sheet_cache
+from src.sheets.sheet_fetcher import sheet_fetcher
+from src.sheets.sheet_store import SheetStore, sheet_store
+from src.sheets.sheet_tabs import SheetTabs, normalize_tabs, sheet_tab_reader
+from src.sheets.rows import select_latest_entry
+from src.sheets.schema import SchemaProfiles, schema_profiles
+from src.sheets.snapshot import current_snapshot
 from src.tools.base_tool import SimpleBaseTool
 from src.logs.logger import Logger
 
@@ -15,61 +20,74 @@ logger = Logger(__name__)
 class GetInformationFromURLTool(SimpleBaseTool):
     """Tool for fetching data from Google Sheets URLs"""
 
-    def __init__(self):
+    def __init__(self, sheets: Optional[SheetCache] = None, profiles: Optional[SchemaProfiles] = None,
+                 store: Optional[SheetStore] = None, sheet_tabs: Optional[SheetTabs] = None):
         super().__init__(
             name="get_information_from_url",
             description="Get data from Google Sheets URL and return the latest entry by date"
         )
+        self.sheets = sheets or sheet_cache
+        self.profiles = profiles or schema_profiles
+        self.store = store or sheet_store
+        self.sheet_tabs = sheet_tabs or sheet_tab_reader
 
     def execute(self, **kwargs) -> Dict[str, Any]:
         """Execute the tool to fetch data from URL"""
         url = kwargs.get('url')
+        tabs = normalize_tabs(kwargs.get('tabs'))
         if not url:
             return {"error": "URL parameter is required"}
 
+        # The scheduler already fetched this sheet for the current run
+        snapshot = current_snapshot(url)
+        if snapshot is not None:
+            self.logger.info("📸 Using the sheet snapshot from the current run")
+            return snapshot.entry()
+
         try:
             self.logger.info(f"Fetching data from: {url}")
 
-            # Convert Google Sheets URL to CSV export URL
-            if "docs.google.com/spreadsheets" in url:
-                sheet_id = url.split("/")[-2] if "/edit" in url else url.split("/")[-1]
-                csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-            else:
-                csv_url = url
-
-            # Fetch data
-            response = requests.get(csv_url)
-            response.raise_for_status()
-
-            # Parse CSV and get latest entry
-            df = pl.read_csv(BytesIO(response.content), encoding="utf8")
+            # Fetch and parse the CSV export (reused while unchanged), then get the latest entry
+            try:
+                # Several tabs are fetched in parallel and merged, each row labelled with its tab
+                df = self.sheet_tabs.fetch_frame(url, tabs) if tabs else self.sheets.fetch_frame(url)
+            except Exception as e:
+                return self._stored_entry(url, tabs, e)
 
             if df.is_empty():
                 return {"error": "No data found in the sheet"}
 
-            # Sort by date and get the latest entry
-            if 'Date' in df.columns:
-                df_formatted = df.with_columns(
-                    pl.col('Date').str.to_datetime().dt.date().alias('date_formatted')
-                ).sort(by='date_formatted', descending=True)
-
-                # Get the latest non-empty entry
-                for row in df_formatted.iter_rows():
-                    if any(cell for cell in row[1:] if cell):  # Skip date column, check if any other field has data
-                        latest_entry = df.filter(pl.col('Date') == row[0]).to_dicts()[0]
-                        self.logger.info("✅ Latest data entry retrieved successfully")
-                        return latest_entry
-
-            # Fallback: return first row if no date column or no valid entries
-            latest_entry = df.to_dicts()[0] if not df.is_empty() else {}
-            self.logger.info("✅ Data retrieved successfully (fallback)")
-            return latest_entry
+            return self._latest_entry(url, df)
 
         except Exception as e:
             error_msg = f"Error fetching data from URL: {str(e)}"
             self.logger.error(error_msg)
             return {"error": error_msg}
 
+    def _stored_entry(self, url: str, tabs: Optional[Dict[str, str]], error: Exception) -> Dict[str, Any]:
+        """Sheet unreachable: answer from the last snapshot on disk (of the same tabs), flagged stale"""
+        stored_entry = self.store.latest_entry(url, tabs)
+        if stored_entry is None:
+            raise error
+        self.logger.warning(f"⚠️ Sheet fetch failed, using the last stored snapshot: {str(error)}")
+        return {**stored_entry, "stale": True}
+
+    def _latest_entry(self, url: str, df: pl.DataFrame) -> Dict[str, Any]:
+        """Latest non-empty entry by date, parsed with the sheet's cached date format (else the first row)"""
+        try:
+            latest_entry = select_latest_entry(df, profile=self.profiles.profile_frame(url, df))
+        except pl.exceptions.PolarsError as e:
+            self.logger.warning(f"⚠️ Sheet dates no longer match the cached format, re-detecting: {str(e)}")
+            self.profiles.invalidate(url)
+            latest_entry = select_latest_entry(df)
+        if latest_entry is not None:
+            self.logger.info("✅ Latest data entry retrieved successfully")
+            return latest_entry
+
+        # Fallback: return first row if no date column or no valid entries
+        self.logger.info("✅ Data retrieved successfully (fallback)")
+        return df.row(0, named=True)
+
     def get_schema(self) -> Dict[str, Any]:
         """Get the tool's input schema"""
         return {
@@ -78,6 +96,10 @@ class GetInformationFromURLTool(SimpleBaseTool):
                 "url": {
                     "type": "string",
                     "description": "The Google Sheets URL to fetch data from"
+                },
+                "tabs": {
+                    "type": "object",
+                    "description": "Optional tab name -> gid mapping; the tabs are merged and searched together"
                 }
             },
             "required": ["url"]
@@ -89,9 +111,7 @@ class GetInformationFromURLTool(SimpleBaseTool):
 def get_information_from_url_impl(url: str) -> str:
     """Legacy implementation - returns raw CSV content"""
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.content.decode('utf-8')
+        return sheet_fetcher.fetch_bytes(url).decode('utf-8')
     except Exception as e:
         logger.error(f"Error fetching data: {str(e)}")
         raise e
@@ -3,14 +3,28 @@
 # Slack Message Sending Tool
 # ==========================================
 
+import contextvars
 import requests
-from typing import Dict, Any
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+from src.monitoring.metrics import SLACK_REQUEST_DURATION, observe_slack_error
 from src.tools.base_tool import SimpleBaseTool
 from src.config.settings import config
 from src.logs.logger import Logger
 
 logger = Logger(__name__)
 
+_slack_target: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("slack_target", default=None)
+
+@contextmanager
+def use_slack_target(target: Optional[str]) -> Iterator[None]:
+    """Send messages in this run to the given user/channel instead of the configured default"""
+    token = _slack_target.set(target)
+    try:
+        yield
+    finally:
+        _slack_target.reset(token)
+
 class SendSlackMessageTool(SimpleBaseTool):
     """Tool for sending messages to Slack"""
     
@@ -25,7 +39,8 @@ class SendSlackMessageTool(SimpleBaseTool):
         try:
             # Extract parameters
             message = kwargs.get('message', '')
-            target_id = kwargs.get('user_id') or kwargs.get('channel_id') or config.slack.channel_id or config.slack.user_id
+            target_id = (kwargs.get('user_id') or kwargs.get('channel_id') or _slack_target.get() or
+                         config.slack.channel_id or config.slack.user_id)
 
             if not message:
                 return {"error": "Message parameter is required"}
@@ -111,7 +126,8 @@ class SendSlackMessageTool(SimpleBaseTool):
             self.logger.info(f"🔍 Payload: {payload}")
 
             # Send request
-            response = requests.post(url, json=payload, headers=headers)
+            with SLACK_REQUEST_DURATION.labels(method="chat.postMessage").time():
+                response = requests.post(url, json=payload, headers=headers, timeout=self._request_timeout())
             response.raise_for_status()
 
             result = response.json()
@@ -124,14 +140,17 @@ class SendSlackMessageTool(SimpleBaseTool):
                     "timestamp": result.get("ts")
                 }
             else:
+                observe_slack_error("chat.postMessage", result.get("error", "unknown"))
                 return {
                     "success": False,
                     "error": result.get("error", "Unknown Slack API error")
                 }
 
         except requests.exceptions.RequestException as e:
+            observe_slack_error("chat.postMessage", "http_error")
             return {"success": False, "error": f"HTTP request failed: {str(e)}"}
         except Exception as e:
+            observe_slack_error("chat.postMessage", "unexpected")
             return {"success": False, "error": f"Unexpected error: {str(e)}"}
 
     def _open_dm_channel(self, user_id: str) -> Dict[str, Any]:
@@ -147,7 +166,8 @@ class SendSlackMessageTool(SimpleBaseTool):
                 "users": user_id
             }
 
-            response = requests.post(url, json=payload, headers=headers)
+            with SLACK_REQUEST_DURATION.labels(method="conversations.open").time():
+                response = requests.post(url, json=payload, headers=headers, timeout=self._request_timeout())
             response.raise_for_status()
 
             result = response.json()
@@ -159,6 +179,7 @@ class SendSlackMessageTool(SimpleBaseTool):
                 }
             else:
                 # Fallback: try using user_id directly
+                observe_slack_error("conversations.open", result.get("error", "unknown"))
                 self.logger.warning(f"⚠️ Failed to open DM channel: {result.get('error')}, trying direct user ID")
                 return {
                     "success": True,
@@ -167,12 +188,19 @@ class SendSlackMessageTool(SimpleBaseTool):
 
         except Exception as e:
             # Fallback: use user_id directly
+            observe_slack_error("conversations.open", "http_error")
             self.logger.warning(f"⚠️ Error opening DM channel: {str(e)}, using direct user ID")
             return {
                 "success": True,
                 "channel_id": user_id
             }
     
+    @staticmethod
+    def _request_timeout() -> float:
+        """HTTP timeout per Slack call; a DM send makes two calls, so each gets at most half the slack sink's budget"""
+        sink_timeout = config.sinks.timeouts.get("slack", config.sinks.timeout)
+        return min(config.slack.request_timeout, sink_timeout / 2)
+
     def _format_report_message(self, message: str) -> str:
         """Format the report message for Slack"""
         # Add header
@@ -195,7 +223,7 @@ class SendSlackMessageTool(SimpleBaseTool):
                 "Content-Type": "application/json"
             }
 
-            response = requests.post(url, headers=headers)
+            response = requests.post(url, headers=headers, timeout=self._request_timeout())
             result = response.json()
 
             if result.get("ok"):
@@ -7,6 +7,7 @@ from typing import Dict, List
 from src.tools.get_information_from_url import GetInformationFromURLTool
 from src.tools.save_chat_history_DB import SaveChatHistoryTool
 from src.tools.send_slack_message import SendSlackMessageTool
+from src.monitoring.metrics import instrument_tool
 from src.logs.logger import Logger
 
 logger = Logger(__name__)
@@ -32,7 +33,7 @@ class ToolRegistry:
     
     def register_tool(self, tool) -> None:
         """Register a tool"""
-        self._tools[tool.name] = tool
+        self._tools[tool.name] = instrument_tool(tool)
         logger.info(f"✅ Tool '{tool.name}' registered")
     
     def get_tool(self, name: str):
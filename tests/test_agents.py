@@ -3,9 +3,21 @@
 # Agent Tests
 # ==========================================
 
+import asyncio
+import threading
+import time
+import polars as pl
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from src.agents.agent_report import AgentReporter
+from src.agents.report_pipeline import ReportPipeline
+from src.agents.report_sinks import ReportPayload, ReportSink, SinkDispatcher, mongo_sink, slack_sink
+from src.llms.translation_memo import TranslationMemo
+from src.agents.agent_pool import AgentPool, AgentPoolTimeoutError
+from src.agents.agent_runner import AgentRunner, AgentRunnerBusyError
+from src.agents.instrumentation import AgentRunRecorder, AgentMetrics
+from src.sheets.snapshot import SheetSnapshot
+from src.tools.send_slack_message import _slack_target, use_slack_target
 from src.core.interfaces import AgentContext
 
 class TestAgentReporter:
@@ -54,6 +66,10 @@ class TestAgentReporter:
         assert result["success"] == True
         assert "Test report generated" in result["output"]
         assert result["agent"] == "ReportAgent"
+        assert result["timings"]["llm_calls"] == 0
+        
+        callbacks = mock_executor.invoke.call_args.kwargs["config"]["callbacks"]
+        assert isinstance(callbacks[0], AgentRunRecorder)
     
     @patch('langchain.agents.create_react_agent')
     def test_process_error(self, mock_create_agent):
@@ -72,6 +88,41 @@ class TestAgentReporter:
         assert "Test error" in result["error"]
         assert result["agent"] == "ReportAgent"
     
+    @patch('langchain.agents.create_react_agent')
+    @patch('src.agents.base_agent.AgentExecutor')
+    def test_executor_cached_between_runs(self, mock_executor_class, mock_create_agent):
+        """Test the agent executor is built once and reused"""
+        mock_executor_class.return_value.invoke.return_value = {"output": "ok"}
+        context = AgentContext(user_input="Test", conversation_history=[], metadata={})
+        
+        self.agent.process(context)
+        self.agent.process(context)
+        
+        assert mock_create_agent.call_count == 1
+        assert mock_executor_class.call_count == 1
+        assert mock_executor_class.return_value.invoke.call_count == 2
+    
+    @patch('langchain.agents.create_react_agent')
+    @patch('src.agents.base_agent.AgentExecutor')
+    def test_executor_invalidated_on_tool_change(self, mock_executor_class, mock_create_agent):
+        """Test adding tools rebuilds the executor and tool strings"""
+        mock_executor = mock_executor_class.return_value
+        mock_executor.invoke.return_value = {"output": "ok"}
+        context = AgentContext(user_input="Test", conversation_history=[], metadata={})
+        
+        self.agent.process(context)
+        
+        new_tool = Mock()
+        new_tool.name = "new_tool"
+        new_tool.description = "A new tool"
+        self.agent.add_tool(new_tool)
+        self.agent.process(context)
+        
+        assert mock_executor_class.call_count == 2
+        agent_input = mock_executor.invoke.call_args[0][0]
+        assert "new_tool" in agent_input["tool_names"]
+        assert "new_tool: A new tool" in agent_input["tools"]
+    
     def test_generate_report(self):
         """Test report generation method"""
         with patch.object(self.agent, 'process') as mock_process:
@@ -90,6 +141,24 @@ class TestAgentReporter:
             assert call_args.sheet_url == "https://test.com"
             assert "Test context" in call_args.user_input
     
+    def test_generate_report_pipeline_mode(self):
+        """Test pipeline mode bypasses the ReAct loop"""
+        mock_pipeline = Mock()
+        mock_pipeline.run.return_value = {"success": True, "output": "Pipeline report"}
+        self.agent._pipeline = mock_pipeline
+        
+        with patch.object(self.agent, 'process') as mock_process:
+            result = self.agent.generate_report(sheet_url="https://test.com", mode="pipeline")
+        
+        assert result["output"] == "Pipeline report"
+        mock_process.assert_not_called()
+        mock_pipeline.run.assert_called_once_with(sheet_url="https://test.com", additional_context="", snapshot=None)
+    
+    def test_generate_report_invalid_mode(self):
+        """Test unknown modes are rejected"""
+        with pytest.raises(ValueError):
+            self.agent.generate_report(sheet_url="https://test.com", mode="unknown")
+    
     def test_run_legacy_method(self):
         """Test legacy run method"""
         with patch.object(self.agent, 'process') as mock_process:
@@ -131,3 +200,386 @@ class TestAgentReporter:
         assert len(self.agent.tools) == initial_count + 2
         for tool in mock_tools:
             assert tool in self.agent.tools
+
+class TestAgentPool:
+    """Test agent pool"""
+    
+    def test_warm_up_creates_all_agents(self):
+        """Test warm up fills the pool"""
+        factory = Mock(side_effect=lambda: Mock())
+        pool = AgentPool(factory=factory, size=3)
+        
+        assert pool.warm_up() == 3
+        assert factory.call_count == 3
+        assert pool.get_stats()["idle"] == 3
+    
+    def test_agents_are_reused(self):
+        """Test checked-in agents are handed out again"""
+        factory = Mock(side_effect=lambda: Mock())
+        pool = AgentPool(factory=factory, size=2)
+        
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+        
+        assert first is second
+        assert factory.call_count == 1
+        assert pool.get_stats()["checkouts"] == 2
+    
+    def test_acquire_timeout(self):
+        """Test acquire fails when all agents are checked out"""
+        pool = AgentPool(factory=Mock, size=1, acquire_timeout=0.01)
+        
+        with pool.acquire():
+            assert pool.get_stats()["utilization"] == 1.0
+            with pytest.raises(AgentPoolTimeoutError):
+                with pool.acquire():
+                    pass
+        
+        stats = pool.get_stats()
+        assert stats["timeouts"] == 1
+        assert stats["in_use"] == 0
+    
+    def test_factory_error_releases_slot(self):
+        """Test a failed agent creation does not consume pool capacity"""
+        factory = Mock(side_effect=[Exception("init failed"), Mock()])
+        pool = AgentPool(factory=factory, size=1)
+        
+        with pytest.raises(Exception, match="init failed"):
+            with pool.acquire():
+                pass
+        
+        with pool.acquire() as agent:
+            assert agent is not None
+        assert pool.get_stats()["created"] == 1
+
+class TestAgentRunner:
+    """Test agent runner"""
+    
+    def setup_method(self):
+        """Setup test method"""
+        self.runner = AgentRunner(workers=1, queue_size=1, retry_after=5)
+    
+    def teardown_method(self):
+        """Cleanup test method"""
+        self.runner.shutdown()
+    
+    def test_run_off_event_loop(self):
+        """Test blocking calls run on a worker thread"""
+        result = asyncio.run(self.runner.run(threading.current_thread))
+        
+        assert result is not threading.main_thread()
+        assert result.name.startswith("agent-run")
+    
+    def test_rejects_when_saturated(self):
+        """Test admission is refused once workers and queue are full"""
+        release = threading.Event()
+        first = self.runner.submit(release.wait)
+        second = self.runner.submit(release.wait)
+        
+        with pytest.raises(AgentRunnerBusyError) as exc_info:
+            self.runner.submit(release.wait)
+        assert exc_info.value.retry_after == 5
+        assert self.runner.get_stats()["rejected"] == 1
+        
+        release.set()
+        first.result(timeout=1)
+        second.result(timeout=1)
+        
+        # Slots are released after completion
+        assert self.runner.submit(lambda: "ok").result(timeout=1) == "ok"
+    
+    def test_errors_propagate(self):
+        """Test exceptions from the call reach the caller"""
+        def fail():
+            raise ValueError("boom")
+        
+        with pytest.raises(ValueError, match="boom"):
+            self.runner.submit(fail).result(timeout=1)
+
+class TestReportPipeline:
+    """Test deterministic report pipeline"""
+    
+    def setup_method(self):
+        """Setup test method"""
+        self.llm_provider = Mock()
+        self.llm_provider.generate.return_value = "📊 Daily Report\nDate: 01/01/2025"
+        
+        self.fetch_tool = Mock()
+        self.fetch_tool.name = "get_information_from_url"
+        self.fetch_tool.execute.return_value = {"Date": "01/01/2025", "Completed": "Việc A"}
+        self.save_tool = Mock()
+        self.save_tool.execute.return_value = {"status": "success", "document_id": "doc1"}
+        self.slack_tool = Mock()
+        self.slack_tool.execute.return_value = {"status": "success"}
+        
+        self.pipeline = ReportPipeline(
+            llm_provider=self.llm_provider,
+            fetch_tool=self.fetch_tool,
+            sinks=SinkDispatcher([
+                mongo_sink(self.save_tool, timeout=1),
+                slack_sink(self.slack_tool, timeout=1)
+            ])
+        )
+    
+    def test_single_llm_call(self):
+        """Test the pipeline calls every tool once and the LLM exactly once"""
+        result = self.pipeline.run(sheet_url="https://test.com")
+        
+        assert result["success"] == True
+        assert result["output"].startswith("📊 Daily Report")
+        assert result["context"]["mode"] == "pipeline"
+        assert result["sinks"]["mongo"]["status"] == "success"
+        assert result["sinks"]["slack"]["status"] == "success"
+        assert self.llm_provider.generate.call_count == 1
+        self.fetch_tool.execute.assert_called_once_with(url="https://test.com")
+        self.slack_tool.execute.assert_called_once_with(message=result["output"])
+        
+        save_kwargs = self.save_tool.execute.call_args.kwargs
+        assert save_kwargs["response"] == result["output"]
+        assert "Việc A" in save_kwargs["conversation_data"]
+    
+    def test_translation_memo_fills_known_cells(self):
+        """Test translated cells are memoized and not sent for translation again"""
+        self.pipeline.memo = TranslationMemo(mongo_enabled=False)
+        self.llm_provider.generate.return_value = (
+            '{"translations": {"Completed": "Task A"}, "report": "📊 Daily Report\\nCompleted:\\n- Task A"}'
+        )
+        
+        first = self.pipeline.run(sheet_url="https://test.com")
+        second = self.pipeline.run(sheet_url="https://test.com")
+        
+        assert first["output"] == "📊 Daily Report\nCompleted:\n- Task A"
+        assert first["context"]["translation_memo"] == {"hits": 0, "misses": 1}
+        assert second["context"]["translation_memo"] == {"hits": 1, "misses": 0}
+        
+        first_input = self.llm_provider.generate.call_args_list[0][0][1]
+        second_input = self.llm_provider.generate.call_args_list[1][0][1]
+        assert "Needs translation:\nCompleted: Việc A" in first_input
+        assert "Already translated:\nCompleted: Task A" in second_input
+        assert "Needs translation" not in second_input
+    
+    def test_timings_attached(self):
+        """Test the pipeline reports fetch, LLM and sink timings"""
+        result = self.pipeline.run(sheet_url="https://test.com")
+        
+        timings = result["timings"]
+        assert timings["llm_calls"] == 1
+        assert timings["tool_calls"] == 2
+        tools = [tool["tool"] for iteration in timings["iterations"] for tool in iteration["tools"]]
+        assert tools == ["get_information_from_url", "sinks"]
+    
+    def test_snapshot_skips_fetch(self):
+        """Test an already-fetched snapshot is used instead of the fetch tool"""
+        snapshot = SheetSnapshot(
+            sheet_url="https://test.com",
+            frame=pl.DataFrame({"Date": ["02/01/2025"], "Completed": ["Việc B"]})
+        )
+        
+        result = self.pipeline.run(sheet_url="https://test.com", snapshot=snapshot)
+        
+        assert result["success"] == True
+        assert result["context"]["data_source"] == "snapshot"
+        self.fetch_tool.execute.assert_not_called()
+        assert "Completed: Việc B" in self.llm_provider.generate.call_args[0][1]
+    
+    def test_fetch_error_stops_pipeline(self):
+        """Test a fetch error fails fast without calling the LLM"""
+        self.fetch_tool.execute.return_value = {"error": "Sheet not found"}
+        
+        result = self.pipeline.run(sheet_url="https://test.com")
+        
+        assert result["success"] == False
+        assert "Sheet not found" in result["error"]
+        self.llm_provider.generate.assert_not_called()
+        self.slack_tool.execute.assert_not_called()
+
+class TestAgentInstrumentation:
+    """Test per-step agent instrumentation"""
+    
+    def _llm_result(self, input_tokens, output_tokens):
+        message = Mock(usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens})
+        return Mock(generations=[[Mock(message=message)]], llm_output=None)
+    
+    def test_recorder_groups_tools_by_iteration(self):
+        """Test tool calls are attached to the LLM call that requested them"""
+        recorder = AgentRunRecorder()
+        
+        recorder.on_chat_model_start({}, [[]], run_id="llm-1")
+        recorder.on_llm_end(self._llm_result(100, 20), run_id="llm-1")
+        recorder.on_tool_start({"name": "get_information_from_url"}, "https://test.com", run_id="tool-1")
+        recorder.on_tool_end({"Date": "01/01/2025"}, run_id="tool-1")
+        recorder.on_chat_model_start({}, [[]], run_id="llm-2")
+        recorder.on_llm_end(self._llm_result(150, 40), run_id="llm-2")
+        recorder.on_tool_start({"name": "send_slack_message"}, "report", run_id="tool-2")
+        recorder.on_tool_error(RuntimeError("slack down"), run_id="tool-2")
+        
+        summary = recorder.summary()
+        assert summary["llm_calls"] == 2
+        assert summary["tool_calls"] == 2
+        assert summary["prompt_tokens"] == 250
+        assert summary["completion_tokens"] == 60
+        assert summary["iterations"][0]["tools"][0]["tool"] == "get_information_from_url"
+        assert summary["iterations"][0]["tools"][0]["input_bytes"] == len("https://test.com")
+        assert summary["iterations"][1]["tools"][0]["error"] == "slack down"
+    
+    def test_metrics_aggregate_runs(self):
+        """Test run summaries are folded into per-tool aggregates"""
+        metrics = AgentMetrics()
+        recorder = AgentRunRecorder()
+        recorder.record_llm(0.5, prompt_tokens=10, completion_tokens=5)
+        recorder.record_tool("save_to_mongodb", 0.2, output_bytes=30)
+        recorder.record_tool("save_to_mongodb", 0.4, error="timeout")
+        
+        metrics.record(recorder.summary(), success=True)
+        metrics.record(recorder.summary(), success=False)
+        stats = metrics.get_stats()
+        
+        assert stats["runs"] == 2
+        assert stats["failures"] == 1
+        assert stats["llm"]["calls"] == 2
+        assert stats["llm"]["prompt_tokens"] == 20
+        assert stats["tools"]["save_to_mongodb"]["calls"] == 4
+        assert stats["tools"]["save_to_mongodb"]["errors"] == 2
+        assert stats["tools"]["save_to_mongodb"]["max_seconds"] == 0.4
+        assert stats["tools"]["save_to_mongodb"]["avg_seconds"] == 0.3
+
+class TestSinkDispatcher:
+    """Test concurrent report sinks"""
+    
+    def setup_method(self):
+        """Setup test method"""
+        self.payload = ReportPayload(report="Report", data={"Date": "01/01/2025"}, user_input="Generate")
+    
+    def _sleeping_sink(self, name, delay, timeout=1.0):
+        """Build a sink that sleeps before succeeding"""
+        def send(payload):
+            time.sleep(delay)
+            return {"status": "success"}
+        return ReportSink(name=name, send=send, timeout=timeout)
+    
+    def test_sinks_run_concurrently(self):
+        """Test total latency is the max of sink latencies, not the sum"""
+        dispatcher = SinkDispatcher([self._sleeping_sink("a", 0.2), self._sleeping_sink("b", 0.2)])
+        
+        start = time.monotonic()
+        results = dispatcher.dispatch(self.payload)
+        elapsed = time.monotonic() - start
+        
+        assert elapsed < 0.35
+        assert results["a"]["status"] == "success"
+        assert results["b"]["status"] == "success"
+    
+    def test_sink_timeout(self):
+        """Test a slow sink is reported as timed out without blocking the others"""
+        dispatcher = SinkDispatcher([
+            self._sleeping_sink("slow", 0.5, timeout=0.05),
+            self._sleeping_sink("fast", 0.0)
+        ])
+        
+        results = dispatcher.dispatch(self.payload)
+        
+        assert results["slow"]["status"] == "timeout"
+        assert results["fast"]["status"] == "success"
+    
+    def test_late_delivery_is_not_duplicated(self):
+        """Test a retry skips a sink whose timed-out send is still running or went out late"""
+        sent, release = [], threading.Event()
+        
+        def send(payload):
+            release.wait(5)
+            sent.append(payload.report)
+            return {"status": "success"}
+        dispatcher = SinkDispatcher([ReportSink(name="slack", send=send, timeout=0.05)])
+        
+        assert dispatcher.dispatch(self.payload)["slack"]["status"] == "timeout"
+        assert dispatcher.dispatch(self.payload)["slack"]["status"] == "skipped"
+        
+        release.set()
+        dispatcher._executor.shutdown(wait=True)
+        assert sent == ["Report"]
+        assert dispatcher.dispatch(self.payload)["slack"]["status"] == "skipped"
+    
+    def test_unstarted_send_is_cancelled(self):
+        """Test a send still queued at its deadline is cancelled and can be retried"""
+        release = threading.Event()
+        busy = ReportSink(name="busy", send=lambda payload: release.wait(5) and {"status": "success"}, timeout=5)
+        dispatcher = SinkDispatcher([busy])
+        # Occupy both of the dispatcher's workers (one sink plus one spare)
+        blockers = [threading.Thread(target=dispatcher.dispatch, args=(ReportPayload(report=report, data={}, user_input="Generate"),))
+                    for report in ("First", "Second")]
+        for blocker in blockers:
+            blocker.start()
+        time.sleep(0.05)
+        
+        calls = []
+        dispatcher.sinks = [ReportSink(name="slack", send=lambda payload: calls.append(1) or {"status": "success"},
+                                       timeout=0.05)]
+        result = dispatcher.dispatch(self.payload)["slack"]
+        release.set()
+        for blocker in blockers:
+            blocker.join()
+        
+        assert result["status"] == "timeout"
+        assert result["cancelled"] is True
+        assert calls == []
+        assert dispatcher.dispatch(self.payload)["slack"]["status"] == "success"
+    
+    def test_abandoned_send_leaves_a_spare_worker(self):
+        """Test a send still running after its timeout does not hold up the next report's send"""
+        release = threading.Event()
+        
+        def send(payload):
+            if payload.report == "Stuck":
+                release.wait(5)
+            return {"status": "success"}
+        dispatcher = SinkDispatcher([ReportSink(name="slack", send=send, timeout=0.05)])
+        
+        assert dispatcher.dispatch(ReportPayload(report="Stuck", data={}, user_input="Generate"))["slack"]["status"] == "timeout"
+        assert dispatcher.dispatch(self.payload)["slack"]["status"] == "success"
+        release.set()
+    
+    def test_sink_errors_are_collected(self):
+        """Test failing and raising sinks are reported per sink"""
+        def raises(payload):
+            raise RuntimeError("Slack down")
+        
+        dispatcher = SinkDispatcher([
+            ReportSink(name="raises", send=raises, timeout=1),
+            ReportSink(name="fails", send=lambda payload: {"status": "error", "message": "DB Error"}, timeout=1)
+        ])
+        
+        results = dispatcher.dispatch(self.payload)
+        
+        assert results["raises"]["status"] == "error"
+        assert results["raises"]["error"] == "Slack down"
+        assert results["fails"]["error"] == "DB Error"
+    
+    def test_slack_request_timeout_fits_the_sink_timeout(self):
+        """Test each Slack HTTP call is bounded so a DM send (two calls) ends within the slack sink timeout"""
+        from src.config.settings import config
+        from src.tools.send_slack_message import SendSlackMessageTool
+        
+        with patch.object(config.slack, "request_timeout", 10), \
+             patch.object(config.sinks, "timeout", 8), patch.object(config.sinks, "timeouts", {}), \
+             patch("src.tools.send_slack_message.requests.post") as post, \
+             patch("src.tools.send_slack_message.config.slack.bot_token", "xoxb-test"):
+            post.return_value.json.return_value = {"ok": True, "channel": {"id": "D1"}}
+            SendSlackMessageTool()._send_slack_message("Report", "U123")
+        
+        assert post.call_count == 2
+        assert all(call.kwargs["timeout"] == 4 for call in post.call_args_list)
+    
+    def test_sinks_see_caller_context(self):
+        """Test sinks run with the caller's Slack target"""
+        seen = []
+        dispatcher = SinkDispatcher([
+            ReportSink(name="slack", send=lambda payload: seen.append(_slack_target.get()) or {"status": "success"},
+                       timeout=1)
+        ])
+        
+        with use_slack_target("C_TEAM"):
+            dispatcher.dispatch(self.payload)
+        
+        assert seen == ["C_TEAM"]
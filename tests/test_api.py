@@ -3,10 +3,16 @@
 # API Tests
 # ==========================================
 
+import asyncio
+import threading
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch
 from main import app
+from src.agents.agent_pool import AgentPool
+from src.agents.agent_runner import AgentRunner, AgentRunnerBusyError
+from src.config.settings import MonitoredSheet
+from src.sheets.snapshot import SheetSnapshot, report_variant
 
 class TestAPI:
     """Test FastAPI endpoints"""
@@ -14,6 +20,23 @@ class TestAPI:
     def setup_method(self):
         """Setup test method"""
         self.client = TestClient(app)
+        
+        # Reports read the sheet row up front; keep these tests off the network
+        self.snapshot_patcher = patch('main.find_report_snapshot', return_value=(None, False))
+        self.find_report_snapshot = self.snapshot_patcher.start()
+    
+    def teardown_method(self):
+        """Teardown test method"""
+        self.snapshot_patcher.stop()
+    
+    def _monitored(self, sheet_url, name="default"):
+        """Make the given URL a monitored sheet for the duration of the block"""
+        return patch('src.scheduler.scheduler_service.SchedulerService.sheet_for_url',
+                     return_value=MonitoredSheet(name=name, sheet_url=sheet_url))
+    
+    def _pool_with(self, agent):
+        """Build a single-agent pool around the given agent"""
+        return AgentPool(factory=lambda: agent, size=1)
     
     def test_health_check(self):
         """Test health check endpoint"""
@@ -36,8 +59,7 @@ class TestAPI:
             response = self.client.get("/health")
             assert response.status_code == 500
     
-    @patch('main.get_agent')
-    def test_generate_report_success(self, mock_get_agent):
+    def test_generate_report_success(self):
         """Test successful report generation"""
         # Mock agent
         mock_agent = Mock()
@@ -47,14 +69,14 @@ class TestAPI:
             "agent": "ReportAgent",
             "context": {"task_type": "report_generation"}
         }
-        mock_get_agent.return_value = mock_agent
         
         request_data = {
             "sheet_url": "https://test.com",
             "additional_context": "Test context"
         }
         
-        response = self.client.post("/report", json=request_data)
+        with patch('main.agent_pool', self._pool_with(mock_agent)):
+            response = self.client.post("/report", json=request_data)
         
         assert response.status_code == 200
         data = response.json()
@@ -62,8 +84,81 @@ class TestAPI:
         assert data["output"] == "Test report generated"
         assert data["agent"] == "ReportAgent"
     
-    @patch('main.get_agent')
-    def test_generate_report_failure(self, mock_get_agent):
+    def test_unchanged_row_returns_stored_report(self):
+        """Test an unchanged row returns the stored report unless forced"""
+        snapshot = SheetSnapshot.from_row("https://test.com", {"Date": "01/01/2025", "Completed": "Task"})
+        self.find_report_snapshot.return_value = (snapshot, True)
+        mock_agent = Mock()
+        mock_agent.generate_report.return_value = {"success": True, "output": "Fresh report", "agent": "ReportAgent"}
+        state = Mock()
+        state.get_report.return_value = {"success": True, "output": "Stored report", "agent": "ReportAgent",
+                                         "reused": True}
+        
+        with patch('main.agent_pool', self._pool_with(mock_agent)), patch('main.state_manager', state), \
+             self._monitored("https://test.com"):
+            reused = self.client.post("/report", json={"sheet_url": "https://test.com"})
+            forced = self.client.post("/report", json={"sheet_url": "https://test.com", "force": True})
+        
+        assert reused.json()["output"] == "Stored report"
+        assert reused.json()["reused"] is True
+        state.get_report.assert_called_once_with("https://test.com", snapshot.content_hash(), sheet="default",
+                                                 variant=report_variant("agent", ""))
+        
+        assert forced.json()["output"] == "Fresh report"
+        assert mock_agent.generate_report.call_args.kwargs["snapshot"] is snapshot
+        state.record_report.assert_called_once()
+    
+    def test_reuse_is_keyed_by_mode_and_context(self):
+        """Test a report is only reused for the same mode and additional context"""
+        snapshot = SheetSnapshot.from_row("https://test.com", {"Date": "01/01/2025", "Completed": "Task"})
+        self.find_report_snapshot.return_value = (snapshot, True)
+        mock_agent = Mock()
+        mock_agent.generate_report.return_value = {"success": True, "output": "Fresh report", "agent": "ReportAgent"}
+        state = Mock()
+        state.get_report.return_value = None
+        
+        with patch('main.agent_pool', self._pool_with(mock_agent)), patch('main.state_manager', state), \
+             self._monitored("https://test.com"):
+            self.client.post("/report", json={"sheet_url": "https://test.com", "additional_context": "Focus on QA"})
+            self.client.post("/report", json={"sheet_url": "https://test.com", "mode": "pipeline"})
+        
+        variants = [call.kwargs["variant"] for call in state.get_report.call_args_list]
+        assert variants == [report_variant("agent", "Focus on QA"), report_variant("pipeline", "")]
+        assert len(set(variants + [report_variant("agent", "")])) == 3
+        assert state.record_report.call_args.kwargs["variant"] == report_variant("pipeline", "")
+    
+    def test_unmonitored_url_is_never_recorded(self):
+        """Test a report for a URL no monitored sheet covers creates no sheet state row"""
+        snapshot = SheetSnapshot.from_row("https://adhoc.com", {"Date": "01/01/2025", "Completed": "Task"})
+        self.find_report_snapshot.return_value = (snapshot, True)
+        mock_agent = Mock()
+        mock_agent.generate_report.return_value = {"success": True, "output": "Report", "agent": "ReportAgent"}
+        state = Mock()
+        
+        with patch('main.agent_pool', self._pool_with(mock_agent)), patch('main.state_manager', state), \
+             patch('src.scheduler.scheduler_service.SchedulerService.sheet_for_url', return_value=None):
+            response = self.client.post("/report", json={"sheet_url": "https://adhoc.com"})
+        
+        assert response.json()["output"] == "Report"
+        state.get_report.assert_not_called()
+        state.record_report.assert_not_called()
+    
+    def test_latest_entry_is_never_reused(self):
+        """Test a row that is not today's report is neither looked up nor recorded"""
+        snapshot = SheetSnapshot.from_row("https://test.com", {"Date": "01/01/2025", "Completed": "Task"})
+        self.find_report_snapshot.return_value = (snapshot, False)
+        mock_agent = Mock()
+        mock_agent.generate_report.return_value = {"success": True, "output": "Fresh report", "agent": "ReportAgent"}
+        state = Mock()
+        
+        with patch('main.agent_pool', self._pool_with(mock_agent)), patch('main.state_manager', state):
+            response = self.client.post("/report", json={"sheet_url": "https://test.com"})
+        
+        assert response.json()["output"] == "Fresh report"
+        state.get_report.assert_not_called()
+        state.record_report.assert_not_called()
+    
+    def test_generate_report_failure(self):
         """Test report generation failure"""
         # Mock agent with failure
         mock_agent = Mock()
@@ -72,31 +167,241 @@ class TestAPI:
             "error": "Test error",
             "agent": "ReportAgent"
         }
-        mock_get_agent.return_value = mock_agent
         
         request_data = {
             "sheet_url": "https://test.com"
         }
         
-        response = self.client.post("/report", json=request_data)
+        with patch('main.agent_pool', self._pool_with(mock_agent)):
+            response = self.client.post("/report", json=request_data)
         
         assert response.status_code == 200
         data = response.json()
         assert data["success"] == False
         assert data["error"] == "Test error"
     
-    @patch('main.get_agent')
-    def test_generate_report_exception(self, mock_get_agent):
+    def test_generate_report_exception(self):
         """Test report generation with exception"""
-        mock_get_agent.side_effect = Exception("Unexpected error")
+        mock_get_agent = Mock(side_effect=Exception("Unexpected error"))
         
         request_data = {
             "sheet_url": "https://test.com"
         }
         
-        response = self.client.post("/report", json=request_data)
+        with patch('main.agent_pool', AgentPool(factory=mock_get_agent, size=1)):
+            response = self.client.post("/report", json=request_data)
         assert response.status_code == 500
     
+    def test_generate_report_pool_exhausted(self):
+        """Test report generation when no pooled agent is available"""
+        pool = AgentPool(factory=Mock, size=1, acquire_timeout=0.01)
+        
+        with patch('main.agent_pool', pool), pool.acquire():
+            response = self.client.post("/report", json={"sheet_url": "https://test.com"})
+        assert response.status_code == 503
+    
+    def test_generate_report_runner_saturated(self):
+        """Test report generation is rejected with 429 when the runner is full"""
+        runner = AgentRunner(workers=1, queue_size=0, retry_after=15)
+        release = threading.Event()
+        runner.submit(release.wait)
+        
+        try:
+            with patch('main.agent_runner', runner):
+                response = self.client.post("/report", json={"sheet_url": "https://test.com"})
+        finally:
+            release.set()
+            runner.shutdown()
+        
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "15"
+    
+    def test_create_report_job(self):
+        """Test report job creation returns a job ID immediately"""
+        with patch('main.report_jobs') as mock_jobs:
+            mock_jobs.submit.return_value = {
+                "job_id": "abc123",
+                "status": "QUEUED",
+                "sheet_url": "https://test.com",
+                "created_at": "2025-01-01T10:00:00"
+            }
+            
+            response = self.client.post("/reports/jobs", json={"sheet_url": "https://test.com"})
+        
+        assert response.status_code == 202
+        data = response.json()
+        assert data["job_id"] == "abc123"
+        assert data["status"] == "QUEUED"
+        assert data["result"] is None
+    
+    def test_get_report_job(self):
+        """Test report job retrieval includes timings and result"""
+        with patch('main.report_jobs') as mock_jobs:
+            mock_jobs.get.return_value = {
+                "job_id": "abc123",
+                "status": "COMPLETED",
+                "sheet_url": "https://test.com",
+                "created_at": "2025-01-01T10:00:00",
+                "started_at": "2025-01-01T10:00:01",
+                "finished_at": "2025-01-01T10:00:31",
+                "timings": {"queue_seconds": 1.0, "run_seconds": 30.0, "total_seconds": 31.0},
+                "result": {"success": True, "output": "Test report", "agent": "ReportAgent"}
+            }
+            
+            response = self.client.get("/reports/jobs/abc123")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["timings"]["run_seconds"] == 30.0
+        assert data["result"]["output"] == "Test report"
+    
+    def test_job_store_runs_off_the_event_loop(self):
+        """Test the blocking job store is called from a worker thread, not the event loop thread"""
+        on_event_loop = []
+        
+        def get(job_id, kind=None):
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            return None
+        
+        with patch('main.report_jobs') as mock_jobs:
+            mock_jobs.get.side_effect = get
+            assert self.client.get("/reports/jobs/missing").status_code == 404
+        
+        assert on_event_loop == [False]
+    
+    def test_get_report_job_not_found(self):
+        """Test unknown job IDs return 404"""
+        with patch('main.report_jobs') as mock_jobs:
+            mock_jobs.get.return_value = None
+            
+            response = self.client.get("/reports/jobs/missing")
+        assert response.status_code == 404
+    
+    def test_agent_pool_status(self):
+        """Test agent pool status endpoint"""
+        with patch('main.agent_pool', self._pool_with(Mock())):
+            response = self.client.get("/agent-pool/status")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["size"] == 1
+        assert "avg_wait_seconds" in data
+        assert "utilization" in data
+    
+    def test_metrics_endpoint(self):
+        """Test Prometheus metrics endpoint records route templates"""
+        self.client.get("/agent-pool/status")
+        
+        response = self.client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'route="/agent-pool/status"' in response.text
+        assert "report_agent_agent_runs_in_flight" in response.text
+        assert "report_agent_scheduler_job_duration_seconds" in response.text
+    
+    def test_scheduler_endpoints_share_one_service(self):
+        """Test status and trigger reuse the application's scheduler service instead of building one per call"""
+        import main
+        service = Mock()
+        service.get_status.return_value = {"scheduler": {"running": True}}
+        service.trigger_manual_check.return_value = {"success": True, "sheets": {}}
+        
+        with patch('src.scheduler.scheduler_service._scheduler_service', None), \
+             patch('src.scheduler.scheduler_service.SchedulerService', return_value=service) as service_class:
+            assert self.client.get("/scheduler/status").json() == {"scheduler": {"running": True}}
+            assert self.client.get("/scheduler/status").status_code == 200
+            assert main.run_scheduler_check()["success"] is True
+        
+        service_class.assert_called_once()
+        assert service.get_status.call_count == 2
+    
+    def test_scheduler_trigger_returns_a_job(self):
+        """Test a manual check is enqueued as a job instead of running the round in the request"""
+        with patch('main.report_jobs') as mock_jobs, patch('main.get_scheduler_service') as get_service:
+            get_service.return_value.leader_lease.acquire.return_value = True
+            mock_jobs.submit_check.return_value = {
+                "job_id": "check1",
+                "kind": "scheduler_check",
+                "status": "QUEUED",
+                "force": True,
+                "created_at": "2025-01-01T10:00:00"
+            }
+            
+            response = self.client.post("/scheduler/trigger?force=true")
+        
+        assert response.status_code == 202
+        assert response.json()["job_id"] == "check1"
+        mock_jobs.submit_check.assert_called_once_with(force=True)
+    
+    def test_scheduler_trigger_runner_saturated(self):
+        """Test a saturated runner rejects a manual check with 429"""
+        with patch('main.report_jobs') as mock_jobs, patch('main.get_scheduler_service') as get_service:
+            get_service.return_value.leader_lease.acquire.return_value = True
+            mock_jobs.submit_check.side_effect = AgentRunnerBusyError("busy", retry_after=10)
+            
+            response = self.client.post("/scheduler/trigger")
+        
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "10"
+    
+    def test_scheduler_trigger_on_follower_conflicts(self):
+        """Test a replica without the scheduler lease refuses the trigger instead of racing the leader's round"""
+        with patch('main.report_jobs') as mock_jobs, patch('main.get_scheduler_service') as get_service:
+            get_service.return_value.leader_lease.acquire.return_value = False
+            
+            response = self.client.post("/scheduler/trigger")
+        
+        assert response.status_code == 409
+        mock_jobs.submit_check.assert_not_called()
+    
+    def test_scheduler_status_runs_off_the_event_loop(self):
+        """Test the blocking state reads behind the status endpoint run on a worker thread"""
+        on_event_loop = []
+        
+        def get_status():
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            return {"scheduler": {"running": True}}
+        
+        with patch('main.get_scheduler_service') as get_service:
+            get_service.return_value.get_status.side_effect = get_status
+            assert self.client.get("/scheduler/status").status_code == 200
+        
+        assert on_event_loop == [False]
+    
+    def test_get_manual_check_job(self):
+        """Test manual check jobs are looked up by kind and include per-sheet results"""
+        from src.jobs.report_jobs import JobKind
+        with patch('main.report_jobs') as mock_jobs:
+            mock_jobs.get.return_value = {
+                "job_id": "check1",
+                "status": "COMPLETED",
+                "created_at": "2025-01-01T10:00:00",
+                "result": {"success": True, "sheets": {"default": {"success": True}}}
+            }
+            
+            response = self.client.get("/scheduler/trigger/check1")
+        
+        assert response.status_code == 200
+        assert response.json()["result"]["sheets"]["default"]["success"] is True
+        mock_jobs.get.assert_called_once_with("check1", JobKind.SCHEDULER_CHECK)
+    
+    def test_scheduler_shares_the_app_agent_pool(self):
+        """Test the scheduler checks agents out of the API's pool instead of building a second one"""
+        import main
+        service = main.get_scheduler_service()
+        
+        assert service.agent_pool is main.agent_pool
+        assert main.agent_pool.size >= main.agent_runner.workers + service.concurrency
+    
     def test_list_tools(self):
         """Test tools listing endpoint"""
         with patch('main.tool_registry') as mock_registry:
@@ -117,22 +422,21 @@ class TestAPI:
             response = self.client.get("/tools")
             assert response.status_code == 500
     
-    @patch('main.get_agent')
-    def test_legacy_run_success(self, mock_get_agent):
+    def test_legacy_run_success(self):
         """Test legacy run endpoint"""
         mock_agent = Mock()
         mock_agent.run.return_value = {
             "success": True,
             "output": "Legacy output"
         }
-        mock_get_agent.return_value = mock_agent
         
         request_data = {
             "user_input": "Test input",
             "sheet_url": "https://test.com"
         }
         
-        response = self.client.post("/legacy/run", json=request_data)
+        with patch('main.agent_pool', self._pool_with(mock_agent)):
+            response = self.client.post("/legacy/run", json=request_data)
         
         assert response.status_code == 200
         data = response.json()
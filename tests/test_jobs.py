@@ -0,0 +1,169 @@
+# ==========================================
+# tests/test_jobs.py
+# Report Job Tests
+# ==========================================
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from src.agents.agent_runner import AgentRunner, AgentRunnerBusyError
+from src.jobs.report_jobs import ReportJobManager, ReportJobStore, JobStatus, JobKind
+
+class InMemoryJobStore(ReportJobStore):
+    """Job store backed by a dictionary"""
+    
+    def __init__(self):
+        super().__init__(db=Mock())
+        self.jobs = {}
+    
+    def create(self, job):
+        self.jobs[job["job_id"]] = dict(job)
+    
+    def update(self, job_id, fields):
+        self.jobs[job_id].update(fields)
+    
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+    
+    def delete(self, job_id):
+        self.jobs.pop(job_id, None)
+    
+    def fail_unfinished(self, now, fields):
+        unfinished = [job for job in self.jobs.values()
+                      if job["status"] in ("QUEUED", "RUNNING") and job.get("deadline_at", now - timedelta(1)) < now]
+        for job in unfinished:
+            job.update(fields, status="FAILED")
+        return len(unfinished)
+
+class TestReportJobManager:
+    """Test report job manager"""
+    
+    def setup_method(self):
+        """Setup test method"""
+        self.runner = AgentRunner(workers=1, queue_size=0)
+        self.store = InMemoryJobStore()
+    
+    def teardown_method(self):
+        """Cleanup test method"""
+        self.runner.shutdown()
+    
+    def test_job_completes_with_result(self):
+        """Test a successful job records result and timings"""
+        report_fn = Mock(return_value={"success": True, "output": "Report", "agent": "ReportAgent"})
+        manager = ReportJobManager(runner=self.runner, report_fn=report_fn, store=self.store)
+        
+        job = manager.submit(sheet_url="https://test.com", additional_context="ctx")
+        assert job["status"] == JobStatus.QUEUED.value
+        
+        self.runner.shutdown(wait=True)
+        record = manager.get(job["job_id"])
+        
+        assert record["status"] == JobStatus.COMPLETED.value
+        assert record["result"]["output"] == "Report"
+        assert set(record["timings"]) == {"queue_seconds", "run_seconds", "total_seconds"}
+        report_fn.assert_called_once_with(sheet_url="https://test.com", additional_context="ctx", mode="agent",
+                                          force=False)
+    
+    def test_job_failure_is_recorded(self):
+        """Test an exception during the run marks the job failed"""
+        report_fn = Mock(side_effect=Exception("LLM down"))
+        manager = ReportJobManager(runner=self.runner, report_fn=report_fn, store=self.store)
+        
+        job = manager.submit(sheet_url="https://test.com")
+        self.runner.shutdown(wait=True)
+        record = manager.get(job["job_id"])
+        
+        assert record["status"] == JobStatus.FAILED.value
+        assert record["error"] == "LLM down"
+    
+    def test_scheduler_check_runs_as_a_job(self):
+        """Test a manual scheduler check runs on the runner and is only visible as a check job"""
+        check_fn = Mock(return_value={"success": True, "sheets": {"default": {"success": True}}})
+        manager = ReportJobManager(runner=self.runner, report_fn=Mock(), store=self.store, check_fn=check_fn)
+        
+        job = manager.submit_check(force=True)
+        self.runner.shutdown(wait=True)
+        
+        check_fn.assert_called_once_with(force=True)
+        assert manager.get(job["job_id"], JobKind.SCHEDULER_CHECK)["status"] == JobStatus.COMPLETED.value
+        assert manager.get(job["job_id"], JobKind.REPORT) is None
+    
+    def test_rejected_job_is_not_persisted(self):
+        """Test a job refused by the runner leaves no record"""
+        runner = Mock()
+        runner.submit.side_effect = AgentRunnerBusyError("busy", retry_after=10)
+        manager = ReportJobManager(runner=runner, report_fn=Mock(), store=self.store)
+        
+        with pytest.raises(AgentRunnerBusyError):
+            manager.submit(sheet_url="https://test.com")
+        assert self.store.jobs == {}
+    
+    def test_interrupted_jobs_fail_on_startup(self):
+        """Test jobs left queued or running past their deadline are failed, jobs still within it are left alone"""
+        manager = ReportJobManager(runner=Mock(), report_fn=Mock(), store=self.store, deadline_seconds=60)
+        overdue = manager.submit(sheet_url="https://test.com")
+        self.store.jobs[overdue["job_id"]]["deadline_at"] = datetime.now() - timedelta(seconds=1)
+        current = manager.submit(sheet_url="https://test.com")
+        
+        assert manager.fail_interrupted() == 1
+        assert self.store.jobs[overdue["job_id"]]["status"] == JobStatus.FAILED.value
+        assert "deadline" in self.store.jobs[overdue["job_id"]]["error"]
+        assert self.store.jobs[current["job_id"]]["status"] == JobStatus.QUEUED.value
+    
+    def test_overdue_job_reads_as_failed(self):
+        """Test a job whose process died mid-run is reported failed once its deadline passes"""
+        manager = ReportJobManager(runner=Mock(), report_fn=Mock(), store=self.store, deadline_seconds=60)
+        job = manager.submit(sheet_url="https://test.com")
+        assert manager.get(job["job_id"])["status"] == JobStatus.QUEUED.value
+        
+        self.store.jobs[job["job_id"]]["deadline_at"] = datetime.now() - timedelta(seconds=1)
+        assert manager.get(job["job_id"])["status"] == JobStatus.FAILED.value
+    
+    def test_failed_running_update_fails_the_job(self):
+        """Test a job whose RUNNING write fails ends FAILED instead of staying QUEUED"""
+        store = Mock(wraps=self.store)
+        store.update.side_effect = [Exception("mongo down"), None]
+        manager = ReportJobManager(runner=Mock(), report_fn=Mock(), store=store)
+        
+        manager._execute("job1", datetime.now(), manager.report_fn, {})
+        
+        manager.report_fn.assert_not_called()
+        fields = store.update.call_args.args[1]
+        assert fields["status"] == JobStatus.FAILED.value
+        assert fields["error"] == "mongo down"
+        assert fields["deadline_at"] is None
+    
+    def test_worker_id_is_per_process(self):
+        """Test the worker ID tells apart processes sharing a hostname"""
+        import os
+        import socket
+        from src.jobs.report_jobs import WORKER
+        
+        assert WORKER.startswith(f"{socket.gethostname()}-{os.getpid()}-")
+
+class TestReportJobStore:
+    """Test the MongoDB job store"""
+    
+    def test_finished_and_overdue_jobs_expire(self):
+        """Test connecting creates TTL indexes on finished_at and on the unfinished jobs' deadline_at"""
+        with patch('src.jobs.report_jobs.MongoDB') as mongo_class:
+            store = ReportJobStore(ttl_seconds=3600)
+            assert store.db is store.db
+        
+        mongo_class.assert_called_once()
+        create_index = mongo_class.return_value.collection.create_index
+        assert create_index.call_count == 2
+        create_index.assert_any_call("finished_at", expireAfterSeconds=3600, name="finished_at_ttl")
+        create_index.assert_any_call("deadline_at", expireAfterSeconds=3600, name="deadline_at_ttl")
+    
+    def test_unfinished_jobs_failed_in_one_update(self):
+        """Test recovery is a single update of queued and running jobs past their deadline"""
+        db = Mock()
+        db.collection.update_many.return_value.modified_count = 2
+        now = datetime.now()
+        
+        assert ReportJobStore(db=db).fail_unfinished(now, {"error": "restart"}) == 2
+        query, update = db.collection.update_many.call_args.args
+        assert query == {"status": {"$in": ["QUEUED", "RUNNING"]},
+                         "$or": [{"deadline_at": {"$lt": now}}, {"deadline_at": {"$exists": False}}]}
+        assert update == {"$set": {"error": "restart", "status": "FAILED"}}
@@ -0,0 +1,177 @@
+# ==========================================
+# tests/test_llms.py
+# LLM Provider and Cache Tests
+# ==========================================
+
+import pytest
+from unittest.mock import Mock
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+from src.llms.llm_cache import LLMResultCache, CachedLLM, LangChainResultCache
+from src.llms.translation_memo import TranslationMemo
+
+class TestLLMResultCache:
+    """Test LLM result cache"""
+    
+    def test_key_normalizes_whitespace(self):
+        """Test equivalent inputs share a cache key"""
+        config = {"model_name": "gemini", "temperature": 0.7}
+        key1 = LLMResultCache.make_key(config, "prompt", "Date: 01/01/2025\nCompleted:  Task A ")
+        key2 = LLMResultCache.make_key(config, "prompt", "\nDate: 01/01/2025\n\nCompleted: Task A\n")
+        assert key1 == key2
+    
+    def test_key_depends_on_model_and_prompt(self):
+        """Test model settings and system prompt change the key"""
+        base = LLMResultCache.make_key({"temperature": 0.7}, "prompt", "data")
+        assert base != LLMResultCache.make_key({"temperature": 0.2}, "prompt", "data")
+        assert base != LLMResultCache.make_key({"temperature": 0.7}, "other prompt", "data")
+    
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted"""
+        cache = LLMResultCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+    
+    def test_expired_entries_miss(self):
+        """Test entries past their TTL are not served"""
+        cache = LLMResultCache(ttl_seconds=-1)
+        cache.set("a", "1")
+        assert cache.get("a") is None
+    
+    def test_mongo_tier_hit_promotes_to_memory(self):
+        """Test a MongoDB hit is served and promoted into memory"""
+        db = Mock()
+        db.find_one.return_value = {"_id": "k", "value": "cached report"}
+        cache = LLMResultCache(db=db)
+        
+        assert cache.get("k") == "cached report"
+        assert cache.get("k") == "cached report"
+        assert db.find_one.call_count == 1
+        
+        stats = cache.get_stats()
+        assert stats["mongo_hits"] == 1
+        assert stats["memory_hits"] == 1
+    
+    def test_mongo_errors_degrade_to_miss(self):
+        """Test MongoDB failures never fail the lookup"""
+        db = Mock()
+        db.find_one.side_effect = Exception("Mongo down")
+        cache = LLMResultCache(db=db)
+        
+        assert cache.get("k") is None
+        assert cache.get_stats()["errors"] == 1
+
+class TestCachedLLM:
+    """Test cached LLM provider wrapper"""
+    
+    def setup_method(self):
+        """Setup test method"""
+        self.provider = Mock()
+        self.provider.name = "Test LLM"
+        self.provider.get_model_config.return_value = {"model_name": "test"}
+        self.provider.generate.return_value = "Report"
+        self.llm = CachedLLM(self.provider, LLMResultCache())
+    
+    def test_repeated_input_served_from_cache(self):
+        """Test the provider is called once for repeated inputs"""
+        assert self.llm.generate("prompt", "row data") == "Report"
+        assert self.llm.generate("prompt", "row  data") == "Report"
+        
+        assert self.provider.generate.call_count == 1
+        stats = self.llm.cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_passthrough(self):
+        """Test the wrapper exposes the wrapped provider"""
+        assert self.llm.name == "Test LLM"
+        assert self.llm.get_model_config() == {"model_name": "test"}
+    
+    def test_agent_model_calls_are_cached(self):
+        """Test the chat model handed to ReAct agents serves repeated calls from the cache, tool calls included"""
+        model = FakeListChatModel(responses=["First answer", "Second answer"])
+        self.provider.get_llm.return_value = model
+        chat = self.llm.get_llm()
+        
+        assert chat is self.llm.get_llm()
+        assert chat.invoke("Generate the report").content == "First answer"
+        assert chat.invoke("Generate the report").content == "First answer"
+        assert chat.invoke("Another request").content == "Second answer"
+        assert model.cache is None
+        assert self.llm.cache.get_stats()["hits"] == 1
+
+    def test_tool_calls_round_trip(self):
+        """Test cached agent steps keep their tool calls"""
+        cache = LangChainResultCache(LLMResultCache())
+        step = ChatGeneration(message=AIMessage(content="", tool_calls=[
+            {"name": "get_information_from_url", "args": {"url": "https://test.com"}, "id": "call-1"}
+        ]))
+        cache.update("messages", "model", [step])
+        
+        (cached,) = cache.lookup("messages", "model")
+        assert cached.message.tool_calls[0]["args"] == {"url": "https://test.com"}
+        assert cache.lookup("messages", "other model") is None
+
+class TestTranslationMemo:
+    """Test per-cell translation memo"""
+    
+    def test_store_and_lookup(self):
+        """Test stored translations are returned for the same source text"""
+        memo = TranslationMemo(mongo_enabled=False)
+        memo.store({"Việc A": "Task A"})
+        
+        assert memo.lookup(["Việc A", " Việc A ", "Việc B"]) == {"Việc A": "Task A", " Việc A ": "Task A"}
+        stats = memo.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_key_includes_target_language(self):
+        """Test translations are kept per target language"""
+        english = TranslationMemo(target_language="English", mongo_enabled=False)
+        french = TranslationMemo(target_language="French", mongo_enabled=False)
+        assert english.make_key("Việc A") != french.make_key("Việc A")
+    
+    def test_mongo_lookup_for_memory_misses(self):
+        """Test MongoDB is queried only for cells missing from memory"""
+        db = Mock()
+        memo = TranslationMemo(db=db)
+        db.find.return_value = [{"_id": memo.make_key("Việc B"), "translation": "Task B"}]
+        memo.store({"Việc A": "Task A"})
+        
+        found = memo.lookup(["Việc A", "Việc B"])
+        
+        assert found == {"Việc A": "Task A", "Việc B": "Task B"}
+        queried_keys = db.find.call_args[0][0]["_id"]["$in"]
+        assert queried_keys == [memo.make_key("Việc B")]
+        assert db.collection.bulk_write.call_count == 1
+    
+    def test_writes_are_one_bulk_upsert(self):
+        """Test all translations of a report are written in one unordered bulk of upserts"""
+        db = Mock()
+        memo = TranslationMemo(db=db)
+        
+        memo.store({"Việc A": "Task A", "Việc B": "Task B"})
+        
+        (operations,), kwargs = db.collection.bulk_write.call_args
+        assert [operation._filter for operation in operations] == [{"_id": memo.make_key("Việc A")},
+                                                                   {"_id": memo.make_key("Việc B")}]
+        assert all(operation._upsert for operation in operations)
+        assert kwargs == {"ordered": False}
+        db.update_one.assert_not_called()
+    
+    def test_memory_is_bounded_lru(self):
+        """Test the least recently used translation is evicted from memory"""
+        memo = TranslationMemo(mongo_enabled=False, max_entries=2)
+        memo.store({"Việc A": "Task A", "Việc B": "Task B"})
+        memo.lookup(["Việc A"])
+        memo.store({"Việc C": "Task C"})
+        
+        assert memo.lookup(["Việc A", "Việc B", "Việc C"]) == {"Việc A": "Task A", "Việc C": "Task C"}
+        assert memo.get_stats()["entries"] == 2
@@ -0,0 +1,490 @@
+# ==========================================
+# tests/test_scheduler.py
+# Scheduler and Daily State Tests
+# ==========================================
+
+import json
+import sqlite3
+import threading
+import polars as pl
+import pytest
+from unittest.mock import Mock, patch
+from src.agents.agent_pool import AgentPool
+from src.config.settings import MonitoredSheet, load_monitored_sheets
+from src.scheduler.scheduler_service import SchedulerService
+from src.scheduler.keyed_locks import KeyedLocks
+from pymongo.errors import DuplicateKeyError
+from src.scheduler.leader_lease import LeaderLease
+from src.scheduler.state_backends import MongoStateBackend, SQLiteBackend
+from src.scheduler.state_manager import DailyStateManager, ReportStatus
+from src.sheets.snapshot import SheetSnapshot, report_variant
+from src.tools.send_slack_message import _slack_target
+
+SHEET_URL = "https://docs.google.com/spreadsheets/d/test_id/edit"
+
+class TestDailyStateManager:
+    """Test daily state persistence"""
+
+    def setup_method(self):
+        """Setup test method"""
+        self.snapshot = SheetSnapshot(sheet_url=SHEET_URL, frame=pl.DataFrame({"Date": ["01/01/2025"],
+                                                                               "Completed": ["Task"]}))
+
+    def test_report_reused_for_same_row(self, tmp_path):
+        """Test the stored report is returned only for the row it was generated from"""
+        state = DailyStateManager(state_file=str(tmp_path / "state.json"))
+        state.record_report(SHEET_URL, self.snapshot.content_hash(), {"success": True, "output": "Report",
+                                                                      "agent": "ReportAgent", "sinks": {}})
+        state.flush()
+
+        reloaded = DailyStateManager(state_file=str(tmp_path / "state.json"))
+        report = reloaded.get_report(f"{SHEET_URL}?usp=sharing", self.snapshot.content_hash())
+        changed = SheetSnapshot.from_row(SHEET_URL, {"Date": "01/01/2025", "Completed": "Task, edited"})
+
+        assert report["output"] == "Report"
+        assert report["reused"] is True
+        assert "sinks" not in report
+        assert reloaded.get_report(SHEET_URL, changed.content_hash()) is None
+
+    def test_mutations_coalesced_into_one_atomic_write(self, tmp_path):
+        """Test a check's mutations are written once, compactly and atomically, when flushed"""
+        state_file = tmp_path / "state.json"
+        state = DailyStateManager(state_file=str(state_file), flush_interval=60)
+
+        state.update_status(ReportStatus.CHECKING)
+        state.increment_check_count()
+        state.mark_report_found()
+        state.mark_completed()
+
+        assert not state_file.exists()
+        assert state.flush() is True
+        assert state.flush() is False
+
+        content = state_file.read_text()
+        assert "\n" not in content
+        assert json.loads(content)[state.get_today_key()]["sheets"]["default"]["status"] == "COMPLETED"
+        assert list(tmp_path.iterdir()) == [state_file]
+        assert state.get_stats()["persistence"]["writes"] == 1
+
+    def test_failed_write_stays_pending(self, tmp_path):
+        """Test a failed write keeps the old file and is retried by the next flush"""
+        state_file = tmp_path / "state.json"
+        state = DailyStateManager(state_file=str(state_file), flush_interval=0)
+        state.increment_check_count()
+
+        with patch('src.scheduler.state_writer.os.replace', side_effect=OSError("disk full")):
+            state.increment_check_count()
+
+        assert json.loads(state_file.read_text())[state.get_today_key()]["sheets"]["default"]["check_count"] == 1
+        assert state.flush() is True
+        assert json.loads(state_file.read_text())[state.get_today_key()]["sheets"]["default"]["check_count"] == 2
+
+    def test_legacy_day_state_becomes_default_sheet(self, tmp_path):
+        """Test a state file written before per-sheet state keeps its counters under the default sheet"""
+        state = DailyStateManager(state_file=str(tmp_path / "state.json"))
+        today = state.get_today_key()
+        state.backend.state_data = {today: {"date": today, "status": "REMINDED", "check_count": 2, "last_check": None,
+                                            "report_found": False, "notifications_sent": 1, "completed_at": None,
+                                            "error_count": 0, "last_error": None}}
+
+        assert state.get_reminder_count() == 1
+        assert state.get_today_state("team-b")["notifications_sent"] == 0
+        assert set(state.get_stats()["sheets"]) == {"default", "team-b"}
+
+    def test_reads_do_not_create_state(self, tmp_path):
+        """Test stats, report lookups and reminder checks never create a sheet row for today"""
+        state = DailyStateManager(state_file=str(tmp_path / "state.json"))
+
+        assert state.get_stats()["sheets"] == {}
+        assert state.get_report(SHEET_URL, "abc123") is None
+        assert state.is_completed_today("team-a") is False
+        assert state.get_reminder_count("team-a") == 0
+        assert state.backend.state_data == {}
+        assert state.get_stats()["persistence"]["mutations"] == 0
+
+class TestSQLiteStateBackend:
+    """Test the SQLite (WAL) state backend"""
+
+    def test_state_and_reports_round_trip(self, tmp_path):
+        """Test status, counters and reports survive reopening the database"""
+        state = DailyStateManager(backend=SQLiteBackend(str(tmp_path / "state.db")))
+        state.update_status(ReportStatus.CHECKING, sheet="team-a")
+        state.increment_check_count("team-a")
+        state.mark_failed("sheet exploded", sheet="team-a")
+        state.record_report(SHEET_URL, "abc123", {"success": True, "output": "Report"}, sheet="team-b")
+        state.close()
+
+        reloaded = DailyStateManager(backend=SQLiteBackend(str(tmp_path / "state.db")))
+        today_state = reloaded.get_today_state("team-a")
+
+        assert today_state["status"] == ReportStatus.FAILED.value
+        assert today_state["check_count"] == 1
+        assert today_state["error_count"] == 1
+        assert today_state["report_found"] is False
+        assert reloaded.get_report(SHEET_URL, "abc123", sheet="team-b")["output"] == "Report"
+        assert reloaded.get_stats()["sheets"].keys() == {"team-a", "team-b"}
+        with reloaded.backend._connection() as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_threads_share_one_connection(self, tmp_path):
+        """Test scheduler rounds on fresh threads never open more connections or file descriptors"""
+        backend = SQLiteBackend(str(tmp_path / "state.db"))
+        opened = []
+        real_connect = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            opened.append(args)
+            return real_connect(*args, **kwargs)
+
+        with patch('src.scheduler.state_backends.sqlite3.connect', side_effect=connect):
+            for round_number in range(20):
+                threads = [threading.Thread(target=backend.update, args=("2025-01-01", f"sheet-{index}"),
+                                            kwargs={"increments": {"check_count": 1}}) for index in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+        assert opened == []
+        assert backend.get("2025-01-01", "sheet-0")["check_count"] == 20
+
+    def test_cleanup_deletes_old_days(self, tmp_path):
+        """Test cleanup removes only the days before the cutoff"""
+        backend = SQLiteBackend(str(tmp_path / "state.db"))
+        for day in ("2025-01-01", "2025-01-02", "2025-03-01"):
+            backend.ensure(day, "default")
+        backend.put_report("2025-01-01", "default", "url", {"content_hash": "x"})
+
+        assert backend.delete_before("2025-02-01") == 2
+        assert backend.get_report("2025-01-01", "default", "url") is None
+        assert backend.list_sheets("2025-03-01") == ["default"]
+
+    def test_unknown_field_rejected(self, tmp_path):
+        """Test update refuses fields that are not state columns"""
+        backend = SQLiteBackend(str(tmp_path / "state.db"))
+
+        with pytest.raises(ValueError):
+            backend.update("2025-01-01", "default", values={"status = 'x'; --": 1})
+
+class TestMongoStateBackend:
+    """Test the shared MongoDB state backend"""
+
+    def setup_method(self):
+        """Setup test method"""
+        self.db = Mock()
+        self.backend = MongoStateBackend(db=self.db)
+
+    def test_compare_and_set_is_one_conditional_update(self):
+        """Test the expected values go into the filter and changes are a single $set/$inc"""
+        self.db.collection.find_one_and_update.return_value = {
+            "_id": "2025-01-01", "sheets": {"team-a": {"status": "REMINDED", "notifications_sent": 2}}
+        }
+
+        state = self.backend.compare_and_set("2025-01-01", "team-a", {"notifications_sent": 1},
+                                             values={"status": "REMINDED"}, increments={"notifications_sent": 1})
+
+        query, update = self.db.collection.find_one_and_update.call_args.args
+        assert query == {"_id": "2025-01-01", "sheets.team-a": {"$exists": True},
+                         "sheets.team-a.notifications_sent": 1}
+        assert update == {"$set": {"sheets.team-a.status": "REMINDED"},
+                          "$inc": {"sheets.team-a.notifications_sent": 1}}
+        assert state["notifications_sent"] == 2
+        assert state["check_count"] == 0
+
+    def test_lost_race_returns_none(self):
+        """Test a compare-and-set whose filter no longer matches reports the conflict"""
+        self.db.collection.find_one_and_update.return_value = None
+
+        assert self.backend.compare_and_set("2025-01-01", "team-a", {"notifications_sent": 0},
+                                            increments={"notifications_sent": 1}) is None
+
+    def test_ensure_tolerates_concurrent_creation(self):
+        """Test a sheet created by another replica is read instead of failing"""
+        self.db.collection.update_one.side_effect = DuplicateKeyError("E11000")
+        self.db.collection.find_one.return_value = {"_id": "2025-01-01", "sheets": {"team-a": {"check_count": 3}}}
+
+        assert self.backend.ensure("2025-01-01", "team-a")["check_count"] == 3
+
+    def test_reports_keyed_by_url_hash(self):
+        """Test report URLs (which contain dots) never become MongoDB field names"""
+        self.backend.put_report("2025-01-01", "team-a", "https://docs.google.com/x", {"content_hash": "abc"})
+
+        update = self.db.update_one.call_args.args[1]
+        (field,) = update["$set"]
+        assert field.startswith("sheets.team-a.reports.")
+        assert "google" not in field
+
+    def test_cleanup_is_one_range_delete(self):
+        """Test cleanup deletes older day documents by _id range"""
+        self.db.delete.return_value = Mock(deleted_count=4)
+
+        assert self.backend.delete_before("2025-01-01") == 4
+        self.db.delete.assert_called_once_with({"_id": {"$lt": "2025-01-01"}})
+
+class TestLeaderLease:
+    """Test the scheduler leader lease"""
+
+    def test_lease_taken_when_free_or_own(self):
+        """Test the lease filter matches only our own or an expired lease"""
+        db = Mock()
+        lease = LeaderLease(db=db)
+
+        assert lease.acquire() is True
+        assert lease.is_leader() is True
+        query = db.collection.find_one_and_update.call_args.args[0]
+        assert query["_id"] == "scheduler"
+        assert {"holder": lease.holder} in query["$or"]
+
+    def test_lease_held_elsewhere(self):
+        """Test a live lease of another replica makes the upsert collide and this replica follow"""
+        db = Mock()
+        db.collection.find_one_and_update.side_effect = DuplicateKeyError("E11000")
+        lease = LeaderLease(db=db)
+
+        assert lease.acquire() is False
+        assert lease.is_leader() is False
+        lease.release()
+        db.delete.assert_not_called()
+
+    def test_disabled_lease_always_leads(self):
+        """Test single-replica deployments never touch MongoDB for the lease"""
+        db = Mock()
+        lease = LeaderLease(enabled=False, db=db)
+
+        assert lease.acquire() is True
+        db.collection.find_one_and_update.assert_not_called()
+
+class TestConcurrentState:
+    """Test state access from many scheduler and API threads"""
+
+    @staticmethod
+    def _in_threads(target, threads: int = 8):
+        """Run target in several threads started together"""
+        barrier = threading.Barrier(threads, timeout=5)
+        results = []
+
+        def run():
+            barrier.wait()
+            results.append(target())
+
+        workers = [threading.Thread(target=run) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_counters_exact(self, tmp_path, backend):
+        """Test concurrent increments and failures are never lost"""
+        if backend == "json":
+            state = DailyStateManager(state_file=str(tmp_path / "state.json"), flush_interval=60)
+        else:
+            state = DailyStateManager(backend=SQLiteBackend(str(tmp_path / "state.db")))
+
+        def work():
+            for _ in range(25):
+                state.increment_check_count("team-a")
+                state.mark_failed("boom", sheet="team-a")
+
+        self._in_threads(work)
+
+        today_state = state.get_today_state("team-a")
+        assert today_state["check_count"] == 200
+        assert today_state["error_count"] == 200
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_reminder_limit_holds(self, tmp_path, backend):
+        """Test concurrent reminder claims never exceed the sheet's limit"""
+        if backend == "json":
+            state = DailyStateManager(state_file=str(tmp_path / "state.json"), flush_interval=60)
+        else:
+            state = DailyStateManager(backend=SQLiteBackend(str(tmp_path / "state.db")))
+
+        claims = self._in_threads(lambda: state.claim_reminder("team-a", max_reminders=3))
+
+        assert sorted(claim for claim in claims if claim is not None) == [0, 1, 2]
+        assert state.get_reminder_count("team-a") == 3
+
+    def test_sheet_locks_are_independent(self):
+        """Test a held sheet lock blocks only the same sheet"""
+        locks = KeyedLocks()
+        acquired = {}
+
+        def try_hold(key):
+            lock_acquired = threading.Event()
+
+            def hold():
+                with locks.hold(key):
+                    lock_acquired.set()
+
+            threading.Thread(target=hold, daemon=True).start()
+            acquired[key] = lock_acquired.wait(timeout=0.5)
+
+        with locks.hold(("2025-01-01", "team-a")):
+            try_hold(("2025-01-01", "team-b"))
+            try_hold(("2025-01-01", "team-a"))
+
+        assert acquired == {("2025-01-01", "team-b"): True, ("2025-01-01", "team-a"): False}
+
+class TestMonitoredSheets:
+    """Test monitored sheet configuration"""
+
+    def test_sheets_from_json(self, monkeypatch):
+        """Test sheets are read from SCHEDULER_SHEETS with the default reminder policy filled in"""
+        monkeypatch.delenv("SCHEDULER_SHEETS_FILE", raising=False)
+        monkeypatch.setenv("SCHEDULER_SHEETS", '[{"name": "team-a", "sheet_url": "https://a", "slack_target": "C1"},'
+                                               ' {"sheet_url": "https://b", "max_reminders": 1}]')
+
+        sheets = load_monitored_sheets(default_max_reminders=3)
+
+        assert sheets == [
+            MonitoredSheet(name="team-a", sheet_url="https://a", slack_target="C1", max_reminders=3),
+            MonitoredSheet(name="sheet-2", sheet_url="https://b", slack_target=None, max_reminders=1)
+        ]
+
+    def test_default_sheet_url_fallback(self, monkeypatch):
+        """Test the single DEFAULT_SHEET_URL is monitored when no list is configured"""
+        monkeypatch.delenv("SCHEDULER_SHEETS_FILE", raising=False)
+        monkeypatch.delenv("SCHEDULER_SHEETS", raising=False)
+        monkeypatch.setenv("DEFAULT_SHEET_URL", "https://default")
+
+        assert load_monitored_sheets(default_max_reminders=2) == [
+            MonitoredSheet(name="default", sheet_url="https://default", max_reminders=2)
+        ]
+
+class TestSchedulerService:
+    """Test the daily check job"""
+
+    def setup_method(self):
+        """Setup test method"""
+        self.service = SchedulerService()
+        self.service.report_checker = Mock()
+        self.service.reminder_service = Mock()
+        self.agent = Mock()
+        self.agent.generate_report.return_value = {"success": True, "output": "Report"}
+        self.service.agent_pool = AgentPool(factory=lambda: self.agent, size=1)
+        self.snapshot = SheetSnapshot.from_row(SHEET_URL, {"Date": "01/01/2025", "Completed": "Task"})
+        self.service.report_checker.find_today_snapshot.return_value = self.snapshot
+
+    def _run(self, state, sheets=None, force=False):
+        """Run the daily check against the given state manager and monitored sheets"""
+        sheets = sheets or [MonitoredSheet(name="default", sheet_url=SHEET_URL)]
+        with patch('src.scheduler.scheduler_service.state_manager', state), \
+             patch('src.scheduler.scheduler_service.SchedulerConfig.from_env', return_value=Mock(sheets=sheets)):
+            return self.service.daily_check_job(force=force)
+
+    def test_unchanged_row_skips_generation(self, tmp_path):
+        """Test a row that was already reported is not generated, stored or posted again"""
+        state = DailyStateManager(state_file=str(tmp_path / "state.json"))
+        state.record_report(SHEET_URL, self.snapshot.content_hash(), {"success": True, "output": "Report"},
+                            variant=SchedulerService.scheduled_variant())
+
+        assert self._run(state) == {"default": "unchanged"}
+
+        self.agent.generate_report.assert_not_called()
+        assert state.get_today_state()["status"] == ReportStatus.COMPLETED.value
+
+    def test_force_regenerates(self, tmp_path):
+        """Test force regenerates a completed, unchanged report"""
+        state = DailyStateManager(state_file=str(tmp_path / "state.json"))
+        state.record_report(SHEET_URL, self.snapshot.content_hash(), {"success": True, "output": "Old report"},
+                            variant=SchedulerService.scheduled_variant())
+        state.mark_completed()
+
+        self._run(state, force=True)
+
+        assert self.agent.generate_report.call_args.kwargs["snapshot"] is self.snapshot
+        assert state.get_report(SHEET_URL, self.snapshot.content_hash(),
+                                variant=SchedulerService.scheduled_variant())["output"] == "Report"
+
+    def test_report_from_other_context_is_not_reused(self, tmp_path):
+        """Test a report generated with another mode or context is regenerated, not reused"""
+        state = DailyStateManager(state_file=str(tmp_path / "state.json"))
+        state.record_report(SHEET_URL, self.snapshot.content_hash(), {"success": True, "output": "API report"},
+                            variant=report_variant("agent", "Focus on QA"))
+
+        assert self._run(state) == {"default": "generated"}
+        assert state.get_report(SHEET_URL, self.snapshot.content_hash(),
+                                variant=report_variant("agent", "Focus on QA"))["output"] == "API report"
+
+    def test_sheet_for_url_matches_monitored_sheet(self):
+        """Test API requests map to the monitored sheet entry (same state and reuse slot as the scheduler)"""
+        sheets = [MonitoredSheet(name="team-b", sheet_url=SHEET_URL)]
+        with patch('src.scheduler.scheduler_service.SchedulerConfig.from_env', return_value=Mock(sheets=sheets)):
+            assert SchedulerService.sheet_for_url(f"{SHEET_URL}?usp=sharing").name == "team-b"
+            assert SchedulerService.sheet_for_url("https://docs.google.com/spreadsheets/d/other/edit") is None
+
+    def test_components_built_lazily_once(self):
+        """Test constructing the service or reading its status builds no checker, Slack client or agents"""
+        with patch('src.scheduler.scheduler_service.ReportChecker') as checker_class, \
+             patch('src.scheduler.scheduler_service.ReminderService') as reminder_class:
+            service = SchedulerService()
+            service.get_status()
+            
+            checker_class.assert_not_called()
+            reminder_class.assert_not_called()
+            assert service._agent_pool is None
+            assert service.reminder_service is service.reminder_service
+            reminder_class.assert_called_once()
+            checker_class.assert_not_called()
+
+    def test_scheduled_jobs_run_on_leader_only(self):
+        """Test scheduled jobs are skipped while another replica holds the lease"""
+        job = Mock(__name__="daily_check_job", return_value={"default": "completed"})
+        self.service.leader_lease = Mock()
+
+        self.service.leader_lease.acquire.return_value = False
+        assert self.service._as_leader(job)() is None
+        job.assert_not_called()
+
+        self.service.leader_lease.acquire.return_value = True
+        assert self.service._as_leader(job)() == {"default": "completed"}
+
+    def test_manual_check_runs_on_leader_only(self):
+        """Test a manual check on a replica without the lease does not start a round"""
+        self.service.leader_lease = Mock()
+        self.service.leader_lease.acquire.return_value = False
+
+        with patch.object(self.service, 'daily_check_job') as daily_check_job:
+            result = self.service.trigger_manual_check(force=True)
+
+        assert result["success"] is False
+        assert "lease" in result["error"]
+        daily_check_job.assert_not_called()
+
+    def test_sheets_checked_concurrently_and_isolated(self, tmp_path):
+        """Test sheets run in parallel, failures stay with their sheet and reminders follow each policy"""
+        state = DailyStateManager(state_file=str(tmp_path / "state.json"))
+        sheets = [
+            MonitoredSheet(name="slow-a", sheet_url="https://test.com/a.csv"),
+            MonitoredSheet(name="slow-b", sheet_url="https://test.com/b.csv", slack_target="C_TEAM_B"),
+            MonitoredSheet(name="broken", sheet_url="https://test.com/broken.csv"),
+            MonitoredSheet(name="quiet", sheet_url="https://test.com/quiet.csv", max_reminders=0)
+        ]
+        targets = {}
+        barrier = threading.Barrier(2, timeout=5)
+
+        def find_today_snapshot(url, tabs=None):
+            if url == "https://test.com/broken.csv":
+                raise RuntimeError("sheet exploded")
+            if "slow" in url:
+                # Both slow sheets must be in flight at the same time to pass the barrier
+                barrier.wait()
+            return None
+
+        def send_reminder(count):
+            targets[threading.current_thread().name] = _slack_target.get()
+            return {"success": True}
+
+        self.service.concurrency = 4
+        self.service.report_checker.find_today_snapshot.side_effect = find_today_snapshot
+        self.service.reminder_service.send_reminder.side_effect = send_reminder
+
+        results = self._run(state, sheets=sheets)
+
+        assert results == {"slow-a": "reminded", "slow-b": "reminded", "broken": "failed", "quiet": "waiting"}
+        assert sorted(targets.values(), key=str) == ["C_TEAM_B", None]
+        assert state.get_today_state("broken")["last_error"] == "Error in daily check job: sheet exploded"
+        assert state.get_today_state("slow-a")["notifications_sent"] == 1
+        assert state.get_today_state("quiet")["notifications_sent"] == 0
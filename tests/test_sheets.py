@@ -0,0 +1,517 @@
+# ==========================================
+# tests/test_sheets.py
+# Sheet Fetcher and Cache Tests
+# ==========================================
+
+import polars as pl
+import pytest
+import threading
+import requests
+from datetime import date
+from unittest.mock import Mock, patch
+from src.sheets.rows import select_latest_entry
+from src.sheets.schema import TAB_COLUMN, SchemaProfiles, detect_date_format, map_progress_columns
+from src.sheets.sheet_cache import SheetCache
+from src.sheets.sheet_store import SheetStore, sheet_key
+from src.sheets.sheet_tabs import SheetTabs, normalize_tabs, tab_url
+from src.sheets.sheet_fetcher import SheetDownload, SheetFetcher, SheetFetchError, parse_csv, to_export_url
+from src.sheets.snapshot import SheetSnapshot, use_snapshot
+from src.scheduler.report_checker import ReportChecker
+from src.tools.get_information_from_url import GetInformationFromURLTool
+
+CSV = b"Date,Task\n01/01/2025,Test task\n"
+
+def make_response(status_code=200, content=CSV, headers=None):
+    """Build a fake requests response"""
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status_code} Error")
+    return response
+
+class TestExportURL:
+    """Test Google Sheets URL conversion"""
+
+    def test_edit_url(self):
+        """Test edit URLs become CSV export URLs"""
+        url = "https://docs.google.com/spreadsheets/d/test_id/edit?usp=sharing"
+        assert to_export_url(url) == "https://docs.google.com/spreadsheets/d/test_id/export?format=csv"
+
+    def test_bare_url(self):
+        """Test URLs without /edit are converted the same way"""
+        url = "https://docs.google.com/spreadsheets/d/test_id"
+        assert to_export_url(url) == "https://docs.google.com/spreadsheets/d/test_id/export?format=csv"
+
+    def test_gid_is_kept(self):
+        """Test the tab id is carried over from the query or the fragment"""
+        base = "https://docs.google.com/spreadsheets/d/test_id"
+        expected = f"{base}/export?format=csv&gid=123"
+        assert to_export_url(f"{base}/edit?gid=123") == expected
+        assert to_export_url(f"{base}/edit?usp=sharing#gid=123") == expected
+
+    def test_other_url_unchanged(self):
+        """Test non Google Sheets URLs are fetched as is"""
+        assert to_export_url("https://test.com/data.csv") == "https://test.com/data.csv"
+
+class TestSheetFetcher:
+    """Test shared sheet fetcher"""
+
+    def setup_method(self):
+        """Setup test method"""
+        self.session = Mock()
+        self.fetcher = SheetFetcher(connect_timeout=2, read_timeout=7, max_retries=2, backoff_base=0,
+                                    session=self.session)
+
+    def test_fetch_uses_session_and_timeouts(self):
+        """Test downloads go through the pooled session with connect/read timeouts"""
+        self.session.get.return_value = make_response()
+
+        df = self.fetcher.fetch_frame("https://docs.google.com/spreadsheets/d/test_id/edit")
+
+        assert df.columns == ["Date", "Task"]
+        self.session.get.assert_called_once_with(
+            "https://docs.google.com/spreadsheets/d/test_id/export?format=csv",
+            headers={},
+            timeout=(2, 7)
+        )
+    
+    def test_conditional_request(self):
+        """Test validators are sent and 304 is reported as not modified"""
+        self.session.get.return_value = make_response(304)
+
+        download = self.fetcher.fetch("https://test.com/data.csv", etag='"v1"', last_modified="Mon, 01 Jan 2025")
+
+        assert download.not_modified
+        assert download.content is None
+        assert self.session.get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2025"
+        }
+
+    @patch('src.sheets.sheet_fetcher.time.sleep')
+    def test_retries_transient_errors(self, mock_sleep):
+        """Test timeouts and 5xx responses are retried"""
+        self.session.get.side_effect = [
+            requests.exceptions.Timeout("read timeout"),
+            make_response(503),
+            make_response()
+        ]
+
+        content = self.fetcher.fetch_bytes("https://test.com/data.csv")
+
+        assert content.startswith(b"Date")
+        assert self.session.get.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch('src.sheets.sheet_fetcher.time.sleep')
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        """Test the last transient error is raised once retries are exhausted"""
+        self.session.get.side_effect = requests.exceptions.ConnectionError("refused")
+
+        with pytest.raises(SheetFetchError, match="after 3 attempts"):
+            self.fetcher.fetch_bytes("https://test.com/data.csv")
+        assert self.session.get.call_count == 3
+
+    def test_client_error_not_retried(self):
+        """Test 4xx responses fail fast"""
+        self.session.get.return_value = make_response(404)
+
+        with pytest.raises(SheetFetchError, match="404"):
+            self.fetcher.fetch_bytes("https://test.com/data.csv")
+        assert self.session.get.call_count == 1
+
+    def test_backoff_is_bounded(self):
+        """Test jittered backoff never exceeds the cap"""
+        fetcher = SheetFetcher(backoff_base=1, backoff_max=3, session=Mock())
+        assert all(0 <= fetcher._backoff(attempt) <= 3 for attempt in range(10))
+
+class TestSheetCache:
+    """Test parsed sheet cache"""
+
+    def setup_method(self):
+        """Setup test method"""
+        self.fetcher = Mock()
+        self.cache = SheetCache(self.fetcher, ttl_seconds=0)
+
+    def test_fresh_entries_skip_network(self):
+        """Test sheets inside the TTL are served without a request"""
+        self.cache.ttl_seconds = 60
+        self.fetcher.fetch.return_value = SheetDownload(content=CSV)
+
+        first = self.cache.fetch_frame("https://test.com/data.csv")
+        second = self.cache.fetch_frame("https://test.com/data.csv")
+
+        assert second is first
+        assert self.fetcher.fetch.call_count == 1
+        stats = self.cache.get_stats()["sheets"]["https://test.com/data.csv"]
+        assert stats["fresh"] == 1
+        assert stats["miss"] == 1
+
+    def test_not_modified_reuses_frame(self):
+        """Test a 304 returns the parsed frame and revalidation sends the ETag"""
+        self.fetcher.fetch.side_effect = [
+            SheetDownload(content=CSV, etag='"v1"'),
+            SheetDownload(content=None, etag='"v1"', not_modified=True)
+        ]
+
+        first = self.cache.fetch_frame("https://test.com/data.csv")
+        second = self.cache.fetch_frame("https://test.com/data.csv")
+
+        assert second is first
+        assert self.fetcher.fetch.call_args.kwargs["etag"] == '"v1"'
+        assert self.cache.get_stats()["sheets"]["https://test.com/data.csv"]["not_modified"] == 1
+
+    def test_content_hash_detects_unchanged_body(self):
+        """Test an identical body without validators is not parsed again"""
+        self.fetcher.fetch.return_value = SheetDownload(content=CSV)
+
+        with patch('src.sheets.sheet_cache.parse_csv', wraps=parse_csv) as parse:
+            first = self.cache.fetch_frame("https://test.com/data.csv")
+            second = self.cache.fetch_frame("https://test.com/data.csv")
+
+        assert second is first
+        assert parse.call_count == 1
+        assert self.cache.get_stats()["sheets"]["https://test.com/data.csv"]["unchanged"] == 1
+
+    def test_changed_body_is_reparsed(self):
+        """Test a different body replaces the cached frame"""
+        self.fetcher.fetch.side_effect = [
+            SheetDownload(content=CSV),
+            SheetDownload(content=CSV + b"02/01/2025,Next task\n")
+        ]
+
+        self.cache.fetch_frame("https://test.com/data.csv")
+        second = self.cache.fetch_frame("https://test.com/data.csv")
+
+        assert len(second) == 2
+        assert self.cache.get_stats()["sheets"]["https://test.com/data.csv"]["miss"] == 2
+
+    def test_disabled_cache_always_fetches(self):
+        """Test a disabled cache delegates straight to the fetcher"""
+        self.cache.enabled = False
+        self.fetcher.fetch_frame.return_value = "frame"
+
+        assert self.cache.fetch_frame("https://test.com/data.csv") == "frame"
+        assert self.cache.get_stats()["sheets"] == {}
+
+class TestReportCheckerFetch:
+    """Test report checker uses the shared fetcher"""
+
+    def test_scan_sheet_data(self):
+        """Test the checker scans sheets lazily through the injected cache"""
+        session = Mock()
+        session.get.return_value = make_response()
+        checker = ReportChecker(sheets=SheetCache(SheetFetcher(session=session)))
+
+        data, stale = checker._scan_sheet_data("https://docs.google.com/spreadsheets/d/test_id/edit#gid=5")
+
+        assert isinstance(data, pl.LazyFrame)
+        assert stale is False
+        assert data.collect().height == 1
+        assert session.get.call_args[0][0].endswith("&gid=5")
+
+    def test_today_lookup_pushes_filter_into_scan(self):
+        """Test the date predicate and row limit are pushed into the CSV scan"""
+        today = date.today().strftime("%d/%m/%Y")
+        body = f"Date,Completed\n01/01/2020,Old task\n{today},Today's task\n".encode("utf-8")
+        checker = ReportChecker(sheets=SheetCache(Mock(fetch=Mock(return_value=SheetDownload(content=body)))),
+                                profiles=SchemaProfiles())
+
+        with patch.object(pl.LazyFrame, "collect", autospec=True, side_effect=pl.LazyFrame.collect) as collect:
+            snapshot = checker.find_today_snapshot("https://test.com/data.csv")
+
+        assert snapshot.row() == {"Date": today, "Completed": "Today's task"}
+        plan = collect.call_args[0][0].explain()
+        assert "strptime" in plan[plan.index("SCAN"):]
+
+    def test_find_today_snapshot(self):
+        """Test today's row is returned as a one-row frame snapshot"""
+        today = date.today().strftime("%d/%m/%Y")
+        sheets = Mock()
+        sheets.scan.return_value = pl.DataFrame({
+            "Date": ["01/01/2020", today],
+            "Completed": ["Old task", "Today's task"]
+        }).lazy()
+        checker = ReportChecker(sheets=sheets, profiles=SchemaProfiles())
+
+        snapshot = checker.find_today_snapshot("https://test.com/data.csv")
+
+        assert snapshot.frame.height == 1
+        assert snapshot.row() == {"Date": today, "Completed": "Today's task"}
+        assert checker.check_today_report("https://test.com/data.csv") == (True, snapshot.row())
+
+    def test_blank_date_cells_are_skipped(self):
+        """Test a blank or whitespace-only Date cell neither hides today's row nor the latest entry"""
+        today = date.today().strftime("%d/%m/%Y")
+        body = f"Date,Completed,Inprogress\n04/07/2025,a,b\n   ,x,y\n,z,w\n{today},c,d\n".encode("utf-8")
+        checker = ReportChecker(sheets=SheetCache(Mock(fetch=Mock(return_value=SheetDownload(content=body)))),
+                                profiles=SchemaProfiles())
+
+        assert checker.check_today_report("https://test.com/data.csv") == (
+            True, {"Date": today, "Completed": "c", "Inprogress": "d"}
+        )
+        assert select_latest_entry(parse_csv(body))["Completed"] == "c"
+
+class TestSchemaProfiles:
+    """Test per-sheet schema profiles"""
+
+    def setup_method(self):
+        """Setup test method"""
+        self.profiles = SchemaProfiles()
+
+    def test_detect_date_format(self):
+        """Test day-first dates win ambiguous matches and other layouts are recognised"""
+        assert detect_date_format(pl.Series(["04/07/2025", "05/07/2025", None, " "])) == "%d/%m/%Y"
+        assert detect_date_format(pl.Series(["07/31/2025", "08/01/2025"])) == "%m/%d/%Y"
+        assert detect_date_format(pl.Series(["2025-01-02 09:00:00"])) == "%Y-%m-%d %H:%M:%S"
+        assert detect_date_format(pl.Series(["soon", "04/07/2025"])) is None
+
+    def test_map_progress_columns(self):
+        """Test progress headers are mapped to their canonical names"""
+        assert map_progress_columns(["date", "completed", "In progress", "Blocked"]) == {
+            "Completed": "completed",
+            "Inprogress": "In progress",
+            "Blocker": "Blocked"
+        }
+
+    def test_checker_reads_columns_from_profile(self):
+        """Test completeness and summary use the profile's date and progress columns, whatever their spelling"""
+        checker = ReportChecker(profiles=self.profiles)
+        df = pl.DataFrame({"Report date": ["04/07/2025"], "completed": [""], "In progress": ["API"],
+                           "Notes": ["x"]})
+        profile = self.profiles.profile_frame("https://test.com/data.csv", df)
+        row = df.row(0, named=True)
+
+        assert checker.validate_report_completeness(row, profile) is True
+        assert checker.validate_report_completeness({**row, "In progress": "None"}, profile) is False
+        assert checker.get_report_summary(row, profile) == "Date: 04/07/2025 | In progress: API"
+        assert checker._has_meaningful_content({"Report date": "04/07/2025", "Notes": ""}, profile) is False
+
+    def test_profile_cached_per_header(self):
+        """Test detection runs once per sheet header and again when the header changes"""
+        df = pl.DataFrame({"Date": ["01/01/2025"], "Completed": ["Task"]})
+
+        first = self.profiles.profile_frame("https://test.com/data.csv", df)
+        with patch('src.sheets.schema.detect_date_format') as detect:
+            second = self.profiles.profile_frame("https://test.com/data.csv", df)
+        detect.assert_not_called()
+        assert second is first
+
+        renamed = self.profiles.profile_frame("https://test.com/data.csv", df.rename({"Completed": "Done"}))
+        assert renamed.header_hash != first.header_hash
+        assert self.profiles.get_stats()["detections"] == 2
+
+    def test_tool_parses_day_first_dates(self):
+        """Test the tool orders dd/mm/yyyy dates by the detected format"""
+        sheets = Mock()
+        sheets.fetch_frame.return_value = pl.DataFrame({
+            "Date": ["05/01/2025", "04/02/2025"],
+            "Completed": ["January task", "February task"]
+        })
+        tool = GetInformationFromURLTool(sheets=sheets, profiles=self.profiles)
+
+        assert tool.execute(url="https://test.com/data.csv")["Completed"] == "February task"
+
+    def test_tool_redetects_when_format_drifts(self):
+        """Test dates that break the cached format drop the profile instead of failing"""
+        sheets = Mock()
+        sheets.fetch_frame.side_effect = [
+            pl.DataFrame({"Date": ["05/01/2025"], "Completed": ["Old layout"]}),
+            pl.DataFrame({"Date": ["2025-01-05", "2025-02-04"], "Completed": ["A", "B"]})
+        ]
+        tool = GetInformationFromURLTool(sheets=sheets, profiles=self.profiles)
+
+        tool.execute(url="https://test.com/data.csv")
+        assert tool.execute(url="https://test.com/data.csv")["Completed"] == "B"
+        assert self.profiles.get_stats()["profiles"] == {}
+
+class TestSheetStore:
+    """Test on-disk snapshot store"""
+
+    URL = "https://docs.google.com/spreadsheets/d/test_id/edit#gid=5"
+
+    def setup_method(self):
+        """Setup test method"""
+        self.frame = pl.DataFrame({"Date": ["01/01/2025", "02/01/2025"], "Completed": ["A", "B"]})
+
+    def test_sheet_key(self):
+        """Test snapshots are grouped by sheet ID and tab"""
+        assert sheet_key(self.URL) == "test_id-5"
+        assert sheet_key("https://docs.google.com/spreadsheets/d/test_id/edit") == "test_id-0"
+
+    def test_diff_against_previous_snapshot(self, tmp_path):
+        """Test only new or changed rows are reported and unchanged fetches are not written"""
+        store = SheetStore(str(tmp_path), profiles=SchemaProfiles())
+
+        first = store.save(self.URL, self.frame)
+        unchanged = store.save(self.URL, self.frame)
+        updated = store.save(self.URL, pl.DataFrame({
+            "Date": ["01/01/2025", "02/01/2025", "03/01/2025"],
+            "Completed": ["A", "B edited", "C"]
+        }))
+
+        assert first.written and first.changed.height == 2
+        assert not unchanged.written and unchanged.changed.is_empty()
+        assert updated.changed["Completed"].to_list() == ["B edited", "C"]
+        assert updated.removed == 1
+        assert len(store.list_snapshots(self.URL)) == 2
+
+    def test_latest_entry_without_network(self, tmp_path):
+        """Test the latest row is answered from the last snapshot"""
+        SheetStore(str(tmp_path)).save(self.URL, self.frame)
+        store = SheetStore(str(tmp_path), profiles=SchemaProfiles())
+
+        assert store.latest_entry(self.URL) == {"Date": "02/01/2025", "Completed": "B"}
+        assert store.latest_entry("https://docs.google.com/spreadsheets/d/other_id/edit") is None
+
+    def test_old_snapshots_pruned(self, tmp_path):
+        """Test only the newest snapshots are kept per sheet"""
+        store = SheetStore(str(tmp_path), max_snapshots=2)
+        for day in range(1, 5):
+            store.save(self.URL, pl.DataFrame({"Date": [f"0{day}/01/2025"], "Completed": ["A"]}))
+
+        snapshots = store.list_snapshots(self.URL)
+        assert len(snapshots) == 2
+        assert pl.read_ipc(snapshots[-1])["Date"].to_list() == ["04/01/2025"]
+
+    def test_cache_saves_changed_bodies(self, tmp_path):
+        """Test the sheet cache snapshots new bodies and reuses the parsed frame"""
+        store = SheetStore(str(tmp_path))
+        fetcher = Mock()
+        fetcher.fetch.return_value = SheetDownload(content=CSV)
+        cache = SheetCache(fetcher, ttl_seconds=0, store=store)
+
+        frame = cache.fetch_frame(self.URL)
+        cache.fetch_frame(self.URL)
+        cache.flush_snapshots()
+
+        assert len(store.list_snapshots(self.URL)) == 1
+        assert store.latest(self.URL).equals(frame)
+
+    def test_cache_saves_off_the_request_path(self, tmp_path):
+        """Test a scan returns before the snapshot is parsed and saved, and is never blocked by the store"""
+        store = Mock()
+        saving, release = threading.Event(), threading.Event()
+        store.save.side_effect = lambda url, df: (saving.set(), release.wait(5))
+        fetcher = Mock()
+        fetcher.fetch.return_value = SheetDownload(content=CSV)
+        cache = SheetCache(fetcher, ttl_seconds=0, store=store)
+
+        cache.scan(self.URL)
+        assert saving.wait(5)
+        assert cache.scan(self.URL).collect().height > 0
+
+        release.set()
+        cache.flush_snapshots()
+        store.save.assert_called_once()
+        assert cache.get_stats()["sheets"][to_export_url(self.URL)]["parsed"] is False
+
+    def test_fetch_failure_falls_back_to_store(self, tmp_path):
+        """Test the tool and the checker answer from the store when the sheet is unreachable"""
+        today = date.today().strftime("%d/%m/%Y")
+        store = SheetStore(str(tmp_path))
+        store.save(self.URL, pl.DataFrame({"Date": ["01/01/2020", today], "Completed": ["Old", "Today"]}))
+        sheets = Mock()
+        sheets.fetch_frame.side_effect = SheetFetchError("unreachable")
+        sheets.scan.side_effect = SheetFetchError("unreachable")
+
+        tool = GetInformationFromURLTool(sheets=sheets, profiles=SchemaProfiles(), store=store)
+        checker = ReportChecker(sheets=sheets, profiles=SchemaProfiles(), store=store)
+
+        assert tool.execute(url=self.URL)["Completed"] == "Today"
+        assert tool.execute(url=self.URL)["stale"] is True
+        assert checker.find_today_snapshot(self.URL).row() == {"Date": today, "Completed": "Today"}
+        assert checker.check_today_report(self.URL)[1] == {"Date": today, "Completed": "Today", "stale": True}
+
+    def test_tab_fallback_reads_each_tabs_snapshot(self, tmp_path):
+        """Test a multi-tab sheet falls back to the snapshots of its own tabs (keyed by gid), not the base URL"""
+        today = date.today().strftime("%d/%m/%Y")
+        store = SheetStore(str(tmp_path))
+        store.save(self.URL, pl.DataFrame({"Date": [today], "Completed": ["Base tab"]}))
+        store.save(tab_url(self.URL, "7"), pl.DataFrame({"Date": [today], "Completed": ["Team tab"]}))
+        sheets, tabs = Mock(), Mock()
+        tabs.fetch_frame.side_effect = SheetFetchError("unreachable")
+
+        tool = GetInformationFromURLTool(sheets=sheets, profiles=SchemaProfiles(), store=store, sheet_tabs=tabs)
+        entry = tool.execute(url=self.URL, tabs={"team": "7"})
+
+        assert entry["Completed"] == "Team tab"
+        assert entry[TAB_COLUMN] == "team"
+        assert entry["stale"] is True
+
+class TestSheetTabs:
+    """Test multi-tab sheets"""
+
+    URL = "https://docs.google.com/spreadsheets/d/test_id/edit#gid=0"
+
+    def setup_method(self):
+        """Setup test method"""
+        self.today = date.today().strftime("%d/%m/%Y")
+        bodies = {
+            "1": f"Date,Completed\n01/01/2020,Old work\n{self.today},\n".encode("utf-8"),
+            "2": f"Date,Completed,Blocked\n{self.today},Alice's work,None\n".encode("utf-8")
+        }
+        self.fetcher = Mock()
+        self.fetcher.fetch.side_effect = lambda url, **kwargs: SheetDownload(content=bodies[url.rsplit("=", 1)[1]])
+        self.tabs = SheetTabs(SheetCache(self.fetcher, ttl_seconds=0), max_workers=2)
+
+    def test_tab_urls(self):
+        """Test each tab gets its own export URL and lists are named by gid"""
+        assert tab_url(self.URL, "7") == "https://docs.google.com/spreadsheets/d/test_id/export?format=csv&gid=7"
+        assert normalize_tabs(["1", 2]) == {"1": "1", "2": "2"}
+        with pytest.raises(ValueError):
+            tab_url("https://test.com/data.csv", "7")
+
+    def test_tabs_merged_with_tab_column(self):
+        """Test tabs are fetched in parallel and merged, columns missing in a tab left empty"""
+        with patch.object(self.tabs._executor, "submit", wraps=self.tabs._executor.submit) as submit:
+            df = self.tabs.fetch_frame(self.URL, {"bob": "1", "alice": "2"})
+
+        assert submit.call_count == 2
+        assert df.columns == ["Date", "Completed", "Tab", "Blocked"]
+        assert df["Tab"].to_list() == ["bob", "bob", "alice"]
+
+    def test_today_and_latest_across_tabs(self):
+        """Test today's report and the latest entry are found in whichever tab holds them"""
+        checker = ReportChecker(profiles=SchemaProfiles(), sheet_tabs=self.tabs)
+        tool = GetInformationFromURLTool(profiles=SchemaProfiles(), sheet_tabs=self.tabs)
+        tabs = {"bob": "1", "alice": "2"}
+
+        snapshot = checker.find_today_snapshot(self.URL, tabs=tabs)
+        latest = tool.execute(url=self.URL, tabs=tabs)
+
+        assert snapshot.row() == {"Date": self.today, "Completed": "Alice's work", "Tab": "alice", "Blocked": "None"}
+        assert latest["Tab"] == "alice"
+
+class TestSheetSnapshot:
+    """Test snapshot reuse within a report run"""
+
+    def setup_method(self):
+        """Setup test method"""
+        self.snapshot = SheetSnapshot(
+            sheet_url="https://docs.google.com/spreadsheets/d/test_id/edit#gid=5",
+            frame=pl.DataFrame({"Date": ["01/01/2025"], "Completed": ["Task"]})
+        )
+        self.sheets = Mock()
+        self.tool = GetInformationFromURLTool(sheets=self.sheets)
+
+    def test_tool_uses_active_snapshot(self):
+        """Test the sheet tool returns the snapshot row without fetching"""
+        with use_snapshot(self.snapshot):
+            result = self.tool.execute(url="https://docs.google.com/spreadsheets/d/test_id/export?format=csv&gid=5")
+
+        assert result == {"Date": "01/01/2025", "Completed": "Task"}
+        self.sheets.fetch_frame.assert_not_called()
+
+    def test_other_sheets_still_fetched(self):
+        """Test the snapshot only applies to its own sheet and run"""
+        self.sheets.fetch_frame.side_effect = Exception("fetched")
+
+        with use_snapshot(self.snapshot):
+            other = self.tool.execute(url="https://docs.google.com/spreadsheets/d/other_id/edit")
+        after = self.tool.execute(url=self.snapshot.sheet_url)
+
+        assert "fetched" in other["error"]
+        assert "fetched" in after["error"]
@@ -3,11 +3,14 @@
 # Tool Tests
 # ==========================================
 
+import polars as pl
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from src.tools.get_information_from_url import GetInformationFromURLTool
+from src.sheets.rows import select_latest_entry
 from src.tools.save_chat_history_DB import SaveChatHistoryTool
 from src.tools.tool_registry import ToolRegistry
+from src.monitoring.metrics import TOOL_DURATION
 
 class TestGetInformationFromURLTool:
     """Test URL information fetching tool"""
@@ -26,60 +29,57 @@ class TestGetInformationFromURLTool:
         result = self.tool.execute()
         assert result["error"] == "URL parameter is required"
     
-    @patch('src.tools.get_information_from_url.requests.get')
-    @patch('src.tools.get_information_from_url.pl.read_csv')
-    def test_successful_execution(self, mock_read_csv, mock_get):
+    def test_successful_execution(self):
         """Test successful tool execution"""
-        # Mock HTTP response
-        mock_response = Mock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.content = b"test,data\n1,2"
-        mock_get.return_value = mock_response
-        
-        # Mock polars DataFrame
-        mock_df = Mock()
-        mock_df.is_empty.return_value = False
-        mock_df.columns = ['Date', 'Task']
-        mock_df.to_dicts.return_value = [{'Date': '2025-01-01', 'Task': 'Test task'}]
-
-        # Mock the with_columns and sort methods
-        mock_df_formatted = Mock()
-        mock_df_formatted.iter_rows.return_value = [('2025-01-01', 'Test task')]
-        mock_df.with_columns.return_value.sort.return_value = mock_df_formatted
-
-        # Mock filter method
-        mock_filtered = Mock()
-        mock_filtered.to_dicts.return_value = [{'Date': '2025-01-01', 'Task': 'Test task'}]
-        mock_df.filter.return_value = mock_filtered
+        df = pl.DataFrame({
+            'Date': ['2024-12-31', '2025-01-01'],
+            'Task': ['Old task', 'Test task']
+        })
 
-        mock_read_csv.return_value = mock_df
+        self.tool.sheets = Mock()
+        self.tool.sheets.fetch_frame.return_value = df
         
         result = self.tool.execute(url="https://test.com")
         assert 'Date' in result
         assert result['Date'] == '2025-01-01'
+        assert result['Task'] == 'Test task'
+        self.tool.sheets.fetch_frame.assert_called_once_with("https://test.com")
+    
+    def test_latest_entry_skips_empty_rows(self):
+        """Test rows with only a date are skipped and the original row order breaks ties"""
+        df = pl.DataFrame({
+            'Date': ['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-02', None],
+            'Completed': ['A', 'B', '  ', 'C', 'D'],
+            'Blocked': [None, None, None, 'X', None]
+        })
+        
+        assert select_latest_entry(df) == {'Date': '2025-01-02', 'Completed': 'B', 'Blocked': None}
+    
+    def test_latest_entry_with_times(self):
+        """Test dates carrying a time part are compared by day"""
+        df = pl.DataFrame({
+            'Date': ['2025-01-02 09:00:00', '2025-01-01 18:00:00'],
+            'Completed': ['B', 'A']
+        })
+        
+        assert select_latest_entry(df)['Completed'] == 'B'
+    
+    def test_latest_entry_without_date_column(self):
+        """Test sheets without a Date column fall back to the first row"""
+        self.tool.sheets = Mock()
+        self.tool.sheets.fetch_frame.return_value = pl.DataFrame({'Task': ['First', 'Second']})
+        
+        assert select_latest_entry(self.tool.sheets.fetch_frame.return_value) is None
+        assert self.tool.execute(url="https://test.com") == {'Task': 'First'}
     
-    @patch('src.tools.get_information_from_url.requests.get')
-    def test_http_error(self, mock_get):
+    def test_http_error(self):
         """Test HTTP error handling"""
-        mock_get.side_effect = Exception("HTTP Error")
+        self.tool.sheets = Mock()
+        self.tool.sheets.fetch_frame.side_effect = Exception("HTTP Error")
         
         result = self.tool.execute(url="https://test.com")
         assert "error" in result
         assert "HTTP Error" in result["error"]
-    
-    def test_google_sheets_url_conversion(self):
-        """Test Google Sheets URL conversion"""
-        with patch('src.tools.get_information_from_url.requests.get') as mock_get:
-            mock_response = Mock()
-            mock_response.raise_for_status.side_effect = Exception("Test")
-            mock_get.return_value = mock_response
-            
-            # Test with edit URL
-            self.tool.execute(url="https://docs.google.com/spreadsheets/d/test_id/edit?usp=sharing")
-            
-            # Verify CSV export URL was called
-            expected_url = "https://docs.google.com/spreadsheets/d/test_id/export?format=csv"
-            mock_get.assert_called_with(expected_url)
 
 class TestSaveChatHistoryTool:
     """Test chat history saving tool"""
@@ -167,3 +167,22 @@ class TestToolRegistry:
         
         names = self.registry.list_tool_names()
         assert "test_tool" in names
+    
+    def test_registered_tools_are_timed(self):
+        """Test registered tools record execution latency by outcome"""
+        mock_tool = Mock()
+        mock_tool.name = "timed_tool"
+        mock_tool.execute.side_effect = [{"status": "success"}, {"error": "boom"}]
+        self.registry.register_tool(mock_tool)
+        self.registry.register_tool(mock_tool)
+        
+        tool = self.registry.get_tool("timed_tool")
+        assert tool.execute(message="a") == {"status": "success"}
+        assert tool.execute(message="b") == {"error": "boom"}
+        
+        samples = {
+            sample.labels["status"]: sample.value
+            for metric in TOOL_DURATION.collect() for sample in metric.samples
+            if sample.name.endswith("_count") and sample.labels["tool"] == "timed_tool"
+        }
+        assert samples == {"success": 1.0, "error": 1.0}